@@ -0,0 +1,69 @@
+"""Compare two benchmark result files.
+
+Usage: python -m benchmarks.compare baseline.json current.json [--threshold 10]
+
+Prints the change of each latency metric per case and fixture, and exits
+non-zero when any of them got worse by more than the threshold percent.
+"""
+import argparse
+import json
+import sys
+
+METRICS = [
+    ("callback_ms", "p99"),
+    ("queue_wait_ms", "p99"),
+    ("rtf", None),
+    ("stop_to_clipboard_ms", None),
+    ("peak_rss_mb", None)
+]
+
+def _key(run):
+    return (run["model"], run["compute_type"], run["beam_size"], run.get("streaming", False), run["fixture"])
+
+def _value(run, metric, stat):
+    value = run.get(metric)
+    if stat and isinstance(value, dict):
+        value = value.get(stat)
+    return value
+
+def compare(baseline, current, threshold=10.0):
+    """Rows of (case, metric, before, after, percent change) and whether any regressed"""
+    before_runs = {_key(run): run for run in baseline["results"]}
+    rows = []
+    regressed = False
+    for run in current["results"]:
+        before = before_runs.get(_key(run))
+        if before is None:
+            continue
+        for metric, stat in METRICS:
+            old, new = _value(before, metric, stat), _value(run, metric, stat)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            regressed = regressed or change > threshold
+            name = f"{metric}.{stat}" if stat else metric
+            rows.append((_key(run), name, old, new, change))
+    return rows, regressed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows, regressed = compare(baseline, current, args.threshold)
+    for key, name, old, new, change in rows:
+        marker = " !" if change > args.threshold else ""
+        print(f"{' '.join(str(part) for part in key):<50} {name:<24} {old:>10} -> {new:<10} {change:+.1f}%{marker}")
+    print(f"{baseline.get('commit')} -> {current.get('commit')}: "
+          f"{'regression above ' + str(args.threshold) + '%' if regressed else 'no regressions'}")
+    sys.exit(1 if regressed else 0)
+
+if __name__ == "__main__":
+    main()
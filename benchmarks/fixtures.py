@@ -0,0 +1,51 @@
+import os
+import wave
+import numpy as np
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SAMPLE_RATE = 16000
+
+# name -> list of (seconds, speech?) runs
+FIXTURES = {
+    "dictation_10s": [(0.5, False), (3.0, True), (0.8, False), (4.0, True), (1.7, False)],
+    "pauses_30s": [(0.3, False)] + [(4.0, True), (1.0, False)] * 5 + [(4.7, False)],
+    "monologue_60s": [(0.5, False), (58.0, True), (1.5, False)]
+}
+
+def _speech_like(samples, rng):
+    """Harmonic bursts with a syllable-rate envelope; loud enough to pass the energy VAD"""
+    t = np.arange(samples) / SAMPLE_RATE
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return 0.2 * voice * envelope + 0.01 * rng.standard_normal(samples)
+
+def synthesize(runs, seed=0):
+    rng = np.random.default_rng(seed)
+    parts = []
+    for seconds, speech in runs:
+        samples = int(seconds * SAMPLE_RATE)
+        if speech:
+            parts.append(_speech_like(samples, rng))
+        else:
+            parts.append(0.002 * rng.standard_normal(samples))
+    return np.clip(np.concatenate(parts), -1, 1).astype(np.float32)
+
+def write_wav(path, audio):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((audio * 32767).astype("<i2").tobytes())
+
+def default_fixtures():
+    """Paths of the synthetic fixtures, generated on first use"""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    paths = []
+    for name, runs in FIXTURES.items():
+        path = os.path.join(FIXTURE_DIR, f"{name}.wav")
+        if not os.path.exists(path):
+            write_wav(path, synthesize(runs))
+        paths.append(path)
+    return paths
@@ -0,0 +1,266 @@
+"""Replay WAV fixtures through the capture and decode pipeline.
+
+Usage: python -m benchmarks.run [--models stub tiny] [--compute-types int8]
+       [--beam-sizes 1 5] [--fixtures a.wav ...] [--output bench_output.json]
+
+Every model/compute_type/beam_size case runs in a fresh process so its peak
+RSS is its own. The "stub" model sleeps for a fixed fraction of the audio
+length instead of decoding, which keeps the suite usable without weights.
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SKALD_ROOT", PROJECT_ROOT)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.fixtures import SAMPLE_RATE, default_fixtures
+
+class StubModel:
+    """Stands in for WhisperModel, taking rtf seconds per second of audio"""
+
+    def __init__(self, rtf=0.05):
+        self.rtf = rtf
+
+    def transcribe(self, audio, word_timestamps=False, **options):
+        duration = len(audio) / SAMPLE_RATE
+        time.sleep(duration * self.rtf)
+        words = [SimpleNamespace(start=start, end=start + 0.4, word=f" w{int(start * 2)}")
+                 for start in np.arange(0, max(duration - 0.4, 0), 0.5)]
+        segment = SimpleNamespace(start=0.0, end=duration, text=" ".join(w.word.strip() for w in words),
+                                  words=words if word_timestamps else None)
+        return [segment], SimpleNamespace(duration=duration)
+
+class ClipboardRecorder:
+    """Replaces pyperclip so runs time clipboard writes without touching the real one"""
+
+    def __init__(self):
+        self.copies = []
+
+    def copy(self, text):
+        self.copies.append(time.perf_counter())
+
+    def paste(self):
+        return ""
+
+class TimedQueue(queue.Queue):
+    """FIFO that records how long each chunk waited for the processing thread"""
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self.put_times = deque()
+        self.waits = []
+
+    def _put(self, item):
+        self.put_times.append(time.perf_counter())
+        super()._put(item)
+
+    def _get(self):
+        self.waits.append(time.perf_counter() - self.put_times.popleft())
+        return super()._get()
+
+def _ms_stats(values):
+    if not values:
+        return None
+    values = np.asarray(values) * 1000
+    return {
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+        "max": round(float(values.max()), 3),
+        "count": len(values)
+    }
+
+def _peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def replay(transcriber, audio, block_size, speed):
+    """Feed audio to audio_callback in blocks, paced at speed x real time
+    (0 for as fast as possible), and return the run's measurements"""
+    transcriber.reset_state()
+    transcriber.audio_queue = TimedQueue()
+    import transcriber.output as output_module
+    clipboard = ClipboardRecorder()
+    output_module.pyperclip = clipboard
+    transcriber.clipboard_available = True
+    transcriber.output.sinks = transcriber._create_sinks()
+    finals = []
+    transcriber.listeners = [lambda event: event["event"] == "final" and finals.append(event)]
+
+    callback_times = []
+    transcriber.capture_active.set()
+    processing_thread = threading.Thread(target=transcriber.process_audio)
+    processing_thread.start()
+
+    start = time.perf_counter()
+    for offset in range(0, len(audio), block_size):
+        if not transcriber.recording.is_set():
+            break
+        block = audio[offset:offset + block_size].reshape(-1, 1)
+        if speed:
+            delay = start + (offset + len(block)) / SAMPLE_RATE / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        callback_start = time.perf_counter()
+        transcriber.audio_callback(block, len(block), None, None)
+        callback_times.append(time.perf_counter() - callback_start)
+
+    transcriber.stop_recording()
+    transcriber._flush_capture()
+    processing_thread.join()
+    transcriber.output.flush()
+
+    stopped_at = transcriber.recording_stopped_at
+    final = finals[-1] if finals else {"text": "", "timing": {}}
+    decode_time = final["timing"].get("decode_time") or 0.0
+    stop_to_final = final["timing"].get("stop_to_final")
+    duration = len(audio) / SAMPLE_RATE
+    return {
+        "audio_duration": round(duration, 3),
+        "callback_ms": _ms_stats(callback_times),
+        "queue_wait_ms": _ms_stats(transcriber.audio_queue.waits),
+        "decode_time": round(decode_time, 3),
+        "rtf": round(decode_time / duration, 4) if duration else None,
+        "stop_to_final_ms": round(stop_to_final * 1000, 1) if stop_to_final is not None else None,
+        "stop_to_clipboard_ms": (round((clipboard.copies[-1] - stopped_at) * 1000, 1)
+                                 if clipboard.copies and stopped_at else None),
+        "ring_overflows": transcriber.audio_buffer.overflows,
+        "text_length": len(final["text"])
+    }
+
+def _load_model(case):
+    if case["model"] == "stub":
+        return StubModel(case.get("stub_rtf", 0.05))
+    from faster_whisper import WhisperModel
+    return WhisperModel(case["model"], device=case.get("device", "cpu"), compute_type=case["compute_type"])
+
+def run_case(case, fixtures, base_config, block_size=512, speed=1.0):
+    """Load one model configuration and replay every fixture through it"""
+    config = copy.deepcopy(base_config)
+    config["audio"]["sample_rate"] = SAMPLE_RATE
+    config["audio"]["channels"] = 1
+    config["audio"].setdefault("start_tone", {})["enabled"] = False
+    # replay() drives audio_callback itself; a non-PortAudio source keeps the
+    # transcriber from initializing audio devices a CPU-only box may not have
+    config["audio"]["source"] = {"type": "synthetic", "signal": "silence"}
+    config["processing"]["auto_paste"] = False
+    if case["model"] != "stub":
+        config["whisper"]["model"] = case["model"]
+    config["whisper"]["beam_size"] = case["beam_size"]
+    config["debug"]["print_status"] = False
+
+    import transcriber.audio_transcriber as transcriber_module
+    import transcriber.output as output_module
+    from utils.audio_file import AudioFile
+    original_clipboard = output_module.pyperclip
+    output_module.pyperclip = ClipboardRecorder()
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            transcriber = transcriber_module.AudioTranscriber(config=config, load_model=False)
+            load_start = time.perf_counter()
+            transcriber.model = _load_model(case)
+            model_load_time = time.perf_counter() - load_start
+            warmup_start = time.perf_counter()
+            transcriber._warm_up()
+            warmup_time = time.perf_counter() - warmup_start
+            transcriber.model_ready.set()
+
+            results = []
+            for path in fixtures:
+                run = replay(transcriber, AudioFile(path).read(), block_size, speed)
+                run.update(case)
+                run["fixture"] = os.path.basename(path)
+                run["model_load_time"] = round(model_load_time, 3)
+                run["warmup_time"] = round(warmup_time, 3)
+                results.append(run)
+    finally:
+        output_module.pyperclip = original_clipboard
+
+    peak_rss = _peak_rss_mb()
+    for run in results:
+        run["peak_rss_mb"] = peak_rss
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", nargs="+", help="WAV files to replay (default: synthetic fixtures)")
+    parser.add_argument("--models", nargs="+", default=["stub"], help="'stub' or faster-whisper model names")
+    parser.add_argument("--compute-types", nargs="+", default=["int8"])
+    parser.add_argument("--beam-sizes", nargs="+", type=int, default=[5])
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--stub-rtf", type=float, default=0.05)
+    parser.add_argument("--block-size", type=int, default=512, help="frames per audio callback")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed; 0 replays as fast as possible")
+    parser.add_argument("--streaming", action="store_true", help="enable processing.streaming")
+    parser.add_argument("--config", default=os.path.join(PROJECT_ROOT, "config.json.example"))
+    parser.add_argument("--output", default="bench_output.json")
+    args = parser.parse_args(argv)
+
+    with open(args.config) as f:
+        base_config = json.load(f)
+    base_config["processing"].setdefault("streaming", {})["enabled"] = args.streaming
+    fixtures = args.fixtures or default_fixtures()
+
+    cases = []
+    for model in args.models:
+        # The stub ignores compute type; one case is enough
+        for compute_type in (["n/a"] if model == "stub" else args.compute_types):
+            for beam_size in args.beam_sizes:
+                cases.append({"model": model, "compute_type": compute_type, "beam_size": beam_size,
+                              "device": args.device, "stub_rtf": args.stub_rtf,
+                              "streaming": args.streaming})
+
+    results = []
+    for case in cases:
+        print(f"{case['model']} {case['compute_type']} beam={case['beam_size']}...", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results.extend(pool.submit(run_case, case, fixtures, base_config,
+                                       args.block_size, args.speed).result())
+
+    report = {
+        "commit": _git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {"platform": platform.platform(), "python": platform.python_version(),
+                 "cpu_count": os.cpu_count()},
+        "settings": {"block_size": args.block_size, "speed": args.speed},
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for run in results:
+        print(f"{run['model']:>8} {run['compute_type']:>8} beam={run['beam_size']} {run['fixture']:<20} "
+              f"rtf={run['rtf']} callback_p99={run['callback_ms']['p99']}ms "
+              f"stop_to_clipboard={run['stop_to_clipboard_ms']}ms rss={run['peak_rss_mb']}MB")
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,200 @@
 import socket
+import argparse
 import json
+import os
+import queue
 import sys
+import threading
+import time
+import wave
+# Runs on every hotkey press: keep imports to the standard library
 from utils.config_loader import ConfigLoader
+from utils.protocol import SocketReader, encode_message, encode_frame
 
-config = ConfigLoader.load_config()
-SOCKET_PATH = config["server"]["socket_path"]
+# Audio sent per frame when streaming to the server
+INGEST_FRAME_MS = 100
 
-def send_command(action):
+def follow_events(reader, until_final):
+    """Print pushed transcript events until the server closes the connection"""
+    while True:
+        event = reader.read()
+        if event is None:
+            return
+        if until_final:
+            if event.get("event") == "final" and event.get("refining"):
+                print(event["text"], file=sys.stderr)
+            elif event.get("event") in ("final", "refined"):
+                print(event["text"])
+                return
+        else:
+            print(json.dumps(event), flush=True)
+
+def file_frames(path, speed=1.0):
+    """(sample_rate, channels, frames) of a 16-bit WAV file, paced at speed times real time (0: unpaced)"""
+    audio = wave.open(path, "rb")
+    if audio.getsampwidth() != 2:
+        audio.close()
+        raise ValueError(f"{path} is not 16-bit PCM")
+    rate, channels = audio.getframerate(), audio.getnchannels()
+
+    def frames():
+        with audio:
+            start = time.perf_counter()
+            sent = 0
+            while True:
+                pcm = audio.readframes(rate * INGEST_FRAME_MS // 1000)
+                if not pcm:
+                    return
+                if speed:
+                    ahead = sent / rate / speed - (time.perf_counter() - start)
+                    if ahead > 0:
+                        time.sleep(ahead)
+                sent += len(pcm) // (2 * channels)
+                yield pcm
+    return rate, channels, frames()
+
+def microphone_frames(config, stop):
+    """(sample_rate, channels, frames) from the default input device until stop is set"""
+    # Only needed on the machine with the microphone
+    import sounddevice as sd
+    rate, channels = config["audio"]["sample_rate"], config["audio"]["channels"]
+    blocks = queue.Queue()
+
+    def frames():
+        with sd.RawInputStream(samplerate=rate, channels=channels, dtype="int16",
+                               blocksize=rate * INGEST_FRAME_MS // 1000,
+                               callback=lambda data, count, timing, status: blocks.put(bytes(data))):
+            while not stop.is_set():
+                try:
+                    yield blocks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+    return rate, channels, frames()
+
+def ingest(path=None, speed=1.0, compression="none", host=None, port=None, wait=False, session=None):
+    """Stream a WAV file or the microphone to the server for transcription"""
+    config = ConfigLoader.load_config()
+    stop = threading.Event()
+    try:
+        rate, channels, frames = file_frames(path, speed) if path else microphone_frames(config, stop)
+        if host:
+            sock = socket.create_connection((host, port or config["server"].get("tcp_port")),
+                                            timeout=config["server"].get("socket_timeout", 1.0))
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(config["server"].get("socket_timeout", 1.0))
+            sock.connect(config["server"]["socket_path"])
+        with sock:
+            command = {"action": "ingest", "sample_rate": rate, "channels": channels,
+                       "compression": compression}
+            if session:
+                command["session"] = session
+            if host:
+                command["client"] = socket.gethostname()
+            if wait:
+                command["wait"] = True
+            sock.sendall(encode_message(command))
+            reader = SocketReader(sock)
+            response = reader.read()
+            if not isinstance(response, dict) or "status" not in response:
+                print("Error: Invalid response from server")
+                sys.exit(1)
+            print(response["status"], file=sys.stderr)
+            if response["status"] != "Recording started":
+                sys.exit(1)
+            sock.settimeout(None)
+
+            def send():
+                try:
+                    for pcm in frames:
+                        if stop.is_set():
+                            break
+                        sock.sendall(encode_frame(pcm, compression))
+                    sock.sendall(encode_frame(b""))
+                except OSError:
+                    pass
+            sender = threading.Thread(target=send, daemon=True)
+            sender.start()
+
+            # The stop reply and, with wait, the transcript; Ctrl+C ends the stream
+            stopped, transcribed = False, not wait
+            while not (stopped and transcribed):
+                try:
+                    message = reader.read()
+                except KeyboardInterrupt:
+                    stop.set()
+                    continue
+                if message is None:
+                    break
+                if "status" in message:
+                    print(f"{message['status']} ({message.get('seconds', 0):.1f}s sent)", file=sys.stderr)
+                    stop.set()
+                    stopped = True
+                elif message.get("event") == "final" and message.get("refining"):
+                    print(message["text"], file=sys.stderr)
+                elif message.get("event") in ("final", "refined"):
+                    print(message["text"])
+                    transcribed = True
+            stop.set()
+            sender.join()
+    except (OSError, ValueError, EOFError, wave.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        stop.set()
+
+def send_command(action, wait=False, **options):
     config = ConfigLoader.load_config()
     try:
         with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
             sock.settimeout(config["server"].get("socket_timeout", 1.0))
-            sock.connect(SOCKET_PATH)
-            sock.send(json.dumps({"action": action}).encode())
-            response = json.loads(sock.recv(1024).decode())
-            if "status" not in response:
+            sock.connect(config["server"]["socket_path"])
+            command = {"action": action}
+            command.update(options)
+            if wait:
+                command["wait"] = True
+            if action == "transcribe":
+                # File jobs reply only once every file is done
+                sock.settimeout(None)
+            sock.sendall(encode_message(command))
+            reader = SocketReader(sock)
+            response = reader.read()
+            if not isinstance(response, dict) or "status" not in response:
                 print("Error: Invalid response from server")
                 sys.exit(1)
-            print(response["status"])
+            print(response["status"], file=sys.stderr if wait else sys.stdout)
+            if action == "status":
+                for key in ["model_load_time", "warmup_time"]:
+                    if response.get(key) is not None:
+                        print(f"{key}: {response[key]:.2f}s")
+                for model in response.get("models", []):
+                    print(f"loaded: {model['model']} ({model['compute_type']}, {model['size_mb']} MB)")
+                for session in response.get("sessions", []):
+                    client = f" ({session['client']})" if session.get("client") else ""
+                    print(f"session: {session['session']}{client}, "
+                          f"{'recording' if session['recording'] else 'transcribing'}")
+            if action == "memory":
+                print(f"model: {response['model_state']}, idle {response['idle_seconds']:.0f}s")
+                if response.get("rss_mb") is not None:
+                    print(f"resident: {response['rss_mb']} MB")
+                print(f"models: {response['models_mb']} MB")
+                for model in response.get("models", []):
+                    print(f"loaded: {model['model']} ({model['compute_type']}, {model['size_mb']} MB)")
+            if action == "stats":
+                print(json.dumps(response.get("metrics", {}), indent=2))
+            for kind, names in response.get("changes", {}).items():
+                if names:
+                    print(f"{kind}: {', '.join(names)}")
+            for result in response.get("files", []):
+                if "error" in result:
+                    print(f"{result['file']}: Error: {result['error']}")
+                else:
+                    print(f"{result['file']} -> {result['output']}")
+
+            if action == "subscribe" or (wait and response["status"] == "Recording started"):
+                # Transcripts can take a while; only the connection itself may time out
+                sock.settimeout(None)
+                follow_events(reader, until_final=wait)
     except socket.timeout:
         print("Error: Server not responding")
         sys.exit(1)
@@ -27,15 +204,55 @@ def send_command(action):
     except ConnectionRefusedError:
         print("Error: Could not connect to server")
         sys.exit(1)
-    except json.JSONDecodeError:
+    except ValueError:
         print("Error: Invalid JSON response from server")
         sys.exit(1)
+    except KeyboardInterrupt:
+        pass
 
 def main():
-    if len(sys.argv) != 2 or sys.argv[1] not in ["start", "stop"]:
-        print("Usage: ./skald-client [start|stop]")
-        sys.exit(1)
-    send_command(sys.argv[1])
+    parser = argparse.ArgumentParser(prog="./skald-client")
+    parser.add_argument("action", choices=["start", "stop", "status", "stats", "memory", "reload", "subscribe",
+                                           "transcribe", "ingest"])
+    parser.add_argument("files", nargs="*", help="with transcribe: audio files to transcribe")
+    parser.add_argument("--wait", action="store_true",
+                        help="with start or ingest: print the final transcription when recording ends")
+    parser.add_argument("--model", help="with start: model name, alias or path for this recording")
+    parser.add_argument("--session", help="with start, stop or ingest: recording session "
+                                          "(default: the default session; for ingest, a new one)")
+    parser.add_argument("--device", help="with start: input device name or index for this session")
+    parser.add_argument("--format", choices=["jsonl", "text"],
+                        help="with transcribe: output format (default from config)")
+    parser.add_argument("--output-dir", help="with transcribe: where to write outputs (default: next to each file)")
+    parser.add_argument("--file", help="with ingest: 16-bit WAV file to stream instead of the microphone")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="with ingest --file: playback speed, 0 for as fast as possible (default: 1)")
+    parser.add_argument("--compress", action="store_true", help="with ingest: zlib-compress the audio")
+    parser.add_argument("--host", help="with ingest: server host to connect to over TCP (server.tcp_port)")
+    parser.add_argument("--port", type=int, help="with ingest --host: TCP port (default: server.tcp_port)")
+    args = parser.parse_args()
+
+    if args.action == "transcribe":
+        if not args.files:
+            parser.error("transcribe needs at least one file")
+        # The server resolves paths from its own working directory
+        options = {"files": [os.path.abspath(path) for path in args.files]}
+        if args.format:
+            options["format"] = args.format
+        if args.output_dir:
+            options["output_dir"] = os.path.abspath(args.output_dir)
+        send_command("transcribe", **options)
+    elif args.action == "ingest":
+        ingest(args.file, args.speed, "zlib" if args.compress else "none", args.host, args.port, args.wait,
+               args.session)
+    elif args.action in ("start", "stop") and (args.model or args.session or args.device):
+        options = {name: value for name, value in [("model", args.model), ("session", args.session)] if value}
+        if args.device is not None:
+            # Device indexes are numbers to PortAudio
+            options["device"] = int(args.device) if args.device.isdigit() else args.device
+        send_command(args.action, wait=args.wait and args.action == "start", **options)
+    else:
+        send_command(args.action, wait=args.wait and args.action == "start")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,13 +1,31 @@
-import socket
+import argparse
+import asyncio
+import functools
 import os
-import json
 import threading
 import signal
 import sys
-from transcriber.audio_transcriber import AudioTranscriber
+import time
+from transcriber.audio_transcriber import AudioTranscriber, DEFAULT_SESSION
+from transcriber.session import Session
+from transcriber.batch import BatchTranscriber
+from transcriber.autotune import Autotuner, load_tuned, save_tuned, apply_tuned
 from utils.config_loader import ConfigLoader
+from utils.capture import PushStream, pcm_to_float
+from utils.protocol import MessageReader, encode_message, decode_frame, COMPRESSIONS
 
-# Use absolute path for socket
+# Subscribers this far behind stop receiving partial updates
+MAX_SUBSCRIBER_BACKLOG = 256 * 1024
+# Seconds between checks whether the model has been idle long enough to offload
+IDLE_CHECK_INTERVAL = 5
+# Commands accepted over TCP; the rest act on the server's files and config, or, like
+# subscribe, hand out every session's transcripts. ingest --wait gets a client its own
+REMOTE_ACTIONS = ["ingest", "status"]
+# Seconds to wait for an ingest recording to open its stream
+INGEST_START_TIMEOUT = 5
+DEFAULT_MAX_SESSIONS = 4
+
+# Cached by ConfigLoader; the transcriber and server share this config
 config = ConfigLoader.load_config()
 SOCKET_PATH = config["server"]["socket_path"]
 PROJECT_ROOT = os.environ.get('SKALD_ROOT')
@@ -27,8 +45,7 @@ def signal_handler(signum, frame):
     """Handle interrupt signals"""
     cleanup()
 
-def display_startup_message():
-    config = ConfigLoader.load_config("config.json")
+def display_startup_message(config):
     version = config.get("version", "1.0")
     print(f"""
 ═══════════════════════════════════
@@ -38,63 +55,477 @@ def display_startup_message():
 ═══════════════════════════════════
     """)
 
-def run_server():
+def tuned_config(config):
+    """config with this host's cached autotune result applied, if there is one"""
+    settings = load_tuned(config)
+    return apply_tuned(config, settings) if settings else config
+
+def autotune(config, sample=None):
+    """Benchmark candidate settings on a speech sample and cache the best ones"""
+    sample = sample or config.get("autotune", {}).get("sample")
+    if not sample:
+        raise RuntimeError("Autotuning needs a speech recording: pass --sample or set autotune.sample")
+    if PROJECT_ROOT and not os.path.isabs(sample):
+        sample = os.path.join(PROJECT_ROOT, sample)
+    print(f"Autotuning on {sample}...")
+    settings = Autotuner(config, sample).run()
+    save_tuned(config, settings)
+    print(f"Tuned: {settings['model']} {settings['compute_type']}, beam {settings['beam_size']}"
+          f"{', ' + str(settings['cpu_threads']) + ' threads' if settings['cpu_threads'] else ''}"
+          f" (RTF {settings['rtf']:.2f})")
+    return settings
+
+class SkaldServer:
+    """Serves commands from any number of clients over the Unix socket.
+
+    Each connection may send several newline-terminated JSON commands and
+    gets one JSON reply per command. Subscribed connections additionally
+    receive transcript events as they are produced.
+
+    Recordings run in sessions. Commands that name no session use the
+    default one, which records with the transcriber itself; every other
+    session is a transcriber.session.Session sharing its models, so up to
+    server.max_sessions recordings run at once.
+    """
+
+    def __init__(self, transcriber, config_file="config.json", source_config=None):
+        self.transcriber = transcriber
+        self.config_file = config_file
+        # The config as loaded, before tuned settings are applied
+        self.source_config = source_config if source_config is not None else transcriber.config
+        # session id -> (transcriber or Session, recording thread)
+        self.sessions = {}
+        self._ingest_count = 0
+        self.batch = None
+        # Batch transcribers replaced by a reload; closed once no job uses them
+        self._retired_batches = []
+        self._batch_jobs = 0
+        self._batch_lock = threading.Lock()
+        self.loop = None
+        # writer -> session id whose next final event ends the subscription, or False
+        self.subscribers = {}
+        transcriber.add_listener(self._on_event)
+
+        self.metrics = transcriber.metrics
+        self.started_at = time.time()
+        self.metrics.gauge("uptime_seconds", lambda: round(time.time() - self.started_at, 1))
+        self.metrics.gauge("recording", lambda: int(self.is_recording()))
+        self.metrics.gauge("model_ready", lambda: int(self.transcriber.model_ready.is_set()))
+        self.metrics.gauge("subscribers", lambda: len(self.subscribers))
+        self.metrics.gauge("sessions", lambda: len(self.sessions))
+        self.metrics.gauge("model_memory_bytes", lambda: self.transcriber.registry.resident_bytes())
+
+    def _on_event(self, event):
+        """Transcriber listener; runs on the processing thread"""
+        if self.loop is not None and self.subscribers:
+            self.loop.call_soon_threadsafe(self._broadcast, event)
+
+    def _broadcast(self, event):
+        message = encode_message(event)
+        session = event.get("session", DEFAULT_SESSION)
+        for writer, once in list(self.subscribers.items()):
+            if writer.is_closing():
+                del self.subscribers[writer]
+                continue
+            # start --wait only follows its own session
+            if once and once != session:
+                continue
+            if event["event"] == "partial" and writer.transport.get_write_buffer_size() > MAX_SUBSCRIBER_BACKLOG:
+                continue
+            writer.write(message)
+            # start --wait ends with the refined text when a draft is refined
+            if once and (event["event"] == "refined"
+                         or (event["event"] == "final" and not event.get("refining"))):
+                del self.subscribers[writer]
+
+    @property
+    def recording_thread(self):
+        """Recording thread of the default session"""
+        return self.sessions.get(DEFAULT_SESSION, (None, None))[1]
+
+    def active_sessions(self):
+        """Ids of sessions still recording or decoding; finished ones are let go"""
+        for session_id, (recorder, thread) in list(self.sessions.items()):
+            if thread.is_alive() or (recorder is not self.transcriber and recorder.busy()):
+                continue
+            del self.sessions[session_id]
+            if recorder is not self.transcriber:
+                recorder.close()
+        return list(self.sessions)
+
+    def is_recording(self, session_id=None):
+        """True while the session, or with None any session, is recording"""
+        threads = [thread for sid, (_, thread) in self.sessions.items() if session_id in (None, sid)]
+        return any(thread.is_alive() for thread in threads)
+
+    def start_session(self, command, writer=None, stream=None, remote=False, desktop=True):
+        """Start recording in the session command names.
+
+        stream, if given, makes the session's input stream from its
+        transcriber. Remote commands may not override config, which can
+        name files and sockets on this machine. Transcripts reach this
+        machine's clipboard and focused window only with desktop, and
+        never for remote commands, whatever they ask for. Returns the
+        recorder and None, or None and the reply explaining why nothing
+        was started.
+        """
+        session_id = command.get("session") or DEFAULT_SESSION
+        if not isinstance(session_id, str):
+            return None, {"status": "Error: session must be a name"}
+        if self.is_recording(session_id):
+            return None, {"status": "Already recording"}
+        max_sessions = self.transcriber.config["server"].get("max_sessions", DEFAULT_MAX_SESSIONS)
+        if session_id not in self.active_sessions() and len(self.sessions) >= max_sessions:
+            return None, {"status": f"Error: Already {max_sessions} sessions recording"}
+        model = command.get("model")
+        if model is not None and (not isinstance(model, str) or not model):
+            return None, {"status": "Error: model must be a model name or path"}
+        desktop = desktop and not remote
+        overrides = command.get("config") or {}
+        if remote and (overrides or command.get("device") is not None):
+            return None, {"status": "Error: config and device are not available over TCP"}
+        if command.get("device") is not None:
+            if not isinstance(overrides, dict):
+                return None, {"status": "Error: config overrides must be an object"}
+            overrides = dict(overrides, audio=dict(overrides.get("audio", {}), device=command["device"]))
+
+        if session_id == DEFAULT_SESSION and not overrides and desktop:
+            recorder = self.transcriber
+        else:
+            try:
+                recorder = Session(self.transcriber, session_id, overrides, client=command.get("client"),
+                                   desktop=desktop)
+            except ValueError as e:
+                return None, {"status": f"Error: Invalid session config: {e}"}
+        if command.get("wait") and writer is not None:
+            self.subscribers[writer] = session_id
+        # Just reset state, don't reinitialize
+        recorder.reset_state()
+        kwargs = {"requested_at": time.perf_counter(), "model": model}
+        if stream is not None:
+            kwargs["stream"] = stream(recorder)
+        thread = threading.Thread(target=recorder.start_recording, kwargs=kwargs)
+        self.sessions[session_id] = (recorder, thread)
+        thread.start()
+        return recorder, None
+
+    def handle_command(self, command, writer=None):
+        action = command.get("action") if isinstance(command, dict) else None
+
+        if action == "start":
+            recorder, error = self.start_session(command, writer)
+            return error or {"status": "Recording started"}
+
+        if action == "stop":
+            session_id = command.get("session") or DEFAULT_SESSION
+            if self.is_recording(session_id):
+                self.sessions[session_id][0].stop_recording()
+                return {"status": "Recording stopped"}
+            return {"status": "Not recording"}
+
+        if action == "subscribe":
+            if writer is None:
+                return {"status": "Error: subscribe needs a connection"}
+            self.subscribers[writer] = False
+            return {"status": "Subscribed"}
+
+        if action == "status":
+            if self.transcriber.model_error:
+                status = "Model failed to load"
+            elif self.transcriber.model_state == "offloaded":
+                status = "Ready (model unloaded while idle)"
+            elif not self.transcriber.model_ready.is_set():
+                status = "Loading model"
+            elif self.is_recording():
+                status = "Recording"
+            else:
+                status = "Ready"
+            return {
+                "status": status,
+                "model_load_time": self.transcriber.model_load_time,
+                "warmup_time": self.transcriber.warmup_time,
+                "models": self.transcriber.registry.loaded(),
+                "sessions": [{"session": session_id, "client": getattr(self.sessions[session_id][0], "client", None),
+                              "recording": self.is_recording(session_id)}
+                             for session_id in self.active_sessions()]
+            }
+
+        if action == "memory":
+            return dict(self.transcriber.memory_usage(), status="OK")
+
+        if action == "stats":
+            return {"status": "OK", "metrics": self.metrics.snapshot()}
+
+        if action == "reload":
+            return self.reload_config(force=True)
+
+        return {"status": f"Unknown action: {action}"}
+
+    def handle_transcribe(self, command):
+        """Transcribe files with the loaded model; runs off the event loop"""
+        files = command.get("files")
+        if not isinstance(files, list) or not files:
+            return {"status": "Error: transcribe needs a list of files"}
+        with self._batch_lock:
+            if self.batch is None:
+                self.batch = BatchTranscriber(self.transcriber)
+            batch = self.batch
+            self._batch_jobs += 1
+        try:
+            self.transcriber.restore_model()
+            results = batch.transcribe_files(files, command.get("format"), command.get("output_dir"))
+        finally:
+            with self._batch_lock:
+                self._batch_jobs -= 1
+            self._close_retired_batches()
+            self.transcriber.last_used = time.perf_counter()
+        failed = sum(1 for result in results if "error" in result)
+        return {
+            "status": f"Transcribed {len(results) - failed} of {len(results)} files",
+            "files": results
+        }
+
+    def _close_retired_batches(self):
+        with self._batch_lock:
+            if self._batch_jobs:
+                return
+            retired, self._retired_batches = self._retired_batches, []
+        for batch in retired:
+            batch.close()
+
+    def reload_config(self, force=False):
+        """Re-read the config file and apply what changed.
+
+        Without force the cached config is reused unless the file changed.
+        An invalid config is rejected and the current one stays in effect.
+        """
+        try:
+            config = ConfigLoader.load_config(self.config_file, reload=force)
+        except (OSError, ValueError, RuntimeError) as e:
+            return {"status": f"Error: Could not load config: {e}"}
+        if config is self.source_config:
+            return {"status": "Config unchanged"}
+        try:
+            changes = self.transcriber.apply_config(tuned_config(config))
+        except ValueError as e:
+            return {"status": f"Error: Invalid config: {e}"}
+        self.source_config = config
+        if not any(changes.values()):
+            return {"status": "Config unchanged"}
+
+        # The next file job picks up the new settings
+        with self._batch_lock:
+            if self.batch is not None:
+                self._retired_batches.append(self.batch)
+                self.batch = None
+        self._close_retired_batches()
+        return {"status": "Config reloaded", "changes": changes}
+
+    def _report_reload(self, response):
+        if self.transcriber.config["debug"]["print_status"] or response["status"].startswith("Error"):
+            print(response["status"])
+        for kind, names in response.get("changes", {}).items():
+            if names and kind == "restart":
+                print(f"Restart the server to apply: {', '.join(names)}")
+
+    async def watch_config(self):
+        """Reload the config when its file changes"""
+        while True:
+            interval = self.transcriber.config["server"].get("config_watch_interval", 2)
+            # A zero interval pauses watching until a reload turns it back on
+            await asyncio.sleep(interval or 2)
+            if interval and ConfigLoader.has_changed(self.config_file):
+                self._report_reload(self.reload_config())
+
+    async def watch_idle(self):
+        """Offload the model once it has been idle for whisper.models.idle.timeout"""
+        while True:
+            await asyncio.sleep(IDLE_CHECK_INTERVAL)
+            # File jobs take the lock before they use the model
+            with self._batch_lock:
+                if not self._batch_jobs and not self.active_sessions():
+                    self.transcriber.offload_if_idle()
+
+    async def handle_ingest(self, command, messages, writer, remote=False):
+        """Record from PCM frames the client sends after this command.
+
+        The reply to the command comes first; once the recording has ended,
+        by an empty frame, a disconnect or the transcriber stopping on its
+        own, a second reply with the seconds received follows. Frames that
+        arrive after that are read and dropped until the client ends the
+        stream, then the connection takes commands again. Without a session
+        name each ingest records in a session of its own.
+        """
+        sample_rate = command.get("sample_rate")
+        channels = command.get("channels", 1)
+        compression = command.get("compression", "none")
+        if not isinstance(sample_rate, int) or not 8000 <= sample_rate <= 48000:
+            return {"status": "Error: sample_rate must be between 8000 and 48000"}
+        if channels not in (1, 2):
+            return {"status": "Error: channels must be 1 or 2"}
+        if compression not in COMPRESSIONS:
+            return {"status": f"Error: compression must be one of: {', '.join(COMPRESSIONS)}"}
+        if not command.get("session"):
+            self._ingest_count += 1
+            command = dict(command, session=f"ingest-{self._ingest_count}")
+        streams = []
+
+        def push_stream(recorder):
+            streams.append(PushStream(recorder.audio_callback, channels, recorder.sample_rate,
+                                      source_rate=sample_rate))
+            return streams[0]
+        # The client gets the text with wait; it is not typed into this machine's windows
+        recorder, error = self.start_session(command, writer, stream=push_stream, remote=remote, desktop=False)
+        if error:
+            return error
+        stream = streams[0]
+        writer.write(encode_message({"status": "Recording started"}))
+        await writer.drain()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, stream.started.wait, INGEST_START_TIMEOUT)
+        self.metrics.count("ingest_sessions_total")
+
+        received = 0
+        finished = False
+        try:
+            while True:
+                payload = await messages.read_frame()
+                if not payload:
+                    break
+                if finished:
+                    continue
+                frames = pcm_to_float(decode_frame(payload, compression), channels)
+                if stream.push(frames):
+                    received += len(frames)
+                else:
+                    # Stopped on silence or max_duration; drain the rest
+                    finished = True
+                    writer.write(encode_message({"status": "Recording stopped",
+                                                 "seconds": round(received / sample_rate, 2)}))
+                    await writer.drain()
+        finally:
+            if not stream.stopped.is_set():
+                recorder.stop_recording()
+            self.metrics.count("ingest_seconds_total", received / sample_rate)
+        if payload is None:
+            raise ConnectionResetError("Client disconnected while ingesting")
+        if not finished:
+            return {"status": "Recording stopped", "seconds": round(received / sample_rate, 2)}
+        return None
+
+    async def dispatch(self, command, writer, messages=None, remote=False):
+        if isinstance(command, dict) and command.get("action") == "transcribe":
+            return await asyncio.get_running_loop().run_in_executor(None, self.handle_transcribe, command)
+        if isinstance(command, dict) and command.get("action") == "ingest" and messages is not None:
+            return await self.handle_ingest(command, messages, writer, remote)
+        return self.handle_command(command, writer)
+
+    async def handle_client(self, reader, writer, remote=False):
+        """Serve one connection; remote ones come over TCP and are limited to REMOTE_ACTIONS"""
+        messages = MessageReader(reader)
+        self.metrics.count("client_connections_total")
+        try:
+            while True:
+                try:
+                    command = await messages.read()
+                except ValueError as e:
+                    writer.write(encode_message({"status": f"Error: Invalid message: {e}"}))
+                    await writer.drain()
+                    break
+                if command is None:
+                    break
+                action = command.get("action") if isinstance(command, dict) else None
+                if remote and action not in REMOTE_ACTIONS:
+                    response = {"status": f"Error: {action} is not available over TCP"}
+                else:
+                    try:
+                        response = await self.dispatch(command, writer, messages, remote)
+                    except ValueError as e:
+                        # An ingest stream out of step; the rest of it can't be read
+                        writer.write(encode_message({"status": f"Error: Invalid frame: {e}"}))
+                        await writer.drain()
+                        break
+                if response is not None:
+                    writer.write(encode_message(response))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.pop(writer, None)
+            writer.close()
+
+    async def write_metrics(self, path, interval):
+        """Keep a Prometheus text file up to date for a textfile collector"""
+        while True:
+            try:
+                self.metrics.write_prometheus(path)
+            except OSError as e:
+                print(f"Warning: Could not write metrics to {path}: {e}")
+                return
+            await asyncio.sleep(interval)
+
+    async def serve(self, socket_path):
+        self.loop = asyncio.get_running_loop()
+        metrics_config = self.transcriber.config.get("metrics", {})
+        if metrics_config.get("prometheus_file"):
+            self.loop.create_task(self.write_metrics(metrics_config["prometheus_file"],
+                                                     metrics_config.get("write_interval", 15)))
+        self.loop.create_task(self.watch_config())
+        self.loop.create_task(self.watch_idle())
+        if hasattr(signal, "SIGHUP"):
+            self.loop.add_signal_handler(signal.SIGHUP,
+                                         lambda: self._report_reload(self.reload_config(force=True)))
+        server_config = self.transcriber.config["server"]
+        if server_config.get("tcp_port"):
+            tcp_server = await asyncio.start_server(functools.partial(self.handle_client, remote=True),
+                                                    host=server_config.get("tcp_host", "127.0.0.1"),
+                                                    port=server_config["tcp_port"])
+            self.loop.create_task(tcp_server.serve_forever())
+        server = await asyncio.start_unix_server(self.handle_client, path=socket_path)
+        async with server:
+            await server.serve_forever()
+
+def run_server(argv=None):
+    parser = argparse.ArgumentParser(prog="./skald-server")
+    parser.add_argument("--autotune", action="store_true",
+                        help="benchmark models and settings on this machine, then start with the best ones")
+    parser.add_argument("--sample", help="with --autotune: speech recording to tune on (default: autotune.sample)")
+    args = parser.parse_args(argv)
+
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
     if os.path.exists(SOCKET_PATH):
         os.remove(SOCKET_PATH)
-        
-    # Initialize transcriber once at startup
+
+    # Initialize transcriber once at startup; the model loads in the
+    # background so commands are accepted right away
+    if args.autotune:
+        settings = autotune(config, args.sample)
+    else:
+        settings = load_tuned(config)
+        if settings:
+            print(f"Using tuned settings: {settings['model']} {settings['compute_type']}, "
+                  f"beam {settings['beam_size']} (rerun with --autotune to measure again)")
+    runtime_config = apply_tuned(config, settings) if settings else config
+
     print("Initializing transcriber...")
-    transcriber = AudioTranscriber()
-    recording_thread = None
-    
-    # Get timeout from config
-    config = ConfigLoader.load_config("config.json")
-    socket_timeout = config["server"]["socket_timeout"]
-    
-    display_startup_message()
+    transcriber = AudioTranscriber(config=runtime_config, load_model=False)
+
+    def report_ready():
+        warmup = f", warm-up {transcriber.warmup_time:.2f}s" if transcriber.warmup_time else ""
+        print(f"Model ready (load {transcriber.model_load_time:.2f}s{warmup})")
+
+    transcriber.load_model_async(on_ready=report_ready)
+    if transcriber.warm_stream_enabled:
+        transcriber.open_warm_stream()
+
+    display_startup_message(transcriber.config)
     print("Server started. Waiting for commands...")
-    
+
     try:
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.bind(SOCKET_PATH)
-        sock.listen(1)
-        sock.settimeout(socket_timeout)  # Use configured timeout
-        
-        while True:
-            try:
-                conn, addr = sock.accept()
-                conn.settimeout(socket_timeout)  # Use same timeout for connection
-                with conn:
-                    data = conn.recv(1024).decode()
-                    if not data:
-                        continue
-                        
-                    command = json.loads(data)
-                    
-                    if command["action"] == "start":
-                        if not recording_thread or not recording_thread.is_alive():
-                            # Just reset state, don't reinitialize
-                            transcriber.reset_state()
-                            recording_thread = threading.Thread(target=transcriber.start_recording)
-                            recording_thread.start()
-                            conn.send(json.dumps({"status": "Recording started"}).encode())
-                        else:
-                            conn.send(json.dumps({"status": "Already recording"}).encode())
-                            
-                    elif command["action"] == "stop":
-                        if recording_thread and recording_thread.is_alive():
-                            transcriber.recording.clear()
-                            conn.send(json.dumps({"status": "Recording stopped"}).encode())
-                        else:
-                            conn.send(json.dumps({"status": "Not recording"}).encode())
-            except socket.timeout:
-                continue
-                
+        asyncio.run(SkaldServer(transcriber, source_config=config).serve(SOCKET_PATH))
     except Exception as e:
         print(f"Error: {e}")
         cleanup()
@@ -104,4 +535,4 @@ if __name__ == "__main__":
         run_server()
     except Exception as e:
         print(f"Error: {e}")
-        cleanup() 
+        cleanup()
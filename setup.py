@@ -34,7 +34,6 @@ setup(
         'numpy',
         'sounddevice',
         'faster-whisper',
-        'pyperclip',
-        'torch'
+        'pyperclip'
     ]
 )
\ No newline at end of file
@@ -0,0 +1,65 @@
+import wave
+import numpy as np
+from utils.audio_file import AudioFile
+
+def write_wav(path, samples, sample_rate=16000, channels=1):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.astype("<i2").tobytes())
+
+class TestAudioFile:
+    def test_wav_is_memory_mapped(self, tmp_path):
+        path = tmp_path / "speech.wav"
+        write_wav(path, np.arange(32000) % 1000)
+
+        audio_file = AudioFile(str(path))
+
+        assert audio_file.memory_mapped
+        assert len(audio_file) == 32000
+        assert audio_file.duration == 2.0
+
+    def test_read_scales_to_float(self, tmp_path):
+        path = tmp_path / "speech.wav"
+        write_wav(path, np.full(16000, 16384))
+
+        audio = AudioFile(str(path)).read(100, 200)
+
+        assert audio.dtype == np.float32
+        assert len(audio) == 100
+        assert np.allclose(audio, 0.5)
+
+    def test_stereo_is_mixed_down(self, tmp_path):
+        path = tmp_path / "stereo.wav"
+        frames = np.zeros((16000, 2))
+        frames[:, 0] = 16384
+        write_wav(path, frames.reshape(-1), channels=2)
+
+        audio = AudioFile(str(path)).read()
+
+        assert len(audio) == 16000
+        assert np.allclose(audio, 0.25)
+
+    def test_other_rates_are_resampled(self, tmp_path):
+        path = tmp_path / "48k.wav"
+        t = np.arange(48000) / 48000
+        write_wav(path, np.sin(2 * np.pi * 440 * t) * 16384, sample_rate=48000)
+
+        audio_file = AudioFile(str(path))
+        audio = audio_file.read(8000, 8160)
+
+        assert audio_file.memory_mapped
+        assert len(audio_file) == 16000
+        delay = audio_file._resampler.delay
+        expected = 0.5 * np.sin(2 * np.pi * 440 * (np.arange(8000, 8160) / 16000 - delay))
+        assert np.abs(audio - expected).max() < 0.01
+
+    def test_empty_wav(self, tmp_path):
+        path = tmp_path / "empty.wav"
+        write_wav(path, np.zeros(0))
+
+        audio_file = AudioFile(str(path))
+
+        assert len(audio_file) == 0
+        assert len(audio_file.read()) == 0
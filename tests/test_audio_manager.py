@@ -34,4 +34,19 @@ class TestAudioManager:
     def test_play_start_tone_disabled(self, mock_config):
         mock_config["audio"]["start_tone"]["enabled"] = False
         AudioManager.play_start_tone(mock_config)
-        # Should complete without error when disabled 
\ No newline at end of file
+        # Should complete without error when disabled
+
+    def test_start_tone_is_cached(self, mock_config):
+        tone = AudioManager.get_start_tone(mock_config)
+        assert AudioManager.get_start_tone(mock_config) is tone
+        assert len(tone) == 16000 * 150 // 1000
+
+    def test_start_tone_without_fade(self, mock_config):
+        mock_config["audio"]["start_tone"]["fade_ms"] = 0
+        tone = AudioManager.get_start_tone(mock_config)
+        assert tone[0] == 0.0
+
+    def test_play_start_tone_non_blocking(self, mock_config, mocker):
+        mock_play = mocker.patch('sounddevice.play')
+        AudioManager.play_start_tone(mock_config, blocking=False)
+        assert mock_play.call_args.kwargs["blocking"] is False
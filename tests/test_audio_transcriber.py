@@ -1,11 +1,15 @@
 import pytest
+import copy
 import numpy as np
+from collections import deque
 import threading
+import time
 import queue
 import platform
 import shutil
 from unittest.mock import MagicMock, patch
 from transcriber.audio_transcriber import AudioTranscriber
+from tests.test_audio_file import write_wav
 
 class TestAudioTranscriber:
     @pytest.fixture
@@ -45,7 +49,7 @@ class TestAudioTranscriber:
     @pytest.fixture
     def transcriber(self, mock_config, mocker):
         # Mock all external dependencies
-        mocker.patch('faster_whisper.WhisperModel')
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
         mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
         mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
         mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=True)
@@ -61,6 +65,226 @@ class TestAudioTranscriber:
         transcriber.audio_callback(audio_data, 1600, 0, None)
         assert len(transcriber.audio_buffer) > 0
 
+    def test_audio_callback_hands_off_full_chunk(self, transcriber):
+        block = np.full((transcriber.chunk_size // 2 + 1, 1), 0.5, dtype=np.float32)
+        # A pause shortly before the chunk boundary
+        pause = transcriber.chunk_size - transcriber.chunk_size // 2 - 8000
+        block[pause:pause + 1600] = 0.0
+
+        transcriber.audio_callback(block, len(block), 0, None)
+        assert transcriber.audio_queue.empty()
+
+        transcriber.audio_callback(block, len(block), 0, None)
+        chunk = transcriber.audio_queue.get_nowait()
+        assert chunk.dtype == np.float32
+        assert transcriber.chunk_size - 8000 <= len(chunk) < transcriber.chunk_size - 8000 + 1600
+        assert len(transcriber.audio_buffer) == 2 * len(block) - len(chunk)
+
+    def test_audio_callback_cuts_at_pause(self, transcriber):
+        speech = np.full((transcriber.min_chunk_size, 1), 0.5, dtype=np.float32)
+        pause = np.zeros((1600, 1), dtype=np.float32)
+
+        transcriber.audio_callback(speech, len(speech), 0, None)
+        for _ in range(5):
+            transcriber.audio_callback(pause, len(pause), 0, None)
+
+        chunk = transcriber.audio_queue.get_nowait()
+        assert len(chunk) >= transcriber.min_chunk_size
+        assert transcriber.recording.is_set()
+
+    def test_warm_stream_prepends_preroll(self, transcriber):
+        block = np.full((1600, 1), 0.5, dtype=np.float32)
+        for _ in range(5):
+            transcriber._warm_callback(block, 1600, None, None)
+
+        assert len(transcriber.preroll) == transcriber.preroll.capacity
+        assert len(transcriber.audio_buffer) == 0
+
+        transcriber._capture_requested_at = 0.0
+        transcriber.capturing.set()
+        transcriber._warm_callback(block, 1600, None, None)
+
+        assert len(transcriber.audio_buffer) == transcriber.preroll.capacity + 1600
+        assert len(transcriber.preroll) == 0
+        assert transcriber.capture_latency is not None
+
+    def test_warm_stream_recording_stopped_by_hand(self, mock_config, mocker):
+        mock_config["audio"]["source"] = {"type": "synthetic", "speed": 10}
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        transcriber = AudioTranscriber(config=mock_config)
+        transcriber.model.transcribe.return_value = ([mocker.MagicMock(text="hello")], None)
+        events = []
+
+        def listener(event):
+            events.append(event)
+            if event["event"] == "started":
+                # Warm callbacks run before capture starts
+                time.sleep(0.05)
+        transcriber.add_listener(listener)
+
+        transcriber.open_warm_stream()
+        try:
+            transcriber.reset_state()
+            recording = threading.Thread(target=transcriber.start_recording)
+            recording.start()
+            time.sleep(0.2)
+            transcriber.stop_recording()
+            recording.join(5)
+        finally:
+            transcriber.close_warm_stream()
+
+        assert [event["text"] for event in events if event["event"] == "final"] == ["hello"]
+
+    def test_process_audio_skips_silent_chunk(self, transcriber, mocker):
+        mock_model = mocker.MagicMock()
+        transcriber.model = mock_model
+
+        silence = np.zeros(16000, dtype=np.float32)
+        silence[8000] = 1.0  # A single click is not speech
+        transcriber.audio_queue.put(silence)
+        transcriber.recording.clear()
+        transcriber.process_audio()
+
+        assert not mock_model.transcribe.called
+        assert transcriber.metrics.counters["chunks_skipped_silent_total"] == 1
+
+    def test_process_audio_batches_backlog(self, mock_config, mocker):
+        mock_config["processing"]["batch_decode"] = {"enabled": True, "batch_size": 4}
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        transcriber = AudioTranscriber(config=mock_config)
+        batched = mocker.patch('transcriber.audio_transcriber.transcribe_batched',
+                               side_effect=lambda model, pieces, options, batch_size:
+                               [[(0.0, 1.0, f"chunk {index}")] for index in range(len(pieces))])
+
+        for _ in range(3):
+            chunk = np.full(16000, 0.5, dtype=np.float32)
+            transcriber.audio_buffer.write(chunk)
+            transcriber.audio_queue.put(transcriber.audio_buffer.read())
+        transcriber.recording.clear()
+        transcriber.process_audio()
+
+        assert batched.call_count == 1
+        assert len(batched.call_args.args[1]) == 3
+        assert not transcriber.model.transcribe.called
+        assert len(transcriber.audio_buffer) == 0 and transcriber.audio_buffer.free == transcriber.audio_buffer.capacity
+        assert transcriber.metrics.histograms["decode_batch_size"].count == 1
+
+    def test_parallel_decodes_commit_in_order(self, mock_config, mocker):
+        mock_config["whisper"]["num_workers"] = 3
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        transcriber = AudioTranscriber(config=mock_config)
+        threads = set()
+
+        def transcribe(audio, **options):
+            threads.add(threading.get_ident())
+            index = int(round(float(audio.max()) * 10))
+            # The first chunk takes longest
+            time.sleep(0.03 * (3 - index))
+            return [mocker.MagicMock(text=f"chunk {index}")], None
+        transcriber.model.transcribe.side_effect = transcribe
+        events = []
+        transcriber.add_listener(events.append)
+
+        for index in range(3):
+            transcriber.audio_buffer.write(np.full(16000, (index + 1) / 10, dtype=np.float32))
+            transcriber.audio_queue.put(transcriber.audio_buffer.read())
+        transcriber.recording.clear()
+        transcriber.process_audio()
+
+        committed = [event["text"] for event in events if event["event"] == "committed"]
+        assert committed == ["chunk 1", "chunk 2", "chunk 3"]
+        assert len(threads) > 1
+        assert transcriber.metrics.histograms["transcribe_seconds"].count == 3
+        assert transcriber.audio_buffer.free == transcriber.audio_buffer.capacity
+        transcriber.decode_pool.shutdown()
+
+    @pytest.fixture
+    def adaptive_transcriber(self, mock_config, mocker):
+        mock_config["processing"]["adaptive"] = {"enabled": True, "latency_target": 5.0,
+                                                 "min_chunk_duration": 5, "overload_policy": "downgrade"}
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        transcriber = AudioTranscriber(config=mock_config)
+        transcriber.active_model = transcriber.model
+        return transcriber
+
+    def test_adaptive_chunk_size(self, adaptive_transcriber):
+        # Decoding takes half as long as the audio: 10 s chunks meet the 5 s target
+        adaptive_transcriber._record_decode(5.0, 10 * 16000)
+        adaptive_transcriber._adapt(deque())
+        assert adaptive_transcriber.chunk_size == 10 * 16000
+        assert adaptive_transcriber.handoff_size == 10 * 16000
+
+        # A fast model gets the configured chunk_duration, a very slow one the minimum
+        adaptive_transcriber.rtf_estimate = 0.01
+        adaptive_transcriber._adapt(deque())
+        assert adaptive_transcriber.chunk_size == 30 * 16000
+        adaptive_transcriber.rtf_estimate = 10.0
+        adaptive_transcriber._adapt(deque())
+        assert adaptive_transcriber.chunk_size == 5 * 16000
+
+    def test_overload_downgrades_beam_size(self, adaptive_transcriber):
+        adaptive_transcriber.rtf_estimate = 1.0
+        adaptive_transcriber._adapt(deque([np.zeros(20 * 16000, dtype=np.float32)]))
+        assert adaptive_transcriber.overloaded
+        adaptive_transcriber.active_model.transcribe.return_value = ([], None)
+
+        speeches = [np.zeros(16000, dtype=np.float32)]
+        adaptive_transcriber._transcribe_speech(speeches, adaptive_transcriber._decode_options(speeches))
+
+        assert adaptive_transcriber.active_model.transcribe.call_args.kwargs["beam_size"] == 1
+        assert adaptive_transcriber.metrics.counters["overload_total"] == 1
+
+    def test_overload_merges_ready_chunks(self, adaptive_transcriber, mocker):
+        adaptive_transcriber.overload_policy = "merge"
+        adaptive_transcriber.overloaded = True
+        segment = mocker.MagicMock(text="merged")
+        adaptive_transcriber.active_model.transcribe.return_value = ([segment], None)
+        backlog = deque(np.zeros(16000, dtype=np.float32) for _ in range(3))
+
+        chunks = adaptive_transcriber._next_chunks(backlog)
+        speeches = [chunk for chunk, _ in chunks]
+        results = adaptive_transcriber._transcribe_speech(speeches, adaptive_transcriber._decode_options(speeches))
+
+        assert len(chunks) == 3
+        assert [list(texts) for texts in results] == [["merged"]]
+        assert len(adaptive_transcriber.active_model.transcribe.call_args.args[0]) == 3 * 16000
+
+    def test_overload_drops_oldest_chunks(self, adaptive_transcriber):
+        adaptive_transcriber.overload_policy = "drop"
+        adaptive_transcriber.overloaded = True
+        adaptive_transcriber.rtf_estimate = 1.0
+        events = []
+        adaptive_transcriber.add_listener(events.append)
+        for _ in range(4):
+            adaptive_transcriber.audio_buffer.write(np.zeros(3 * 16000, dtype=np.float32))
+            adaptive_transcriber.audio_queue.put(adaptive_transcriber.audio_buffer.read())
+
+        chunks = adaptive_transcriber._next_chunks(deque())
+
+        # 5 s of audio can be decoded within the target: only the newest chunk is kept
+        assert len(chunks) == 1
+        assert adaptive_transcriber.audio_buffer.free == adaptive_transcriber.audio_buffer.capacity - 3 * 16000
+        assert adaptive_transcriber.metrics.counters["dropped_audio_seconds_total"] == 9
+        assert events[0]["event"] == "error"
+
+    def test_audio_callback_records_metrics(self, transcriber, mocker):
+        status = mocker.MagicMock(input_overflow=True)
+        transcriber.audio_callback(np.random.randn(1600, 1) * 0.1, 1600, None, status)
+
+        assert transcriber.metrics.histograms["callback_seconds"].count == 1
+        assert transcriber.metrics.counters["callback_input_overflow_total"] == 1
+
     def test_silence_detection(self, transcriber, mocker):
         # We need to mock the silence counter since it's incremented over time
         # Set silence counter to exceed the silence duration threshold
@@ -96,6 +320,204 @@ class TestAudioTranscriber:
 
         # Verify model was called
         assert mock_model.transcribe.called
+        assert transcriber.metrics.histograms["transcribe_seconds"].count == 1
+        assert transcriber.metrics.histograms["transcribe_rtf"].count == 1
+
+    def test_process_audio_resamples_to_16k(self, mock_config, mocker):
+        mock_config["audio"]["sample_rate"] = 48000
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        transcriber = AudioTranscriber(config=mock_config)
+        transcriber.model.transcribe.return_value = ([], None)
+
+        speech = (np.sin(np.arange(48000) / 10) * 0.3).astype(np.float32)
+        transcriber.audio_queue.put(speech)
+        transcriber.recording.clear()
+        transcriber.process_audio()
+
+        audio = transcriber.model.transcribe.call_args[0][0]
+        assert audio.dtype == np.float32
+        assert len(audio) == 16000
+
+    def test_session_model(self, transcriber, mocker):
+        session_model = mocker.MagicMock()
+        session_model.transcribe.return_value = ([], None)
+        mocker.patch.object(transcriber.registry, 'get', return_value=session_model)
+        transcriber.session_model = "small"
+
+        transcriber.audio_queue.put((np.sin(np.arange(16000) / 10) * 0.3).astype(np.float32))
+        transcriber.recording.clear()
+        transcriber.process_audio()
+
+        transcriber.registry.get.assert_called_once_with("small")
+        assert session_model.transcribe.called
+
+    def test_session_model_falls_back_to_default(self, transcriber, mocker):
+        mocker.patch.object(transcriber.registry, 'get', side_effect=RuntimeError("not found"))
+        events = []
+        transcriber.add_listener(events.append)
+        transcriber.session_model = "missing"
+
+        transcriber.recording.clear()
+        transcriber.process_audio()
+
+        assert transcriber.active_model is transcriber.model
+        assert events[0]["event"] == "error"
+
+    def test_draft_is_refined(self, mock_config, mocker):
+        mock_config["processing"]["refine"] = {"enabled": True, "draft_model": "base"}
+        mock_config["debug"]["print_transcriptions"] = False
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=True)
+        clipboard = mocker.patch('transcriber.output.pyperclip')
+        clipboard.paste.return_value = "draft text"
+        transcriber = AudioTranscriber(config=mock_config)
+
+        draft = mocker.MagicMock()
+        draft.transcribe.return_value = ([mocker.MagicMock(text="draft text")], None)
+        transcriber.model.transcribe.return_value = ([mocker.MagicMock(text="refined text")], None)
+        mocker.patch.object(transcriber.registry, 'get', return_value=draft)
+        events = []
+        transcriber.add_listener(events.append)
+
+        transcriber.session_model = transcriber.draft_model
+        transcriber.audio_queue.put((np.sin(np.arange(16000) / 10) * 0.3).astype(np.float32))
+        transcriber.recording.clear()
+        transcriber.process_audio()
+        transcriber._refine_thread.join()
+        transcriber.output.flush()
+
+        final = next(event for event in events if event["event"] == "final")
+        assert final["text"] == "draft text" and final["refining"]
+        assert events[-1]["event"] == "refined"
+        assert events[-1]["text"] == "refined text"
+        clipboard.copy.assert_called_with("refined text")
+        # The refinement pass sees the same audio as the draft
+        assert len(transcriber.model.transcribe.call_args[0][0]) == len(draft.transcribe.call_args[0][0])
+
+    def test_long_refinement_is_decoded_in_pieces(self, transcriber, mocker):
+        transcriber.model.transcribe.side_effect = lambda audio, **options: \
+            ([mocker.MagicMock(text=f"{len(audio) / 16000:.0f}s")], None)
+        events = []
+        transcriber.add_listener(events.append)
+        audio = (np.sin(np.arange(70 * 16000) / 10) * 0.3).astype(np.float32)
+
+        transcriber._refine(audio, "draft", None)
+
+        # chunk_duration is 30: no decode holds the scheduler for longer
+        lengths = [len(call.args[0]) for call in transcriber.model.transcribe.call_args_list]
+        assert sum(lengths) == len(audio) and max(lengths) <= 30 * 16000
+        assert events[-1]["text"] == " ".join(f"{length / 16000:.0f}s" for length in lengths)
+
+    def test_process_audio_streaming(self, mock_config, mocker):
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=True)
+        mock_copy = mocker.patch('pyperclip.copy')
+
+        config = mock_config.copy()
+        config['processing']['streaming'] = {"enabled": True, "step_ms": 500, "max_window_duration": 15}
+        transcriber = AudioTranscriber(config=config)
+        assert transcriber.handoff_size == 8000
+
+        def make_segment(*words):
+            segment = mocker.MagicMock()
+            segment.words = []
+            for start, end, text in words:
+                word = mocker.MagicMock()
+                word.start, word.end, word.word = start, end, text
+                segment.words.append(word)
+            return segment
+
+        mock_model = mocker.MagicMock()
+        mock_model.transcribe.side_effect = [
+            ([make_segment((0.0, 0.3, " hello"))], None),
+            ([make_segment((0.0, 0.3, " hello"), (0.4, 0.8, " world"))], None),
+            ([make_segment((0.05, 0.4, " world"))], None),
+        ]
+        transcriber.model = mock_model
+
+        for _ in range(2):
+            transcriber.audio_queue.put(np.full(8000, 0.5, dtype=np.float32))
+        transcriber.recording.clear()
+        transcriber.process_audio()
+
+        assert mock_model.transcribe.call_count == 3
+        # The final pass only decodes audio after the committed "hello"
+        final_window = mock_model.transcribe.call_args_list[-1][0][0]
+        assert len(final_window) == 16000 - int(0.3 * 16000)
+        transcriber.output.flush()
+        mock_copy.assert_called_with("hello world")
+
+    def test_background_load_buffers_audio(self, mock_config, mocker):
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        mock_model = mocker.MagicMock()
+        mock_model.transcribe.return_value = ([], None)
+        mocker.patch('transcriber.audio_transcriber.WhisperModel', return_value=mock_model)
+
+        transcriber = AudioTranscriber(config=mock_config, load_model=False)
+        assert transcriber.model is None
+        assert not transcriber.model_ready.is_set()
+
+        transcriber.audio_buffer.write(np.full(16000, 0.5, dtype=np.float32))
+        transcriber.audio_queue.put(transcriber.audio_buffer.read())
+        transcriber.recording.clear()
+
+        processing_thread = threading.Thread(target=transcriber.process_audio)
+        processing_thread.start()
+        # Queued audio is copied out of the ring while the model loads
+        for _ in range(50):
+            if transcriber.audio_buffer.free == transcriber.audio_buffer.capacity:
+                break
+            threading.Event().wait(0.01)
+        assert transcriber.audio_buffer.free == transcriber.audio_buffer.capacity
+
+        transcriber.load_model_async().join()
+        processing_thread.join(timeout=5)
+
+        assert mock_model.transcribe.call_count == 1
+        assert transcriber.model_load_time is not None
+
+    def test_warm_up(self, mock_config, mocker):
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=True)
+        mock_model = mocker.MagicMock()
+        mock_model.transcribe.return_value = ([], None)
+        mocker.patch('transcriber.audio_transcriber.WhisperModel', return_value=mock_model)
+
+        config = mock_config.copy()
+        config['whisper']['warmup'] = {"enabled": True, "duration": 0.5}
+        transcriber = AudioTranscriber(config=config)
+
+        assert mock_model.transcribe.call_count == 1
+        assert len(mock_model.transcribe.call_args[0][0]) == 8000
+        assert transcriber.warmup_time is not None
+
+    def test_process_audio_emits_events(self, transcriber, mocker):
+        mock_model = mocker.MagicMock()
+        mock_segment = mocker.MagicMock()
+        mock_segment.text = "test transcription"
+        mock_model.transcribe.return_value = ([mock_segment], None)
+        transcriber.model = mock_model
+        mocker.patch('pyperclip.copy')
+
+        events = []
+        transcriber.add_listener(events.append)
+        transcriber.audio_queue.put(np.random.randn(16000).astype(np.float32))
+        transcriber.stop_recording()
+        transcriber.process_audio()
+
+        assert [e["event"] for e in events] == ["partial", "committed", "final"]
+        assert events[-1]["text"] == "test transcription"
+        assert events[-1]["timing"]["stop_to_final"] is not None
 
     def test_reset_state(self, transcriber):
         # Set some initial state
@@ -110,11 +532,59 @@ class TestAudioTranscriber:
         assert transcriber.recording.is_set()
         assert transcriber.audio_queue.empty()
 
+    def test_apply_config_live_settings(self, transcriber, mock_config):
+        config = copy.deepcopy(mock_config)
+        config["audio"]["silence_threshold"] = 0.05
+        config["whisper"]["beam_size"] = 1
+
+        changes = transcriber.apply_config(config)
+
+        assert changes == {"live": ["audio.silence_threshold", "whisper.beam_size"],
+                           "session": [], "model": [], "restart": []}
+        assert transcriber.config is config
+        assert transcriber.vad.threshold == 0.05
+        assert transcriber._swap_thread is None
+
+    def test_apply_config_capture_settings_wait_for_next_recording(self, transcriber, mock_config):
+        config = copy.deepcopy(mock_config)
+        config["audio"]["chunk_duration"] = 10
+        chunk_size = transcriber.chunk_size
+
+        changes = transcriber.apply_config(config)
+
+        assert changes["session"] == ["audio.chunk_duration"]
+        assert transcriber.chunk_size == chunk_size
+        transcriber.reset_state()
+        assert transcriber.chunk_size == 10 * 16000
+
+    def test_apply_config_swaps_model_in_background(self, transcriber, mock_config, mocker):
+        whisper_model = mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        config = copy.deepcopy(mock_config)
+        config["whisper"]["model"] = "base"
+
+        changes = transcriber.apply_config(config)
+        transcriber._swap_thread.join()
+
+        assert changes["model"] == ["whisper.model"]
+        assert transcriber.model_name == "base"
+        assert transcriber.model is whisper_model.return_value
+        assert whisper_model.call_args.args[0] == "base"
+        # The default model stays loaded for a swap back
+        assert [model["model"] for model in transcriber.registry.loaded()] == ["tiny", "base"]
+
+    def test_apply_config_rejects_invalid_config(self, transcriber, mock_config):
+        config = copy.deepcopy(mock_config)
+        config["audio"]["sample_rate"] = 12345
+
+        with pytest.raises(ValueError):
+            transcriber.apply_config(config)
+        assert transcriber.config is mock_config
+
     def test_cleanup(self, transcriber):
         # Add some data to the queue
         test_audio = np.random.randn(1600)
         transcriber.audio_queue.put(test_audio)
-        transcriber.audio_buffer.extend(test_audio)
+        transcriber.audio_buffer.write(test_audio)
         transcriber._processing_complete = True
 
         # Call cleanup
@@ -133,7 +603,7 @@ class TestAudioTranscriber:
         config['processing']['auto_paste'] = True
 
         # Mock dependencies
-        mocker.patch('faster_whisper.WhisperModel')
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
         mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
         mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
         mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=True)
@@ -142,4 +612,120 @@ class TestAudioTranscriber:
         transcriber = AudioTranscriber(config=config)
 
         # Verify auto-paste was detected
-        assert transcriber.can_autopaste == True
\ No newline at end of file
+        assert transcriber.can_autopaste == True
+        assert [sink.name for sink in transcriber.output.sinks] == ["clipboard", "paste"]
+
+    def test_clipboard_check_leaves_contents_alone(self, mock_config, mocker):
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        clipboard = mocker.patch('transcriber.output.pyperclip')
+
+        transcriber = AudioTranscriber(config=mock_config)
+
+        assert transcriber.clipboard_available
+        assert not clipboard.copy.called
+
+    def test_slow_output_does_not_delay_decoding(self, transcriber, mocker):
+        released = threading.Event()
+        sink = mocker.MagicMock()
+        sink.final.side_effect = lambda text, refining: released.wait(5)
+        transcriber.output.sinks = [sink]
+        transcriber.model.transcribe.return_value = ([mocker.MagicMock(text="hello")], None)
+
+        transcriber.audio_queue.put((np.sin(np.arange(16000) / 10) * 0.3).astype(np.float32))
+        transcriber.recording.clear()
+        process_start = time.perf_counter()
+        transcriber.process_audio()
+
+        assert time.perf_counter() - process_start < 1
+        released.set()
+        transcriber.output.flush()
+        sink.final.assert_called_once_with("hello", False)
+
+    def test_records_from_a_file_at_ten_times_real_time(self, mock_config, mocker, tmp_path):
+        write_wav(tmp_path / "speech.wav", np.sin(np.arange(2 * 16000) / 10) * 10000)
+        mock_config["audio"]["source"] = {"type": "file", "path": str(tmp_path / "speech.wav"), "speed": 10}
+        mock_config["audio"]["silence_duration"] = 1
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        initialize_audio = mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        transcriber = AudioTranscriber(config=mock_config)
+        transcriber.model.transcribe.return_value = ([mocker.MagicMock(text="hello")], None)
+        events = []
+        transcriber.add_listener(events.append)
+
+        transcriber.reset_state()
+        record_start = time.perf_counter()
+        transcriber.start_recording()
+
+        # Two seconds of speech and one of silence
+        assert time.perf_counter() - record_start < 1.5
+        initialize_audio.assert_not_called()
+        assert [event["text"] for event in events if event["event"] == "final"] == ["hello"]
+        decoded = transcriber.model.transcribe.call_args.args[0]
+        assert 1.9 * 16000 < len(decoded) < 3.1 * 16000
+
+    def test_process_worker(self, mock_config, mocker):
+        mock_config["whisper"]["process_worker"] = {"enabled": True, "decode_timeout": 30}
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        worker_model = mocker.patch('transcriber.audio_transcriber.WorkerModel')
+
+        transcriber = AudioTranscriber(config=mock_config)
+
+        assert transcriber.model is worker_model.return_value
+        assert worker_model.call_args.kwargs["decode_timeout"] == 30
+        # Chunks reach the worker through shared memory
+        assert transcriber.audio_buffer.shared_name is not None
+
+    def test_idle_model_is_unloaded_and_restored(self, transcriber, mocker):
+        transcriber.config["whisper"]["models"] = {"idle": {"timeout": 600}}
+        assert not transcriber.offload_if_idle()
+
+        transcriber.last_used -= 601
+        assert transcriber.offload_if_idle()
+        assert transcriber.model is None
+        assert transcriber.registry.loaded() == []
+        assert not transcriber.model_ready.is_set()
+        assert transcriber.memory_usage()["model_state"] == "offloaded"
+
+        transcriber.restore_model().join()
+        assert transcriber.model is not None
+        assert transcriber.model_ready.is_set()
+        assert transcriber.model_state == "loaded"
+
+    def test_failed_restore_is_retried(self, transcriber, mocker):
+        transcriber.config["whisper"]["models"] = {"idle": {"timeout": 600}}
+        transcriber.last_used -= 601
+        assert transcriber.offload_if_idle()
+        whisper_model = mocker.patch('transcriber.audio_transcriber.WhisperModel',
+                                     side_effect=[RuntimeError("out of memory"), mocker.MagicMock()])
+
+        transcriber.restore_model().join()
+        assert transcriber.model_state == "offloaded"
+        assert transcriber.model_error is not None
+
+        transcriber.restore_model().join()
+        assert transcriber.model_state == "loaded"
+        assert transcriber.model is not None
+        assert transcriber.model_error is None
+        assert transcriber.model_ready.is_set()
+        assert whisper_model.call_count == 2
+
+    def test_idle_model_is_quantized(self, transcriber, mocker):
+        transcriber.config["whisper"]["models"] = {"idle": {"timeout": 600, "action": "quantize",
+                                                            "compute_type": "int8_float32"}}
+        transcriber.last_used -= 601
+
+        assert transcriber.offload_if_idle()
+        transcriber._swap_thread.join()
+        assert transcriber.model_state == "quantized"
+        assert [model["compute_type"] for model in transcriber.registry.loaded()] == ["int8_float32"]
+        assert transcriber.model_ready.is_set()
+
+        transcriber.restore_model().join()
+        assert transcriber.model_state == "loaded"
+        assert [model["compute_type"] for model in transcriber.registry.loaded()] == ["int8"]
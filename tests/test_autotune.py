@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+from transcriber.autotune import (Autotuner, word_error_rate, load_tuned, save_tuned, apply_tuned,
+                                  thread_candidates)
+from tests.test_audio_file import write_wav
+
+class TestWordErrorRate:
+    def test_identical(self):
+        assert word_error_rate("Hello, world!", "hello world") == 0.0
+
+    def test_substitution_and_deletion(self):
+        assert word_error_rate("the quick brown fox", "the quack fox") == 0.5
+
+class TestAutotuner:
+    @pytest.fixture
+    def config(self):
+        return {
+            "whisper": {"model": "small", "language": "en", "task": "transcribe", "device": "cpu"},
+            "autotune": {"models": ["small", "base"], "compute_types": ["int8"], "beam_sizes": [5, 1],
+                         "target_rtf": 0.5}
+        }
+
+    @pytest.fixture
+    def sample(self, tmp_path):
+        path = tmp_path / "sample.wav"
+        write_wav(path, np.zeros(2 * 16000))
+        return str(path)
+
+    def test_most_accurate_candidate_within_target(self, config, sample, mocker):
+        measurements = {
+            ("small", 5): (0.9, "the quick brown fox"),
+            ("small", 1): (0.4, "the quick brown fox"),
+            ("base", 5): (0.3, "the quick brown box"),
+            ("base", 1): (0.1, "a quack brown box")
+        }
+
+        def measure(candidate, cpu_threads=0):
+            rtf, text = measurements[(candidate["model"], candidate["beam_size"])]
+            # Two threads are fastest on this machine
+            return (rtf / 2 if cpu_threads == 2 else rtf), text
+        mocker.patch.object(Autotuner, "measure", side_effect=measure)
+        mocker.patch('transcriber.autotune.thread_candidates', return_value=[4, 2, 1])
+
+        best = Autotuner(config, sample, log=lambda message: None).run()
+
+        # The first candidate's transcript is the reference
+        assert (best["model"], best["compute_type"], best["beam_size"]) == ("small", "int8", 1)
+        assert best["cpu_threads"] == 2
+        assert best["rtf"] == 0.2
+
+    def test_transcript_next_to_sample_is_the_reference(self, config, sample, mocker, tmp_path):
+        (tmp_path / "sample.txt").write_text("the quick brown box")
+        mocker.patch.object(Autotuner, "measure", side_effect=lambda candidate, cpu_threads=0:
+                            (0.3, "the quick brown box") if candidate["model"] == "base"
+                            else (0.3, "the quick brown fox"))
+
+        best = Autotuner(config, sample, log=lambda message: None).run()
+
+        assert best["model"] == "base"
+
+    def test_thread_candidates(self):
+        assert all(threads >= 1 for threads in thread_candidates())
+
+class TestTuningCache:
+    @pytest.fixture
+    def config(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        return {"whisper": {"model": "small", "device": "cpu"}, "autotune": {"models": ["small", "base"]}}
+
+    def test_round_trip(self, config):
+        settings = {"model": "base", "compute_type": "int8_float32", "beam_size": 1, "cpu_threads": 4}
+        assert load_tuned(config) is None
+
+        save_tuned(config, settings)
+
+        assert load_tuned(config) == settings
+        tuned = apply_tuned(config, settings)
+        assert tuned["whisper"]["model"] == "base"
+        assert tuned["whisper"]["cpu_threads"] == 4
+        assert tuned["compute"]["cpu"] == "int8_float32"
+        assert config["whisper"]["model"] == "small"
+
+    def test_result_is_stale_after_config_change(self, config):
+        save_tuned(config, {"model": "base", "compute_type": "int8", "beam_size": 1, "cpu_threads": 0})
+        config["autotune"]["models"] = ["medium"]
+
+        assert load_tuned(config) is None
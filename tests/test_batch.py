@@ -0,0 +1,149 @@
+import json
+import time
+import threading
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+from transcriber.batch import BatchTranscriber, plan_pieces, transcribe_batched
+from transcriber.scheduler import InferenceScheduler
+from tests.test_audio_file import write_wav
+
+class TestPlanPieces:
+    def test_neighbouring_segments_share_a_piece(self):
+        pieces = plan_pieces([(0, 100), (200, 300), (900, 1000)], np.ones(100), 10, 500)
+        assert pieces == [(0, 300), (900, 1000)]
+
+    def test_long_segment_is_cut_at_quietest_frame(self):
+        scores = np.ones(100)
+        scores[42] = 0.0
+        pieces = plan_pieces([(0, 1000)], scores, 10, 500)
+        assert pieces == [(0, 420), (420, 790), (790, 1000)]
+
+class TestTranscribeBatched:
+    def test_segments_are_mapped_back_to_pieces(self, mocker):
+        pipeline = mocker.patch('transcriber.batch.BatchedInferencePipeline').return_value
+        pipeline.transcribe.return_value = ([
+            MagicMock(start=0.0, end=1.0, text=" one "),
+            MagicMock(start=2.0, end=2.5, text=" two "),
+            MagicMock(start=2.6, end=3.0, text=" "),
+            MagicMock(start=5.0, end=6.0, text=" three")
+        ], MagicMock())
+        pieces = [np.zeros(32000, dtype=np.float32), np.zeros(48000, dtype=np.float32),
+                  np.zeros(16000, dtype=np.float32)]
+
+        results = transcribe_batched(MagicMock(), pieces, {"beam_size": 1}, 8)
+
+        assert results == [[(0.0, 1.0, "one")], [(0.0, 0.5, "two")], [(0.0, 1.0, "three")]]
+        clips = pipeline.transcribe.call_args.kwargs["clip_timestamps"]
+        assert [bound for clip in clips for bound in (clip["start"], clip["end"])] == \
+            pytest.approx([0, 2, 2, 5, 5, 6], abs=1e-4)
+        assert pipeline.transcribe.call_args.kwargs["batch_size"] == 8
+
+    def test_clips_are_in_seconds(self, mocker):
+        pipeline = mocker.patch('transcriber.batch.BatchedInferencePipeline').return_value
+        pipeline.transcribe.return_value = ([], MagicMock())
+        pieces = [np.zeros(length, dtype=np.float32) for length in (16001, 33333, 7, 479999)]
+
+        transcribe_batched(MagicMock(), pieces, {}, 8)
+
+        # faster-whisper cuts each clip out of the signal at int(seconds * 16000)
+        audio = pipeline.transcribe.call_args.args[0]
+        clips = pipeline.transcribe.call_args.kwargs["clip_timestamps"]
+        assert [len(audio[int(clip["start"] * 16000):int(clip["end"] * 16000)]) for clip in clips] == \
+            [len(piece) for piece in pieces]
+
+class TestBatchTranscriber:
+    @pytest.fixture
+    def transcriber(self, mock_config):
+        transcriber = MagicMock()
+        transcriber.config = mock_config
+        transcriber.model_error = None
+        transcriber.model_ready = threading.Event()
+        transcriber.model_ready.set()
+        transcriber.decode_pool = None
+
+        def transcribe(audio, **options):
+            segment = MagicMock(start=0.0, end=len(audio) / 16000, text=" hello ")
+            return [segment], MagicMock()
+        transcriber.model.transcribe.side_effect = transcribe
+        transcriber.get_model.return_value = transcriber.model
+        return transcriber
+
+    @pytest.fixture
+    def mock_config(self):
+        return {
+            "audio": {"chunk_duration": 10, "silence_threshold": 0.01},
+            "processing": {},
+            "whisper": {"model": "tiny", "language": "en", "task": "transcribe", "beam_size": 1},
+            "batch": {"workers": 0, "format": "jsonl"}
+        }
+
+    def test_transcribe_files_writes_jsonl(self, transcriber, tmp_path):
+        path = tmp_path / "speech.wav"
+        samples = np.zeros(5 * 16000)
+        samples[16000:48000] = 16000
+        write_wav(path, samples)
+
+        results = BatchTranscriber(transcriber).transcribe_files([str(path)])
+
+        assert results[0]["output"] == str(tmp_path / "speech.jsonl")
+        lines = [json.loads(line) for line in open(results[0]["output"])]
+        assert [line["text"] for line in lines] == ["hello"]
+        assert 0.5 < lines[0]["start"] <= 1.0
+        assert 3.0 <= lines[0]["end"] < 3.5
+
+    def test_text_output(self, transcriber, tmp_path):
+        path = tmp_path / "speech.wav"
+        write_wav(path, np.full(16000, 16000))
+
+        results = BatchTranscriber(transcriber).transcribe_files([str(path)], "text", str(tmp_path / "out"))
+
+        assert "error" in results[0]
+        (tmp_path / "out").mkdir()
+        results = BatchTranscriber(transcriber).transcribe_files([str(path)], "text", str(tmp_path / "out"))
+        assert open(results[0]["output"]).read() == "hello\n"
+
+    def test_missing_file_reports_error(self, transcriber, tmp_path):
+        results = BatchTranscriber(transcriber).transcribe_files([str(tmp_path / "missing.wav")])
+        assert results[0]["file"].endswith("missing.wav")
+        assert "error" in results[0]
+
+    def test_batched_decoding(self, transcriber, mock_config, tmp_path, mocker):
+        mock_config["processing"]["batch_decode"] = {"enabled": True, "batch_size": 4}
+        path = tmp_path / "speech.wav"
+        samples = np.zeros(40 * 16000)
+        samples[16000:48000] = 16000
+        samples[20 * 16000:22 * 16000] = 16000
+        write_wav(path, samples)
+        batched = mocker.patch('transcriber.batch.transcribe_batched',
+                               side_effect=lambda model, pieces, options, batch_size:
+                               [[(0.0, 0.5, f"piece {index}")] for index in range(len(pieces))])
+
+        batch = BatchTranscriber(transcriber)
+        segments = batch.transcribe_file(str(path))
+
+        assert batched.call_count == 1
+        assert [text for _, _, text in segments] == ["piece 0", "piece 1"]
+        # Times are moved back onto the file's timeline
+        assert segments[1][0] > 19
+        assert not transcriber.model.transcribe.called
+
+    def test_pieces_decoded_on_pool_stay_in_order(self, transcriber, tmp_path):
+        path = tmp_path / "speech.wav"
+        samples = np.zeros(40 * 16000)
+        for second in [1, 12, 25]:
+            samples[second * 16000:(second + 2) * 16000] = 16000
+        write_wav(path, samples)
+
+        def transcribe(audio, **options):
+            # Later pieces finish first
+            time.sleep(0.05 / (len(transcriber.model.transcribe.call_args_list) or 1))
+            return [MagicMock(start=0.0, end=1.0, text="hello")], MagicMock()
+        transcriber.model.transcribe.side_effect = transcribe
+        transcriber.decode_pool = InferenceScheduler(3)
+
+        segments = BatchTranscriber(transcriber).transcribe_file(str(path))
+
+        transcriber.decode_pool.shutdown()
+        starts = [start for start, _, _ in segments]
+        assert len(starts) == 3 and starts == sorted(starts)
@@ -0,0 +1,41 @@
+import json
+import os
+import pytest
+from benchmarks.fixtures import synthesize, write_wav
+from benchmarks.run import run_case
+from benchmarks.compare import compare
+
+class TestBenchmarks:
+    @pytest.fixture
+    def base_config(self):
+        with open(os.path.join(os.environ["SKALD_ROOT"], "config.json.example")) as f:
+            return json.load(f)
+
+    @pytest.fixture
+    def fixture_path(self, tmp_path):
+        path = str(tmp_path / "short.wav")
+        write_wav(path, synthesize([(0.3, False), (2.0, True), (0.7, False), (2.0, True), (0.5, False)]))
+        return path
+
+    def test_stub_run_reports_metrics(self, base_config, fixture_path):
+        case = {"model": "stub", "compute_type": "n/a", "beam_size": 1, "stub_rtf": 0.01}
+
+        run, = run_case(case, [fixture_path], base_config, block_size=512, speed=0)
+
+        assert run["fixture"] == "short.wav"
+        assert run["callback_ms"]["count"] > 0
+        assert run["queue_wait_ms"]["count"] > 0
+        assert run["text_length"] > 0
+        assert run["stop_to_clipboard_ms"] is not None
+        assert run["peak_rss_mb"] > 0
+
+    def test_compare_flags_regressions(self):
+        run = {"model": "stub", "compute_type": "n/a", "beam_size": 1, "fixture": "a.wav",
+               "callback_ms": {"p99": 1.0}, "rtf": 0.1}
+        slower = dict(run, callback_ms={"p99": 1.5})
+
+        rows, regressed = compare({"results": [run]}, {"results": [slower]}, threshold=10)
+
+        assert regressed
+        assert ("callback_ms.p99", 1.0, 1.5) in [(row[1], row[2], row[3]) for row in rows]
+        assert not compare({"results": [run]}, {"results": [run]})[1]
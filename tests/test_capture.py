@@ -0,0 +1,89 @@
+import pytest
+import time
+import threading
+import numpy as np
+from utils.capture import FileSource, SyntheticSource, open_source
+from tests.test_audio_file import write_wav
+
+def collect(source, samples, timeout=5):
+    """Start source and gather what its callback receives until samples have arrived"""
+    blocks = []
+    done = threading.Event()
+
+    def callback(indata, frames, time, status):
+        blocks.append(indata.copy())
+        if sum(len(block) for block in blocks) >= samples:
+            done.set()
+    source.callback = callback
+    with source:
+        assert done.wait(timeout)
+    return np.concatenate(blocks)
+
+class TestSyntheticSource:
+    def test_tone_then_silence(self):
+        source = SyntheticSource(None, 1, 16000, frequency=400, amplitude=0.5, duration=0.5, speed=0)
+
+        audio = collect(source, 16000)[:16000, 0]
+
+        expected = 0.5 * np.sin(2 * np.pi * 400 * np.arange(8000) / 16000)
+        np.testing.assert_allclose(audio[:8000], expected, atol=1e-6)
+        assert not audio[8000:].any()
+
+    def test_noise_is_the_same_every_run(self):
+        first = collect(SyntheticSource(None, 2, 16000, signal="noise", speed=0), 4000)[:4000]
+        second = collect(SyntheticSource(None, 2, 16000, signal="noise", speed=0), 4000)[:4000]
+
+        np.testing.assert_array_equal(first, second)
+        # Channels carry the same signal, like a mono microphone on a stereo input
+        np.testing.assert_array_equal(first[:, 0], first[:, 1])
+
+    def test_paced_at_speed(self):
+        source = SyntheticSource(None, 1, 16000, speed=10)
+
+        start = time.perf_counter()
+        collect(source, 16000)
+
+        # One second of audio at ten times real time
+        assert 0.08 < time.perf_counter() - start < 0.5
+
+class TestFileSource:
+    def test_replays_the_file_then_goes_quiet(self, tmp_path):
+        samples = (np.arange(4000) % 200 - 100) * 100
+        write_wav(tmp_path / "speech.wav", samples)
+
+        audio = collect(FileSource(None, 1, 16000, str(tmp_path / "speech.wav"), speed=0), 6000)[:6000, 0]
+
+        np.testing.assert_array_equal(audio[:4000], samples / 32768.0)
+        assert not audio[4000:].any()
+
+    def test_loop(self, tmp_path):
+        samples = (np.arange(4000) % 200 - 100) * 100
+        write_wav(tmp_path / "speech.wav", samples)
+        source = FileSource(None, 1, 16000, str(tmp_path / "speech.wav"), loop=True, speed=0)
+
+        audio = collect(source, 10000)[:10000, 0]
+
+        np.testing.assert_array_equal(audio[4000:8000], samples / 32768.0)
+
+    def test_resampled_to_the_capture_rate(self, tmp_path):
+        write_wav(tmp_path / "speech.wav", np.full(16000, 8000))
+
+        audio = collect(FileSource(None, 1, 48000, str(tmp_path / "speech.wav"), speed=0), 48000)
+
+        assert np.allclose(audio[10000:40000], 8000 / 32768.0, atol=1e-3)
+
+class TestOpenSource:
+    def test_sources_from_config(self, tmp_path):
+        write_wav(tmp_path / "speech.wav", np.zeros(1600))
+        config = {"audio": {"channels": 1, "source": {"type": "file", "path": str(tmp_path / "speech.wav"),
+                                                      "speed": 10, "block_ms": 50}}}
+
+        source = open_source(config, None, 16000)
+
+        assert isinstance(source, FileSource)
+        assert (source.speed, source.blocksize) == (10, 800)
+        config["audio"]["source"] = {"type": "synthetic", "signal": "noise"}
+        assert open_source(config, None, 16000).signal == "noise"
+        config["audio"]["source"] = {"type": "cassette"}
+        with pytest.raises(ValueError):
+            open_source(config, None, 16000)
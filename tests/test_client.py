@@ -11,7 +11,7 @@ class TestClient:
         # Create a context manager mock that returns itself
         mock_sock = mocker.MagicMock()
         mock_sock.__enter__.return_value = mock_sock
-        mock_sock.recv.return_value = json.dumps({"status": "OK"}).encode()
+        mock_sock.recv.return_value = json.dumps({"status": "OK"}).encode() + b"\n"
 
         # Patch socket.socket to return our mock
         mocker.patch('socket.socket', return_value=mock_sock)
@@ -20,12 +20,12 @@ class TestClient:
 
     @patch('sys.exit')
     def test_send_command_success(self, mock_exit, mock_socket):
-        mock_socket.recv.return_value = json.dumps({"status": "OK"}).encode()
+        mock_socket.recv.return_value = json.dumps({"status": "OK"}).encode() + b"\n"
 
         send_command("start")
 
         mock_socket.connect.assert_called_once()
-        mock_socket.send.assert_called_once()
+        mock_socket.sendall.assert_called_once()
         mock_exit.assert_not_called()
 
     @patch('sys.exit')
@@ -38,8 +38,21 @@ class TestClient:
 
     @patch('sys.exit')
     def test_send_command_invalid_response(self, mock_exit, mock_socket):
-        mock_socket.recv.return_value = b"invalid json"
+        mock_socket.recv.return_value = b"invalid json\n"
 
         send_command("start")
 
-        mock_exit.assert_called_once()
\ No newline at end of file
+        mock_exit.assert_called_once()
+
+    @patch('sys.exit')
+    def test_start_wait_prints_final_text(self, mock_exit, mock_socket, capsys):
+        mock_socket.recv.side_effect = [
+            json.dumps({"status": "Recording started"}).encode() + b"\n",
+            json.dumps({"event": "partial", "text": "hel"}).encode() + b"\n",
+            json.dumps({"event": "final", "text": "hello", "timing": {}}).encode() + b"\n",
+        ]
+
+        send_command("start", wait=True)
+
+        assert capsys.readouterr().out == "hello\n"
+        mock_exit.assert_not_called()
@@ -59,4 +59,31 @@ class TestConfigLoader:
         bad_config.write_text("{invalid json")
         os.environ['SKALD_ROOT'] = str(tmp_path)
         with pytest.raises(ValueError):
-            ConfigLoader.load_config(bad_config.name)
\ No newline at end of file
+            ConfigLoader.load_config(bad_config.name)
+
+    def test_config_is_cached_until_file_changes(self, mock_config):
+        config = ConfigLoader.load_config(mock_config.name)
+        assert ConfigLoader.load_config(mock_config.name) is config
+        assert not ConfigLoader.has_changed(mock_config.name)
+
+        changed = dict(config, version="1.1")
+        mock_config.write_text(json.dumps(changed))
+        stat = mock_config.stat()
+        os.utime(mock_config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert ConfigLoader.has_changed(mock_config.name)
+        reloaded = ConfigLoader.load_config(mock_config.name)
+        assert reloaded is not config
+        assert reloaded["version"] == "1.1"
+        assert not ConfigLoader.has_changed(mock_config.name)
+
+    def test_forced_reload(self, mock_config):
+        config = ConfigLoader.load_config(mock_config.name)
+        assert ConfigLoader.load_config(mock_config.name, reload=True) is not config
+
+    def test_changed_settings(self):
+        old = {"audio": {"sample_rate": 16000, "vad": {"engine": "energy"}}, "version": "1.0"}
+        new = {"audio": {"sample_rate": 48000, "vad": {"engine": "energy", "frame_ms": 30}}, "version": "1.0",
+               "metrics": {}}
+
+        assert ConfigLoader.changed_settings(old, new) == ["audio.sample_rate", "audio.vad.frame_ms", "metrics"]
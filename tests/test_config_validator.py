@@ -80,3 +80,38 @@ class TestConfigValidator:
 
         with pytest.raises(ValueError, match="Silence threshold must be between"):
             ConfigValidator.validate_config(invalid_config)
+
+    def test_invalid_streaming_step(self, valid_config):
+        invalid_config = valid_config.copy()
+        invalid_config["processing"]["streaming"] = {"enabled": True, "step_ms": 10}
+
+        with pytest.raises(ValueError, match="step_ms must be between"):
+            ConfigValidator.validate_config(invalid_config)
+
+    def test_invalid_batch_decode_size(self, valid_config):
+        invalid_config = valid_config.copy()
+        invalid_config["processing"]["batch_decode"] = {"enabled": True, "batch_size": 0}
+
+        with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+            ConfigValidator.validate_config(invalid_config)
+
+    def test_file_sink_needs_path(self, valid_config):
+        invalid_config = valid_config.copy()
+        invalid_config["processing"]["output"] = {"sinks": ["clipboard", "file"]}
+
+        with pytest.raises(ValueError, match="output.file must be set"):
+            ConfigValidator.validate_config(invalid_config)
+
+    def test_file_source_needs_path(self, valid_config):
+        invalid_config = valid_config.copy()
+        invalid_config["audio"]["source"] = {"type": "file", "speed": 10}
+
+        with pytest.raises(ValueError, match="audio.source.path must be set"):
+            ConfigValidator.validate_config(invalid_config)
+
+    def test_invalid_max_sessions(self, valid_config):
+        invalid_config = valid_config.copy()
+        invalid_config["server"]["max_sessions"] = 0
+
+        with pytest.raises(ValueError, match="server.max_sessions must be a positive integer"):
+            ConfigValidator.validate_config(invalid_config)
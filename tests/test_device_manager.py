@@ -1,5 +1,4 @@
 import pytest
-import torch
 from utils.device_manager import DeviceManager
 from utils.config_loader import ConfigLoader
 
@@ -7,6 +6,7 @@ class TestDeviceManager:
     @pytest.fixture
     def mock_config(self):
         return {
+            "whisper": {"device": "auto"},
             "compute": {
                 "cuda": "float16",
                 "mps": "float32",
@@ -15,18 +15,24 @@ class TestDeviceManager:
         }
 
     def test_get_device_cpu_fallback(self, mocker, mock_config):
-        mocker.patch('torch.cuda.is_available', return_value=False)
-        mocker.patch('torch.backends.mps.is_available', return_value=False)
+        mocker.patch('utils.device_manager.DeviceManager.cuda_device_count', return_value=0)
         mocker.patch('utils.config_loader.ConfigLoader.load_config', return_value=mock_config)
 
         device, compute_type = DeviceManager.get_device_and_compute_type()
         assert device == "cpu"
         assert compute_type == "int8"
 
-    @pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA not available")
     def test_get_device_cuda(self, mocker, mock_config):
-        mocker.patch('utils.config_loader.ConfigLoader.load_config', return_value=mock_config)
+        mocker.patch('utils.device_manager.DeviceManager.cuda_device_count', return_value=1)
 
-        device, compute_type = DeviceManager.get_device_and_compute_type()
+        device, compute_type = DeviceManager.get_device_and_compute_type(mock_config)
         assert device == "cuda"
-        assert compute_type == "float16"
\ No newline at end of file
+        assert compute_type == "float16"
+
+    def test_configured_device_skips_probe(self, mocker, mock_config):
+        probe = mocker.patch('utils.device_manager.DeviceManager.cuda_device_count', return_value=1)
+        mock_config["whisper"]["device"] = "cpu"
+
+        assert DeviceManager.get_device_and_compute_type(mock_config) == ("cpu", "int8")
+        assert not probe.called
+
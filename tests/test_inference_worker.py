@@ -0,0 +1,60 @@
+import os
+import time
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from utils.ring_buffer import RingBuffer
+from transcriber.inference_worker import WorkerModel, WorkerError
+
+class FakeModel:
+    """Stands in for WhisperModel in the worker process"""
+
+    def __init__(self, name, **options):
+        pass
+
+    def transcribe(self, audio, language=None, **options):
+        if language == "crash":
+            os._exit(1)
+        if language == "hang":
+            time.sleep(30)
+        text = f"{len(audio)} samples summing to {audio.sum():.0f}"
+        return [SimpleNamespace(start=0.0, end=len(audio) / 16000, text=text, words=None)], \
+            SimpleNamespace(duration=len(audio) / 16000, language="en")
+
+class TestWorkerModel:
+    @pytest.fixture
+    def model(self):
+        model = WorkerModel("tiny", decode_timeout=5, factory=FakeModel)
+        yield model
+        model.close()
+
+    def test_ring_chunks_are_not_copied(self, model):
+        ring = RingBuffer(16000, shared=True)
+        ring.write(np.ones(8000, dtype=np.float32))
+
+        segments, info = model.transcribe(ring.read(8000), language="en")
+
+        assert segments[0].text == "8000 samples summing to 8000"
+        assert info.duration == 0.5
+        assert model._staging is None
+
+    def test_other_audio_is_staged(self, model):
+        segments, info = model.transcribe(np.full(100, 2, dtype=np.float32), language="en")
+
+        assert segments[0].text == "100 samples summing to 200"
+
+    def test_crashed_worker_is_restarted(self, model):
+        with pytest.raises(WorkerError):
+            model.transcribe(np.ones(10, dtype=np.float32), language="crash")
+
+        segments, info = model.transcribe(np.ones(10, dtype=np.float32), language="en")
+        assert segments[0].text == "10 samples summing to 10"
+        assert model.restarts == 1
+
+    def test_stuck_decode_is_restarted(self, model):
+        model.decode_timeout = 0.5
+        with pytest.raises(WorkerError, match="no result"):
+            model.transcribe(np.ones(10, dtype=np.float32), language="hang")
+
+        assert model.transcribe(np.ones(10, dtype=np.float32), language="en")[0]
+        assert model.restarts == 1
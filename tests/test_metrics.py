@@ -0,0 +1,71 @@
+import sys
+import threading
+import pytest
+from utils.metrics import Histogram, Metrics, RTF_BUCKETS
+
+class TestHistogram:
+    def test_percentiles_use_bucket_bounds(self):
+        histogram = Histogram(RTF_BUCKETS)
+        for value in [0.08] * 98 + [0.9, 3.0]:
+            histogram.observe(value)
+
+        assert histogram.percentile(0.5) == 0.1
+        assert histogram.percentile(0.99) == 1.0
+        assert histogram.percentile(1.0) == 3.0
+        assert histogram.summary()["count"] == 100
+
+    def test_empty(self):
+        assert Histogram().percentile(0.5) is None
+
+class TestMetrics:
+    @pytest.fixture
+    def metrics(self):
+        metrics = Metrics()
+        metrics.count("sessions_total")
+        metrics.count("sessions_total")
+        metrics.observe("callback_seconds", 0.0003)
+        metrics.gauge("queue_size", lambda: 3)
+        metrics.gauge("broken", lambda: 1 / 0)
+        return metrics
+
+    def test_snapshot(self, metrics):
+        snapshot = metrics.snapshot()
+
+        assert snapshot["counters"] == {"sessions_total": 2}
+        assert snapshot["gauges"] == {"queue_size": 3, "broken": None}
+        assert snapshot["histograms"]["callback_seconds"]["count"] == 1
+
+    def test_prometheus_text(self, metrics, tmp_path):
+        path = tmp_path / "skald.prom"
+        metrics.write_prometheus(str(path))
+        text = path.read_text()
+
+        assert "# TYPE skald_sessions_total counter\nskald_sessions_total 2" in text
+        assert "skald_queue_size 3" in text
+        assert "broken" not in text
+        assert 'skald_callback_seconds_bucket{le="0.00025"} 0' in text
+        assert 'skald_callback_seconds_bucket{le="0.0005"} 1' in text
+        assert 'skald_callback_seconds_bucket{le="+Inf"} 1' in text
+        assert "skald_callback_seconds_count 1" in text
+
+    def test_concurrent_writers(self, metrics):
+        # Sessions write from several threads; switch between them as often as possible
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            def write():
+                for _ in range(50000):
+                    metrics.count("chunks_total")
+                    metrics.observe("callback_seconds", 0.0003)
+            threads = [threading.Thread(target=write) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["chunks_total"] == 200000
+        histogram = metrics.histograms["callback_seconds"]
+        assert histogram.count == sum(histogram.counts) == 200001
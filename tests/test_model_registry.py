@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import MagicMock
+from transcriber.model_registry import ModelRegistry
+
+MB = 1024 * 1024
+
+class TestModelRegistry:
+    @pytest.fixture
+    def config(self):
+        return {"whisper": {"model": "base", "models": {
+            "memory_budget_mb": 250,
+            "aliases": {
+                "fast": "distil-small.en",
+                "accurate": {"model": "large-v3", "compute_type": "int8_float16"}
+            }
+        }}}
+
+    @pytest.fixture
+    def sizes(self, mocker):
+        sizes = {"base": 100 * MB, "distil-small.en": 100 * MB, "large-v3": 200 * MB}
+        mocker.patch('transcriber.model_registry.estimate_model_size',
+                     side_effect=lambda name, compute_type: sizes.get(name, 0))
+        return sizes
+
+    def test_models_are_cached(self, config, sizes):
+        loader = MagicMock(side_effect=lambda name, compute_type: (name, compute_type))
+        registry = ModelRegistry(config, loader, "int8")
+
+        assert registry.get("base") == ("base", "int8")
+        assert registry.get("base") == ("base", "int8")
+        assert loader.call_count == 1
+
+    def test_aliases(self, config, sizes):
+        registry = ModelRegistry(config, lambda name, compute_type: (name, compute_type), "int8")
+
+        assert registry.get("fast") == ("distil-small.en", "int8")
+        assert registry.get("accurate") == ("large-v3", "int8_float16")
+
+    def test_least_recently_used_model_is_evicted(self, config, sizes):
+        config["whisper"]["models"]["memory_budget_mb"] = 300
+        registry = ModelRegistry(config, lambda name, compute_type: name, "int8")
+        registry.get("base")
+        registry.get("fast")
+        registry.get("base")
+
+        registry.get("accurate")
+
+        assert [model["model"] for model in registry.loaded()] == ["base", "large-v3"]
+        assert registry.resident_bytes() == 300 * MB
+
+    def test_models_in_use_are_not_evicted(self, config, sizes):
+        config["whisper"]["models"]["memory_budget_mb"] = 100
+        loader = MagicMock(side_effect=lambda name, compute_type: [name])
+        in_use = []
+        registry = ModelRegistry(config, loader, "int8", pinned=lambda: in_use)
+        in_use.append(registry.get("base"))
+
+        registry.get("fast")
+
+        # Over budget, but the default model is not loaded a second time
+        assert [model["model"] for model in registry.loaded()] == ["base", "distil-small.en"]
+        assert registry.get("base") is in_use[0]
+        assert loader.call_count == 2
+
+    def test_no_budget_keeps_everything(self, config, sizes):
+        config["whisper"]["models"]["memory_budget_mb"] = 0
+        registry = ModelRegistry(config, lambda name, compute_type: name, "int8")
+        for name in ["base", "fast", "accurate"]:
+            registry.get(name)
+
+        assert len(registry.loaded()) == 3
+
+    def test_update_keeps_loaded_models(self, config, sizes):
+        loader = MagicMock(side_effect=lambda name, compute_type: name)
+        registry = ModelRegistry(config, loader, "int8")
+        registry.get("base")
+
+        config = {"whisper": {"model": "base", "models": {"aliases": {"default": "base"}}}}
+        registry.update(config)
+
+        assert registry.get("default") == "base"
+        assert loader.call_count == 1
+        assert registry.memory_budget == 0
+
+    def test_compute_type_override_and_discard(self, config, sizes):
+        registry = ModelRegistry(config, lambda name, compute_type: (name, compute_type), "float16")
+
+        assert registry.get("base", "int8") == ("base", "int8")
+        registry.get("base")
+        registry.discard("base")
+
+        assert [model["compute_type"] for model in registry.loaded()] == ["int8"]
@@ -0,0 +1,88 @@
+import socket
+import threading
+import pytest
+from unittest.mock import MagicMock
+from utils.protocol import SocketReader
+from transcriber.output import OutputPipeline, ClipboardSink, FileSink, SocketSink, find_paste_command
+
+class TestOutputPipeline:
+    @pytest.fixture
+    def sink(self):
+        return MagicMock()
+
+    def test_progress_is_debounced(self, sink):
+        pipeline = OutputPipeline([sink], debounce=60)
+        for text in ["one", "one two", "one two three"]:
+            pipeline.progress(text)
+        pipeline.flush()
+
+        # The first update goes out at once, the rest collapse into the latest
+        assert [call.args[0] for call in sink.progress.call_args_list] == ["one", "one two three"]
+
+    def test_final_drops_waiting_progress(self, sink):
+        pipeline = OutputPipeline([sink], debounce=60)
+        pipeline.progress("one")
+        pipeline.progress("one two")
+        pipeline.final("one two three")
+        pipeline.flush()
+
+        assert [call.args[0] for call in sink.progress.call_args_list] == ["one"]
+        sink.final.assert_called_once_with("one two three", False)
+
+    def test_failing_sink_does_not_stop_the_others(self, sink):
+        failing = MagicMock()
+        failing.final.side_effect = RuntimeError("no display")
+        errors = []
+        pipeline = OutputPipeline([failing, sink], on_error=lambda sink, error: errors.append(error))
+        pipeline.final("hello")
+        pipeline.close()
+
+        sink.final.assert_called_once_with("hello", False)
+        assert str(errors[0]) == "no display"
+
+class TestSinks:
+    def test_refined_text_replaces_unchanged_clipboard(self, mocker):
+        clipboard = mocker.patch('transcriber.output.pyperclip')
+        sink = ClipboardSink(MagicMock())
+
+        clipboard.paste.return_value = "something else"
+        sink.refined("refined", "draft")
+        assert not clipboard.copy.called
+
+        clipboard.paste.return_value = "draft"
+        sink.refined("refined", "draft")
+        clipboard.copy.assert_called_once_with("refined")
+
+    def test_file_sink_appends_refined_text_instead_of_draft(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        sink = FileSink(str(path))
+
+        sink.final("first note", False)
+        sink.final("draft", True)
+        sink.refined("second note", "draft")
+
+        assert path.read_text() == "first note\nsecond note\n"
+
+    def test_socket_sink_pushes_messages(self, tmp_path):
+        path = str(tmp_path / "listener.sock")
+        messages = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(path)
+            server.listen(1)
+
+            def accept():
+                connection, _ = server.accept()
+                with connection:
+                    messages.append(SocketReader(connection).read())
+            listener = threading.Thread(target=accept)
+            listener.start()
+            SocketSink(path).final("hello", False)
+            listener.join(timeout=5)
+
+        assert messages == [{"event": "final", "text": "hello", "refining": False}]
+
+    def test_paste_command_resolved_in_order(self, mocker):
+        mocker.patch('platform.system', return_value='Linux')
+        mocker.patch('shutil.which', side_effect=lambda tool: "/usr/bin/wtype" if tool == "wtype" else None)
+
+        assert find_paste_command()[0] == "wtype"
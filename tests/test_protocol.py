@@ -0,0 +1,70 @@
+import pytest
+import asyncio
+import json
+from unittest.mock import MagicMock
+from utils.protocol import MessageReader, SocketReader, encode_message, encode_frame, decode_frame
+
+class TestProtocol:
+    def read_all(self, *chunks):
+        async def run():
+            reader = asyncio.StreamReader()
+            for chunk in chunks:
+                reader.feed_data(chunk)
+            reader.feed_eof()
+            messages = MessageReader(reader)
+            result = []
+            while True:
+                message = await messages.read()
+                if message is None:
+                    return result
+                result.append(message)
+        return asyncio.run(run())
+
+    def test_encode_message(self):
+        assert encode_message({"action": "start"}) == b'{"action": "start"}\n'
+
+    def test_reads_multiple_framed_messages(self):
+        data = encode_message({"action": "start"}) + encode_message({"action": "stop"})
+        assert self.read_all(data[:10], data[10:]) == [{"action": "start"}, {"action": "stop"}]
+
+    def test_reads_unframed_legacy_message(self):
+        assert self.read_all(b'{"action": "status"}') == [{"action": "status"}]
+
+    def test_invalid_framed_message(self):
+        with pytest.raises(ValueError):
+            self.read_all(b"not json\n")
+
+    def test_socket_reader(self):
+        sock = MagicMock()
+        sock.recv.side_effect = [b'{"status": ', b'"OK"}\n{"event": "final"', b'}\n', b""]
+        reader = SocketReader(sock)
+
+        assert reader.read() == {"status": "OK"}
+        assert reader.read() == {"event": "final"}
+        assert reader.read() is None
+
+    def test_frames_follow_a_command(self):
+        pcm = bytes(range(256)) * 40
+
+        async def run():
+            reader = asyncio.StreamReader()
+            data = (encode_message({"action": "ingest"}) + encode_frame(pcm, "zlib") + encode_frame(pcm)
+                    + encode_frame(b""))
+            reader.feed_data(data[:30])
+            reader.feed_data(data[30:])
+            reader.feed_eof()
+            messages = MessageReader(reader)
+            return [await messages.read(), await messages.read_frame(), await messages.read_frame(),
+                    await messages.read_frame(), await messages.read_frame()]
+
+        command, compressed, plain, end, closed = asyncio.run(run())
+        assert command == {"action": "ingest"}
+        assert len(compressed) < len(pcm)
+        assert decode_frame(compressed, "zlib") == pcm
+        assert decode_frame(plain) == pcm
+        assert end == b""
+        assert closed is None
+
+    def test_corrupt_compressed_frame(self):
+        with pytest.raises(ValueError):
+            decode_frame(b"not zlib", "zlib")
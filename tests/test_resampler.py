@@ -0,0 +1,37 @@
+import pytest
+import numpy as np
+from utils.resampler import Resampler
+
+def tone(frequency, sample_rate, seconds=1.0):
+    return np.sin(2 * np.pi * frequency * np.arange(int(sample_rate * seconds)) / sample_rate).astype(np.float32)
+
+class TestResampler:
+    @pytest.mark.parametrize("rate", [32000, 44100, 48000])
+    def test_blocks_match_one_pass(self, rate):
+        signal = tone(1000, rate)
+        resampler = Resampler(rate, 16000)
+        whole = resampler.process(signal)
+        resampler.reset()
+        blocks = np.concatenate([resampler.process(signal[i:i + 441]) for i in range(0, len(signal), 441)])
+
+        assert len(whole) == 16000
+        assert np.array_equal(whole, blocks)
+
+    @pytest.mark.parametrize("rate", [32000, 44100, 48000])
+    def test_passband_kept_and_aliases_removed(self, rate):
+        passed = Resampler(rate, 16000).process(tone(1000, rate))[500:-500]
+        blocked = Resampler(rate, 16000).process(tone(11000, rate))[500:-500]
+
+        assert np.sqrt(np.mean(passed ** 2)) == pytest.approx(np.sqrt(0.5), rel=0.01)
+        assert np.sqrt(np.mean(blocked ** 2)) < 0.001
+
+    def test_range_matches_stream(self):
+        signal = tone(300, 44100)
+        resampler = Resampler(44100, 16000)
+        whole = resampler.process(signal)
+
+        part = resampler.resample_range(lambda first, last: signal[first:last], len(signal), 0, 5000)
+        later = resampler.resample_range(lambda first, last: signal[first:last], len(signal), 7000, 99999)
+
+        assert np.array_equal(part, whole[:5000])
+        assert np.array_equal(later, whole[7000:])
@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+from utils.ring_buffer import RingBuffer
+
+class TestRingBuffer:
+    def test_write_and_read(self):
+        ring = RingBuffer(8)
+        ring.write(np.arange(5))
+
+        assert len(ring) == 5
+        np.testing.assert_array_equal(ring.read(3), [0, 1, 2])
+        assert len(ring) == 2
+
+    def test_read_returns_view_when_contiguous(self):
+        ring = RingBuffer(8)
+        ring.write(np.ones(4))
+
+        chunk = ring.read(4)
+        assert np.shares_memory(chunk, ring._data)
+
+    def test_read_across_wrap(self):
+        ring = RingBuffer(8)
+        ring.write(np.arange(6))
+        ring.release(len(ring.read(6)))
+        ring.write(np.arange(6, 11))
+
+        np.testing.assert_array_equal(ring.read(), [6, 7, 8, 9, 10])
+
+    def test_unreleased_samples_are_not_overwritten(self):
+        ring = RingBuffer(8)
+        ring.write(np.arange(8))
+        chunk = ring.read(8)
+
+        assert ring.write(np.full(4, -1)) == 0
+        assert ring.overflows == 1
+        np.testing.assert_array_equal(chunk, np.arange(8))
+
+        ring.release(4)
+        assert ring.write(np.full(4, -1)) == 4
+
+    def test_clear(self):
+        ring = RingBuffer(8)
+        ring.write(np.ones(3))
+        ring.clear()
+
+        assert len(ring) == 0
+        assert ring.free == 8
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+    def test_shared_ring_locates_views(self):
+        ring = RingBuffer(8, shared=True)
+        ring.write(np.arange(6))
+        ring.read(2)
+
+        assert RingBuffer.locate(ring.read(3)) == (ring.shared_name, 2)
+        assert RingBuffer.locate(np.arange(3, dtype=np.float32)) is None
@@ -0,0 +1,59 @@
+import threading
+from transcriber.scheduler import InferenceScheduler, INTERACTIVE, BATCH
+
+class TestInferenceScheduler:
+    def blocked(self, scheduler):
+        """Occupy the scheduler's only worker until the returned event is set"""
+        release, running = threading.Event(), threading.Event()
+        scheduler.submit(lambda: running.set() or release.wait(5))
+        assert running.wait(5)
+        return release
+
+    def test_interactive_before_batch(self):
+        scheduler = InferenceScheduler(1)
+        release = self.blocked(scheduler)
+        order = []
+        futures = [scheduler.submit(order.append, "file 1", priority=BATCH, session="file"),
+                   scheduler.submit(order.append, "file 2", priority=BATCH, session="file"),
+                   scheduler.submit(order.append, "dictation", priority=INTERACTIVE, session="default")]
+
+        release.set()
+        for future in futures:
+            future.result(5)
+
+        assert order == ["dictation", "file 1", "file 2"]
+        scheduler.shutdown()
+
+    def test_sessions_take_turns(self):
+        scheduler = InferenceScheduler(1)
+        release = self.blocked(scheduler)
+        order = []
+        futures = [scheduler.submit(order.append, f"a{i}", session="a") for i in range(3)]
+        futures += [scheduler.submit(order.append, f"b{i}", session="b") for i in range(2)]
+        assert scheduler.queued() == 5
+
+        release.set()
+        for future in futures:
+            future.result(5)
+
+        assert order == ["a0", "b0", "a1", "b1", "a2"]
+        scheduler.shutdown()
+
+    def test_workers_run_concurrently_and_can_be_changed(self):
+        scheduler = InferenceScheduler(1)
+        barrier = threading.Barrier(2, timeout=5)
+        scheduler.set_workers(2)
+
+        futures = [scheduler.submit(barrier.wait) for _ in range(2)]
+
+        assert sorted(future.result(5) for future in futures) == [0, 1]
+        assert scheduler.workers == 2
+        scheduler.shutdown()
+
+    def test_errors_reach_the_future(self):
+        scheduler = InferenceScheduler(1)
+
+        future = scheduler.submit(lambda: 1 / 0)
+
+        assert isinstance(future.exception(5), ZeroDivisionError)
+        scheduler.shutdown()
@@ -0,0 +1,347 @@
+import pytest
+import asyncio
+import json
+import socket
+import threading
+import numpy as np
+from unittest.mock import MagicMock
+from bin.client import ingest
+from bin.server import SkaldServer
+from utils.metrics import Metrics
+from utils.protocol import encode_message
+from tests.test_audio_file import write_wav
+
+class TestServer:
+    @pytest.fixture
+    def transcriber(self):
+        transcriber = MagicMock()
+        transcriber.model_error = None
+        transcriber.model_ready = threading.Event()
+        transcriber.model_ready.set()
+        transcriber.model_load_time = 1.5
+        transcriber.warmup_time = 0.2
+        transcriber.recording = threading.Event()
+        transcriber.metrics = Metrics()
+        transcriber.config = {"server": {}, "debug": {"print_status": False}}
+        transcriber.registry.loaded.return_value = [{"model": "tiny", "compute_type": "int8", "size_mb": 40}]
+        stopped = threading.Event()
+        transcriber.start_recording.side_effect = lambda requested_at=None, model=None: stopped.wait(5)
+        transcriber.stop = stopped
+        return transcriber
+
+    def test_start_stop(self, transcriber):
+        server = SkaldServer(transcriber)
+
+        assert server.handle_command({"action": "start"}) == {"status": "Recording started"}
+        assert server.handle_command({"action": "start"}) == {"status": "Already recording"}
+        assert server.handle_command({"action": "stop"}) == {"status": "Recording stopped"}
+        transcriber.stop.set()
+        server.recording_thread.join()
+        assert server.handle_command({"action": "stop"}) == {"status": "Not recording"}
+
+    def test_start_with_model(self, transcriber):
+        server = SkaldServer(transcriber)
+
+        assert server.handle_command({"action": "start", "model": ""})["status"].startswith("Error")
+        assert server.handle_command({"action": "start", "model": "small"}) == {"status": "Recording started"}
+        assert transcriber.start_recording.call_args.kwargs["model"] == "small"
+        transcriber.stop.set()
+        server.recording_thread.join()
+
+    def test_sessions_record_side_by_side(self, transcriber, mocker):
+        transcriber.config["server"]["max_sessions"] = 2
+        session = mocker.patch("bin.server.Session")
+        session.return_value.start_recording.side_effect = lambda requested_at=None, model=None: \
+            transcriber.stop.wait(5)
+        server = SkaldServer(transcriber)
+
+        assert server.handle_command({"action": "start"}) == {"status": "Recording started"}
+        assert server.handle_command({"action": "start", "session": "kitchen", "device": 2}) == \
+            {"status": "Recording started"}
+        assert session.call_args.args[1:] == ("kitchen", {"audio": {"device": 2}})
+        assert server.handle_command({"action": "start", "session": "kitchen"}) == {"status": "Already recording"}
+        assert server.handle_command({"action": "start", "session": "hall"})["status"] == \
+            "Error: Already 2 sessions recording"
+        status = server.handle_command({"action": "status"})
+        assert [entry["session"] for entry in status["sessions"]] == ["default", "kitchen"]
+
+        assert server.handle_command({"action": "stop", "session": "kitchen"}) == {"status": "Recording stopped"}
+        session.return_value.stop_recording.assert_called_once()
+        transcriber.stop_recording.assert_not_called()
+        transcriber.stop.set()
+        for _, thread in list(server.sessions.values()):
+            thread.join()
+
+    def test_remote_sessions_stay_off_the_desktop(self, transcriber, mocker):
+        session = mocker.patch("bin.server.Session")
+        session.return_value.start_recording.side_effect = lambda requested_at=None, model=None: None
+        server = SkaldServer(transcriber)
+
+        recorder, error = server.start_session({"action": "start"}, remote=True)
+
+        assert error is None and recorder is session.return_value
+        assert session.call_args.kwargs["desktop"] is False
+        server.sessions["default"][1].join()
+
+    def test_status(self, transcriber):
+        response = SkaldServer(transcriber).handle_command({"action": "status"})
+        assert response["status"] == "Ready"
+        assert response["model_load_time"] == 1.5
+
+    def test_stats(self, transcriber):
+        server = SkaldServer(transcriber)
+        transcriber.metrics.count("sessions_total")
+        transcriber.metrics.observe("callback_seconds", 0.0004)
+
+        response = server.handle_command({"action": "stats"})
+
+        assert response["metrics"]["counters"]["sessions_total"] == 1
+        assert response["metrics"]["gauges"]["recording"] == 0
+        assert response["metrics"]["histograms"]["callback_seconds"]["p50"] == 0.0004
+
+    def test_wait_lasts_until_refined(self, transcriber):
+        server = SkaldServer(transcriber)
+        writer = MagicMock()
+        writer.is_closing.return_value = False
+        writer.transport.get_write_buffer_size.return_value = 0
+        server.subscribers[writer] = "default"
+
+        server._broadcast({"event": "final", "text": "other session", "session": "kitchen"})
+        server._broadcast({"event": "final", "text": "draft", "refining": True})
+        assert writer in server.subscribers
+        server._broadcast({"event": "refined", "text": "refined"})
+        assert writer not in server.subscribers
+        # Events of other sessions are not for start --wait
+        assert writer.write.call_count == 2
+
+    def test_memory(self, transcriber):
+        transcriber.memory_usage.return_value = {"model_state": "offloaded", "rss_mb": 310, "models_mb": 0,
+                                                 "idle_seconds": 900.0, "models": []}
+
+        response = SkaldServer(transcriber).handle_command({"action": "memory"})
+
+        assert response["status"] == "OK"
+        assert response["model_state"] == "offloaded"
+        assert response["rss_mb"] == 310
+
+    def test_unknown_action(self, transcriber):
+        response = SkaldServer(transcriber).handle_command({"action": "dance"})
+        assert response["status"].startswith("Unknown action")
+
+    def test_transcribe_runs_off_the_event_loop(self, transcriber, mocker):
+        server = SkaldServer(transcriber)
+        batch = mocker.patch('bin.server.BatchTranscriber').return_value
+        batch.transcribe_files.return_value = [{"file": "a.wav", "output": "a.jsonl", "segments": 2}]
+
+        response = asyncio.run(server.dispatch({"action": "transcribe", "files": ["a.wav"]}, None))
+
+        assert response["status"] == "Transcribed 1 of 1 files"
+        batch.transcribe_files.assert_called_once_with(["a.wav"], None, None)
+
+    def test_reload(self, transcriber, mocker):
+        server = SkaldServer(transcriber)
+        new_config = {"server": {}, "debug": {"print_status": False}}
+        load = mocker.patch('bin.server.ConfigLoader.load_config', return_value=new_config)
+        transcriber.apply_config.return_value = {"live": ["whisper.beam_size"], "session": [],
+                                                 "model": [], "restart": []}
+        server.batch = batch = MagicMock()
+
+        response = server.handle_command({"action": "reload"})
+
+        assert response["status"] == "Config reloaded"
+        assert response["changes"]["live"] == ["whisper.beam_size"]
+        load.assert_called_once_with("config.json", reload=True)
+        transcriber.apply_config.assert_called_once_with(new_config)
+        # The next file job builds a batch transcriber from the new config
+        assert server.batch is None
+        batch.close.assert_called_once()
+
+    def test_reload_unchanged_config(self, transcriber, mocker):
+        server = SkaldServer(transcriber)
+        mocker.patch('bin.server.ConfigLoader.load_config', return_value=transcriber.config)
+
+        assert server.reload_config() == {"status": "Config unchanged"}
+        transcriber.apply_config.assert_not_called()
+
+    def test_reload_rejects_invalid_config(self, transcriber, mocker):
+        server = SkaldServer(transcriber)
+        mocker.patch('bin.server.ConfigLoader.load_config', return_value={"version": "1.0"})
+        transcriber.apply_config.side_effect = ValueError("Missing section 'audio' in config")
+
+        response = server.reload_config()
+
+        assert response["status"] == "Error: Invalid config: Missing section 'audio' in config"
+
+    def test_transcribe_needs_files(self, transcriber):
+        response = SkaldServer(transcriber).handle_transcribe({"action": "transcribe"})
+        assert response["status"].startswith("Error")
+
+    def test_concurrent_clients(self, transcriber, tmp_path):
+        socket_path = str(tmp_path / "skald.sock")
+        server = SkaldServer(transcriber)
+
+        async def client(actions):
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            replies = []
+            for action in actions:
+                writer.write(encode_message({"action": action}))
+                await writer.drain()
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            return replies
+
+        async def run():
+            serve = asyncio.ensure_future(server.serve(socket_path))
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if (tmp_path / "skald.sock").exists():
+                    break
+            idle = await asyncio.open_unix_connection(socket_path)
+            results = await asyncio.gather(client(["status", "status"]), client(["status"]))
+            idle[1].close()
+            serve.cancel()
+            return results
+
+        results = asyncio.run(run())
+        assert [len(r) for r in results] == [2, 1]
+        assert all(reply["status"] == "Ready" for r in results for reply in r)
+
+    def test_subscribers_receive_events(self, transcriber, tmp_path):
+        socket_path = str(tmp_path / "skald.sock")
+        server = SkaldServer(transcriber)
+
+        async def run():
+            serve = asyncio.ensure_future(server.serve(socket_path))
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if (tmp_path / "skald.sock").exists():
+                    break
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(encode_message({"action": "subscribe"}))
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+
+            server._on_event({"event": "committed", "text": "hello", "full_text": "hello"})
+            server._on_event({"event": "final", "text": "hello", "timing": {}})
+            events = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.close()
+            serve.cancel()
+            return reply, events
+
+        reply, events = asyncio.run(run())
+        assert reply == {"status": "Subscribed"}
+        assert [e["event"] for e in events] == ["committed", "final"]
+        transcriber.add_listener.assert_called_once_with(server._on_event)
+
+class TestIngest:
+    @pytest.fixture
+    def transcriber(self):
+        transcriber = MagicMock()
+        transcriber.metrics = Metrics()
+        transcriber.sample_rate = 16000
+        transcriber.config = {"server": {}, "debug": {"print_status": False}}
+        transcriber.received = []
+        transcriber.audio_callback.side_effect = \
+            lambda indata, frames, time, status: transcriber.received.append(indata.copy())
+        stopped = threading.Event()
+
+        def start_recording(requested_at=None, model=None, stream=None):
+            with stream:
+                stopped.wait(5)
+        transcriber.start_recording.side_effect = start_recording
+        transcriber.stop_recording.side_effect = stopped.set
+        return transcriber
+
+    @pytest.fixture
+    def session(self, transcriber, mocker):
+        """Sessions record with the mock transcriber"""
+        return mocker.patch("bin.server.Session", return_value=transcriber)
+
+    def serve_and_ingest(self, server, tmp_path, mocker, config, **options):
+        """Run the server and the file-backed client against it"""
+        socket_path = str(tmp_path / "skald.sock")
+        mocker.patch('bin.client.ConfigLoader.load_config',
+                     return_value={"server": dict(config, socket_path=socket_path, socket_timeout=5)})
+
+        async def run():
+            serve = asyncio.ensure_future(server.serve(socket_path))
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if (tmp_path / "skald.sock").exists():
+                    break
+            await asyncio.get_running_loop().run_in_executor(None, lambda: ingest(**options))
+            for _, thread in list(server.sessions.values()):
+                thread.join(5)
+            serve.cancel()
+        asyncio.run(run())
+
+    def test_file_over_unix_socket(self, transcriber, session, tmp_path, mocker, capsys):
+        samples = (np.sin(np.arange(3 * 16000) / 10) * 10000).astype(np.int16)
+        write_wav(tmp_path / "speech.wav", samples)
+        server = SkaldServer(transcriber)
+
+        self.serve_and_ingest(server, tmp_path, mocker, {}, path=str(tmp_path / "speech.wav"), speed=0,
+                              compression="zlib")
+
+        np.testing.assert_array_equal(np.concatenate(transcriber.received), samples / 32768.0)
+        transcriber.reset_state.assert_called_once()
+        transcriber.stop_recording.assert_called_once()
+        assert "Recording stopped (3.0s sent)" in capsys.readouterr().err
+        assert transcriber.metrics.snapshot()["counters"]["ingest_seconds_total"] == 3.0
+        # Not pasted into the server's desktop, even from the same machine
+        assert session.call_args.args[1] == "ingest-1"
+        assert session.call_args.kwargs["desktop"] is False
+
+    def test_stereo_file_over_tcp_is_mixed_and_resampled(self, transcriber, session, tmp_path, mocker):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        transcriber.config["server"] = {"tcp_port": port}
+        write_wav(tmp_path / "stereo.wav", np.full(2 * 32000 * 2, 1000), sample_rate=32000, channels=2)
+        server = SkaldServer(transcriber)
+
+        self.serve_and_ingest(server, tmp_path, mocker, {"tcp_port": port}, path=str(tmp_path / "stereo.wav"),
+                              speed=0, host="127.0.0.1", session="default")
+        assert session.call_args.kwargs["desktop"] is False
+
+        received = np.concatenate(transcriber.received)
+        assert abs(len(received) - 2 * 16000) < 100
+        assert np.allclose(received[16000:17000], 1000 / 32768.0, atol=1e-4)
+
+    def test_validation_and_busy(self, transcriber):
+        server = SkaldServer(transcriber)
+
+        async def ingest_command(command):
+            return await server.handle_ingest(dict(command, action="ingest"), MagicMock(), MagicMock())
+
+        assert asyncio.run(ingest_command({"sample_rate": 4000}))["status"].startswith("Error")
+        assert asyncio.run(ingest_command({"sample_rate": 16000, "channels": 3}))["status"].startswith("Error")
+        assert asyncio.run(ingest_command({"sample_rate": 16000, "compression": "lz4"}))["status"].startswith("Error")
+        recording = MagicMock()
+        recording.is_alive.return_value = True
+        server.sessions["default"] = (transcriber, recording)
+        assert asyncio.run(ingest_command({"sample_rate": 16000, "session": "default"})) == \
+            {"status": "Already recording"}
+
+    def test_tcp_only_takes_remote_actions(self, transcriber):
+        server = SkaldServer(transcriber)
+
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(encode_message({"action": "reload"}))
+            reader.feed_data(encode_message({"action": "subscribe"}))
+            reader.feed_data(encode_message({"action": "ingest", "sample_rate": 16000, "config": {
+                "processing": {"output": {"sinks": ["file"], "file": "/tmp/skald-test.txt"}}}}))
+            reader.feed_eof()
+            writer = MagicMock()
+            writer.drain = MagicMock(side_effect=lambda: asyncio.sleep(0))
+            await server.handle_client(reader, writer, remote=True)
+            return writer
+
+        writer = asyncio.run(run())
+        replies = [json.loads(call.args[0]) for call in writer.write.call_args_list]
+        assert [reply["status"] for reply in replies] == ["Error: reload is not available over TCP",
+                                                          "Error: subscribe is not available over TCP",
+                                                          "Error: config and device are not available over TCP"]
+        assert not server.subscribers
+        assert not server.sessions
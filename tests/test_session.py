@@ -0,0 +1,92 @@
+import time
+import threading
+import pytest
+from transcriber.audio_transcriber import AudioTranscriber
+from transcriber.session import Session, session_config
+
+class TestSession:
+    @pytest.fixture
+    def transcriber(self, mocker):
+        config = {
+            "version": "1.0",
+            "audio": {
+                "sample_rate": 16000,
+                "silence_threshold": 0.01,
+                "silence_duration": 1,
+                "chunk_duration": 30,
+                "channels": 1,
+                "max_duration": 300,
+                "buffer_size_multiplier": 2,
+                "start_tone": {"enabled": False}
+            },
+            "processing": {"shutdown_timeout": 30, "event_wait_timeout": 0.1, "auto_paste": False},
+            "whisper": {"model": "tiny", "language": "en", "task": "transcribe"},
+            "debug": {"print_status": False, "print_transcriptions": False},
+            "server": {"socket_path": "/tmp/test.sock", "socket_timeout": 1.0}
+        }
+        mocker.patch('transcriber.audio_transcriber.WhisperModel')
+        mocker.patch('utils.device_manager.DeviceManager.get_device_and_compute_type', return_value=("cpu", "int8"))
+        mocker.patch('utils.audio_manager.AudioManager.initialize_audio')
+        mocker.patch('transcriber.audio_transcriber.AudioTranscriber._check_clipboard', return_value=False)
+        return AudioTranscriber(config=config)
+
+    def test_sessions_record_at_once_on_one_model(self, transcriber, mocker):
+        transcriber.model.transcribe.return_value = ([mocker.MagicMock(text="hello")], None)
+        events = []
+        transcriber.add_listener(events.append)
+        sessions = [Session(transcriber, name, {"audio": {"source": {
+                        "type": "synthetic", "frequency": frequency, "duration": 1, "speed": 10}}})
+                    for name, frequency in (("left", 440), ("right", 880))]
+
+        record_start = time.perf_counter()
+        threads = [threading.Thread(target=session.start_recording) for session in sessions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        # One second of tone and one of silence each, recorded side by side
+        assert time.perf_counter() - record_start < 1.5
+        finals = sorted((event["session"], event["text"]) for event in events if event["event"] == "final")
+        assert finals == [("left", "hello"), ("right", "hello")]
+        assert transcriber.model.transcribe.call_count == 2
+        assert all(session.model is transcriber.model for session in sessions)
+        # The default session was left alone
+        assert not any(session.recording.is_set() for session in sessions)
+        assert transcriber.recording.is_set()
+
+    def test_gauges_cover_every_session(self, transcriber):
+        session = Session(transcriber, "other", {"whisper": {"language": "de"}})
+        session.audio_queue.put(None)
+        transcriber.audio_queue.put(None)
+        session.rtf_estimate = 0.4
+
+        gauges = transcriber.metrics.snapshot()["gauges"]
+        assert gauges["audio_queue_size"] == 2
+        assert gauges["rtf_estimate"] == 0.4
+
+        session.close()
+        assert transcriber.metrics.snapshot()["gauges"]["audio_queue_size"] == 1
+
+    def test_sessions_without_desktop_skip_clipboard_and_paste(self, transcriber, tmp_path):
+        transcriber.config["processing"]["output"] = {"sinks": ["clipboard", "paste", "file"],
+                                                      "file": str(tmp_path / "transcripts.txt")}
+        transcriber.clipboard_available = True
+        transcriber.can_autopaste = True
+        transcriber.paste_command = ["xdotool", "key", "ctrl+v"]
+
+        session = Session(transcriber, "ingest-1", desktop=False)
+
+        assert session.output is not transcriber.output
+        assert [sink.name for sink in session.output.sinks] == ["file"]
+        session.close()
+
+    def test_overrides_are_limited_to_session_settings(self, transcriber):
+        config = session_config(transcriber.config, {"whisper": {"language": "de"}})
+        assert config["whisper"]["language"] == "de"
+        assert transcriber.config["whisper"]["language"] == "en"
+
+        with pytest.raises(ValueError, match="whisper.model cannot be set per session"):
+            Session(transcriber, "other", {"whisper": {"model": "large-v3"}})
+        with pytest.raises(ValueError):
+            Session(transcriber, "other", {"audio": {"channels": 3}})
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds to import each entry point, excluding interpreter startup. Loose
+# enough for slow CI machines; importing torch or faster_whisper blows it.
+IMPORT_BUDGETS = {"bin.client": 0.3, "bin.server": 1.5}
+HEAVY_MODULES = ["torch", "faster_whisper", "ctranslate2"]
+
+def measure_import(module):
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules)}))\n"
+    )
+    env = dict(os.environ, SKALD_ROOT=PROJECT_ROOT)
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.splitlines()[-1])
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(PROJECT_ROOT, "config.json")),
+                    reason="entry points load config.json at import")
+class TestStartup:
+    @pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS))
+    def test_import_budget(self, module):
+        result = measure_import(module)
+
+        assert not set(HEAVY_MODULES) & set(result["modules"])
+        assert result["seconds"] < IMPORT_BUDGETS[module]
+
+    def test_client_stays_on_the_standard_library(self):
+        modules = measure_import("bin.client")["modules"]
+
+        assert "numpy" not in modules
+        assert "sounddevice" not in modules
@@ -0,0 +1,36 @@
+import pytest
+from transcriber.streaming import HypothesisBuffer
+
+class TestHypothesisBuffer:
+    def test_commits_only_agreed_prefix(self):
+        hypothesis = HypothesisBuffer()
+        hypothesis.insert([(0.0, 0.4, "Hello"), (0.5, 0.9, "word")])
+        assert hypothesis.flush() == []
+
+        hypothesis.insert([(0.0, 0.4, "hello,"), (0.5, 0.9, "world")])
+        committed = hypothesis.flush()
+
+        assert [w[2] for w in committed] == ["hello,"]
+        assert hypothesis.last_committed_end == 0.4
+
+    def test_skips_words_already_committed(self):
+        hypothesis = HypothesisBuffer()
+        hypothesis.committed = [(0.0, 0.4, "hello"), (0.5, 0.9, "there")]
+
+        hypothesis.insert([(0.85, 1.0, "there"), (1.1, 1.5, "friend")])
+
+        assert [w[2] for w in hypothesis.current] == ["friend"]
+
+    def test_commit_pending(self):
+        hypothesis = HypothesisBuffer()
+        hypothesis.insert([(0.0, 0.4, "draft")])
+        hypothesis.flush()
+
+        assert [w[2] for w in hypothesis.commit_pending()] == ["draft"]
+        assert hypothesis.text() == "draft"
+
+    def test_prompt_is_committed_tail(self):
+        hypothesis = HypothesisBuffer()
+        hypothesis.committed = [(0.0, 0.4, "a" * 300)]
+
+        assert len(hypothesis.prompt()) == 200
@@ -0,0 +1,48 @@
+import pytest
+import numpy as np
+from utils.vad import EnergyVAD, create_vad
+
+class TestVAD:
+    @pytest.fixture
+    def vad(self):
+        return EnergyVAD(16000, 0.01, frame_ms=20, min_speech_ms=100,
+                         min_silence_ms=200, speech_pad_ms=0)
+
+    def test_silence_has_no_speech(self, vad):
+        assert not vad.has_speech(np.zeros(16000, dtype=np.float32))
+
+    def test_click_is_not_speech(self, vad):
+        audio = np.zeros(16000, dtype=np.float32)
+        audio[8000:8100] = 1.0
+        assert not vad.has_speech(audio)
+
+    def test_speech_segments(self, vad):
+        audio = np.zeros(48000, dtype=np.float32)
+        audio[16000:32000] = 0.5
+
+        assert vad.speech_segments(audio) == [(16000, 32000)]
+        assert len(vad.extract_speech(audio)) == 16000
+
+    def test_short_gap_does_not_split_speech(self, vad):
+        audio = np.zeros(48000, dtype=np.float32)
+        audio[8000:16000] = 0.5
+        audio[17600:32000] = 0.5
+
+        assert vad.speech_segments(audio) == [(8000, 32000)]
+
+    def test_hysteresis_keeps_quiet_tail(self, vad):
+        audio = np.zeros(32000, dtype=np.float32)
+        audio[0:8000] = 0.5
+        audio[8000:16000] = 0.007  # Below threshold but above threshold * hysteresis
+
+        assert vad.speech_segments(audio) == [(0, 16000)]
+
+    def test_update_tracks_sustained_speech(self, vad):
+        assert not vad.update(np.zeros(1600, dtype=np.float32))
+        assert vad.update(np.full(1600, 0.5, dtype=np.float32))
+        assert not vad.update(np.zeros(1600, dtype=np.float32))
+
+    def test_create_vad_rejects_unknown_engine(self):
+        config = {"audio": {"sample_rate": 16000, "silence_threshold": 0.01, "vad": {"engine": "magic"}}}
+        with pytest.raises(ValueError, match="Unknown VAD engine"):
+            create_vad(config)
@@ -1,3 +1,17 @@
-from .audio_transcriber import AudioTranscriber
+import importlib
 
-__all__ = ['AudioTranscriber']
+# Exports are imported on first use; see utils/__init__.py
+_EXPORTS = {
+    'AudioTranscriber': '.audio_transcriber',
+    'HypothesisBuffer': '.streaming',
+    'BatchTranscriber': '.batch',
+    'ModelRegistry': '.model_registry',
+    'OutputPipeline': '.output'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,23 +1,60 @@
-import sounddevice as sd
 import numpy as np
 import threading
 import queue
-from faster_whisper import WhisperModel
-import pyperclip
-from collections import deque
+import math
 import time
-import torch
-import subprocess
+# audio_callback's time argument shadows the module
+from time import perf_counter
+from collections import deque
 import platform
-import shutil
 
 from validators.config_validator import ConfigValidator
 from utils.config_loader import ConfigLoader
 from utils.device_manager import DeviceManager
 from utils.audio_manager import AudioManager
+from utils.capture import open_source
+from utils.ring_buffer import RingBuffer
+from utils.vad import create_vad
+from utils.resampler import Resampler
+from utils.audio_file import WHISPER_SAMPLE_RATE
+from utils.metrics import Metrics, RTF_BUCKETS, DEPTH_BUCKETS, resident_memory_bytes
+from transcriber.streaming import HypothesisBuffer
+from transcriber.model_registry import ModelRegistry
+from transcriber.batch import can_batch, transcribe_batched, plan_pieces
+from transcriber.inference_worker import WorkerModel
+from transcriber.scheduler import InferenceScheduler, INTERACTIVE, BATCH
+from transcriber.output import (OutputPipeline, ClipboardSink, PasteSink, FileSink, SocketSink,
+                                find_paste_command, clipboard_available, DEFAULT_SINKS,
+                                DEFAULT_DEBOUNCE_MS)
+
+# faster_whisper pulls in ctranslate2, PyAV and tokenizers; it is imported
+# when the first model is loaded so the server starts accepting commands sooner
+WhisperModel = None
+
+# Settings read where they are used; changing them takes effect at once
+LIVE_SETTINGS = ("version", "debug", "audio.silence_threshold", "audio.silence_duration",
+                 "audio.max_duration", "audio.start_tone", "whisper.language", "whisper.task",
+                 "whisper.beam_size", "whisper.warmup", "whisper.models.idle", "processing.auto_paste",
+                 "processing.output", "processing.event_wait_timeout", "processing.shutdown_timeout", "batch",
+                 "server.socket_timeout", "server.config_watch_interval", "server.max_sessions", "autotune")
+# Settings that select the default model or where models run
+MODEL_SETTINGS = ("whisper.model", "whisper.device", "whisper.models", "whisper.cpu_threads",
+                  "whisper.num_workers", "whisper.process_worker", "compute")
+# Model settings that only take effect when a model is loaded again
+RELOAD_SETTINGS = ("whisper.cpu_threads", "whisper.num_workers", "whisper.process_worker")
+# Settings only read when the server starts
+RESTART_SETTINGS = ("server", "metrics")
+# Session of recordings started without naming one
+DEFAULT_SESSION = "default"
+
+def _whisper_model_class():
+    global WhisperModel
+    if WhisperModel is None:
+        from faster_whisper import WhisperModel
+    return WhisperModel
 
 class AudioTranscriber:
-    def __init__(self, config_path="config.json", config=None):
+    def __init__(self, config_path="config.json", config=None, load_model=True):
         # Allow direct config object for testing
         if config is not None:
             self.config = config
@@ -27,176 +64,891 @@ class AudioTranscriber:
         ConfigValidator.validate_config(self.config)
 
         # Initialize managers
-        AudioManager.initialize_audio()
-        device, compute_type = DeviceManager.get_device_and_compute_type()
+        if self.uses_portaudio:
+            AudioManager.initialize_audio()
+        self._device, self._compute_type = DeviceManager.get_device_and_compute_type(self.config)
 
-        # Initialize from config
-        self.sample_rate = self.config["audio"]["sample_rate"]
-        self.silence_threshold = self.config["audio"]["silence_threshold"]
-        self.silence_duration = self.config["audio"]["silence_duration"]
-        self.chunk_duration = self.config["audio"]["chunk_duration"]
+        self._configure_capture()
+        self._init_recording_state()
+
+        # Callables receiving transcript events; called from the processing thread
+        self.listeners = []
+
+        self.metrics = Metrics()
+        self.metrics.histogram("transcribe_rtf", RTF_BUCKETS)
+        self.metrics.histogram("audio_queue_depth", DEPTH_BUCKETS)
+        self.metrics.histogram("decode_batch_size", DEPTH_BUCKETS)
+        # This transcriber and the sessions recording next to it; gauges cover them all
+        self.recorders = [self]
+        self.metrics.gauge("rtf_estimate",
+                           lambda: round(max(r.rtf_estimate or 0.0 for r in list(self.recorders)), 3))
+        self.metrics.gauge("chunk_duration_seconds", lambda: round(self.chunk_size / self.sample_rate, 2))
+        self.metrics.gauge("overloaded", lambda: int(any(r.overloaded for r in list(self.recorders))))
+        self.metrics.gauge("ring_overflows", lambda: sum(r.audio_buffer.overflows for r in list(self.recorders)))
+        self.metrics.gauge("audio_queue_size", lambda: sum(r.audio_queue.qsize() for r in list(self.recorders)))
+
+        # The server loads the model in the background while it already
+        # accepts commands; recordings wait on model_ready before decoding
+        self.model = None
+        self.model_name = self.config["whisper"]["model"]
+        self.registry = ModelRegistry(self.config, self._create_model, self._compute_type, self._models_in_use)
+        # Recordings of other sessions share the models and decode_pool
+        self.session_id = DEFAULT_SESSION
+        # Every model call goes through the scheduler; with whisper.num_workers
+        # above 1, chunks are decoded concurrently and committed in recording order
+        self.num_workers = self.config["whisper"].get("num_workers", 1)
+        self.decode_pool = self._create_decode_pool(self.config)
 
-        # Calculate buffer size based on config
-        buffer_multiplier = self.config["audio"]["buffer_size_multiplier"]
-        max_buffer_size = int(self.chunk_duration * self.sample_rate * buffer_multiplier)
-        self.audio_buffer = deque(maxlen=max_buffer_size)
+        self.model_ready = threading.Event()
+        self.model_error = None
+        self.model_load_time = None
+        self.warmup_time = None
+        self._swap_thread = None
+        # "offloaded" or "quantized" once the default model was idle long enough
+        self.model_state = "loaded"
+        self.last_used = time.perf_counter()
+        if load_model:
+            self.load_model()
 
+        # Check clipboard availability
+        self.clipboard_available = self._check_clipboard()
+
+        # The paste tool is looked up once rather than on every paste
+        self.paste_command = find_paste_command()
+        self._check_autopaste()
+        output = self.config["processing"].get("output", {})
+        self.output = OutputPipeline(self._create_sinks(),
+                                     output.get("debounce_ms", DEFAULT_DEBOUNCE_MS) / 1000,
+                                     on_error=self._output_failed)
+
+    def _init_recording_state(self):
+        """State of one recording at a time, as opposed to the models it shares"""
+        self._config_pending = False
         self.recording = threading.Event()
         self.recording.set()
         self.silence_counter = 0
         self.audio_queue = queue.Queue()
+        # Moving average of decode time per second of audio for _rtf_model
+        self.rtf_estimate = None
+        self._rtf_model = None
 
-        self._initialize_whisper(device, compute_type)
+        self.capturing = threading.Event()
+        # Set while a stream may still hand chunks to the processing thread
+        self.capture_active = threading.Event()
+        self._warm_stream = None
+        # Whether the last warm callback captured; only the warm callback writes it
+        self._warm_captured = False
+        self._capture_requested_at = None
+        self.capture_latency = None
+        self.recording_stopped_at = None
+        self._decode_time = 0.0
 
-        # Check clipboard availability
-        self.clipboard_available = self._check_clipboard()
+        # A session may ask for another model than the default one
+        self.session_model = None
+        self.active_model = None
+        self._refine_lock = threading.Lock()
+        self._refine_thread = None
 
-        # Check for xdotool on Linux
+    def _check_autopaste(self):
+        """Check for a paste tool on Linux"""
         self.can_autopaste = False
         if platform.system() == 'Linux' and self.config["processing"].get("auto_paste", True):
-            if shutil.which('xdotool'):
+            if self.paste_command is not None:
                 self.can_autopaste = True
             elif self.config["debug"]["print_status"]:
-                print("Warning: xdotool not found. Auto-paste will be disabled.")
+                print("Warning: No paste tool found (ydotool, wtype or xdotool). Auto-paste will be disabled.")
                 print("Install with: sudo apt-get install xdotool")
 
+    def _create_sinks(self):
+        """Output sinks from processing.output, in delivery order"""
+        output = self.config["processing"].get("output", {})
+        sinks = []
+        for name in output.get("sinks", DEFAULT_SINKS):
+            if name == "clipboard" and self.clipboard_available:
+                sinks.append(ClipboardSink(self.metrics))
+            elif name == "paste" and self.can_autopaste:
+                sinks.append(PasteSink(self.paste_command, self.metrics))
+            elif name == "file" and output.get("file"):
+                sinks.append(FileSink(output["file"]))
+            elif name == "socket" and output.get("socket_path"):
+                sinks.append(SocketSink(output["socket_path"], self.config["server"].get("socket_timeout", 1.0)))
+        return sinks
+
+    def _output_failed(self, sink, error):
+        if self.config["debug"]["print_status"]:
+            print(f"Warning: Output to {sink.name} failed: {error}")
+
+    def _configure_capture(self):
+        """Derive capture and decoding state from the config"""
+        self.sample_rate = self.config["audio"]["sample_rate"]
+        self.silence_threshold = self.config["audio"]["silence_threshold"]
+        self.silence_duration = self.config["audio"]["silence_duration"]
+        self.chunk_duration = self.config["audio"]["chunk_duration"]
+
+        # Size the capture ring in whole chunks; at least two slots are needed
+        # to keep recording while one is decoded
+        self.chunk_size = int(self.chunk_duration * self.sample_rate)
+        buffer_slots = max(2, math.ceil(self.config["audio"]["buffer_size_multiplier"]))
+        # A worker process reads chunks straight from a ring in shared memory
+        self.audio_buffer = RingBuffer(self.chunk_size * buffer_slots,
+                                       shared=self.config["whisper"].get("process_worker", {}).get("enabled", False))
+
+        self.vad = create_vad(self.config)
+        self.min_chunk_size = int(self.config["audio"].get("vad", {}).get("min_chunk_duration", 5) * self.sample_rate)
+
+        # Whisper expects 16 kHz. Other capture rates are resampled on the
+        # processing thread as chunks arrive, so the callback stays cheap
+        if self.sample_rate != WHISPER_SAMPLE_RATE:
+            self.resampler = Resampler(self.sample_rate, WHISPER_SAMPLE_RATE)
+            self.decode_vad = create_vad(self.config, sample_rate=WHISPER_SAMPLE_RATE)
+        else:
+            self.resampler = None
+            self.decode_vad = self.vad
+
+        # Streaming mode hands the decoder short steps instead of whole chunks
+        streaming = self.config["processing"].get("streaming", {})
+        self.streaming = streaming.get("enabled", False)
+        if self.streaming:
+            self.step_size = int(streaming.get("step_ms", 500) * self.sample_rate / 1000)
+            # The decode window holds resampled audio
+            self.window_step = int(streaming.get("step_ms", 500) * WHISPER_SAMPLE_RATE / 1000)
+            self.max_window_size = int(streaming.get("max_window_duration", 15) * WHISPER_SAMPLE_RATE)
+            self.handoff_size = self.step_size
+        else:
+            self.handoff_size = self.chunk_size
+
+        # Optional always-open input stream that keeps a short pre-roll
+        warm_stream = self.config["audio"].get("warm_stream", {})
+        self.warm_stream_enabled = warm_stream.get("enabled", False)
+        self.preroll = RingBuffer(max(1, int(warm_stream.get("preroll_ms", 300) * self.sample_rate / 1000)))
+
+        # Two-pass mode: a small draft model transcribes while recording and
+        # the default model re-transcribes the session in the background
+        refine = self.config["processing"].get("refine", {})
+        self.draft_model = refine.get("draft_model", "base") if refine.get("enabled", False) else None
+
+        # Chunks that queue up while the decoder is busy are decoded together
+        batch_decode = self.config["processing"].get("batch_decode", {})
+        self.batch_size = batch_decode.get("batch_size", 8) if batch_decode.get("enabled", False) else 1
+        self.batch_wait = batch_decode.get("max_wait_ms", 0) / 1000
+
+        # Adaptive mode sizes chunks from the measured real-time factor and
+        # applies the overload policy when the backlog would miss latency_target
+        adaptive = self.config["processing"].get("adaptive", {})
+        self.adaptive = adaptive.get("enabled", False)
+        self.latency_target = adaptive.get("latency_target", 5.0)
+        self.min_adaptive_chunk = min(self.chunk_size,
+                                      int(adaptive.get("min_chunk_duration", 5) * self.sample_rate))
+        self.overload_policy = adaptive.get("overload_policy", "downgrade")
+        self.overloaded = False
+
+    def classify_changes(self, config):
+        """Changed settings of a new config, grouped by how they take effect;
+        settings in none of the lists shape capture and count as session"""
+        changes = {"live": [], "session": [], "model": [], "restart": []}
+        for name in ConfigLoader.changed_settings(self.config, config):
+            for kind, settings in (("live", LIVE_SETTINGS), ("model", MODEL_SETTINGS),
+                                   ("restart", RESTART_SETTINGS)):
+                if any(name == setting or name.startswith(setting + ".") for setting in settings):
+                    changes[kind].append(name)
+                    break
+            else:
+                changes["session"].append(name)
+        return changes
+
+    def apply_config(self, config):
+        """Switch to a new config without reloading models that stay the same.
+
+        Live settings apply right away, even mid-recording. Capture settings
+        apply from the next recording, and a model or device change loads the
+        new model in the background while the current one keeps serving.
+        Settings under RESTART_SETTINGS need a server restart.
+        """
+        ConfigValidator.validate_config(config)
+        changes = self.classify_changes(config)
+        self.config = config
+
+        self.silence_threshold = config["audio"]["silence_threshold"]
+        self.silence_duration = config["audio"]["silence_duration"]
+        self.vad.threshold = self.silence_threshold
+        self.decode_vad.threshold = self.silence_threshold
+        if any(name.startswith(("processing.auto_paste", "processing.output")) for name in changes["live"]):
+            self._check_autopaste()
+            output = config["processing"].get("output", {})
+            self.output.debounce = output.get("debounce_ms", DEFAULT_DEBOUNCE_MS) / 1000
+            self.output.sinks = self._create_sinks()
+        if changes["session"]:
+            self._config_pending = True
+        if changes["model"]:
+            # Models loaded with other thread or worker settings have to be loaded again
+            self.swap_model(reuse=not any(name.startswith(RELOAD_SETTINGS) for name in changes["model"]))
+        return changes
+
+    def swap_model(self, reuse=True):
+        """Load the configured model in the background and switch to it when ready"""
+        device, compute_type = DeviceManager.get_device_and_compute_type(self.config)
+        config = self.config
+        if reuse and (device, compute_type) == (self._device, self._compute_type):
+            # Loaded models stay valid; a model that is already resident is reused
+            registry = self.registry
+            registry.update(config)
+        else:
+            registry = ModelRegistry(config, lambda name, ct: self._new_model(config, device, name, ct),
+                                     compute_type, self._models_in_use)
+
+        def load():
+            model_name = config["whisper"]["model"]
+            try:
+                model = registry.get(model_name)
+            except Exception as e:
+                print(f"Error: Could not load model {model_name}, keeping {self.model_name}: {e}")
+                self._emit("error", message=f"Could not load model {model_name}: {e}")
+                return
+            self.registry = registry
+            self._device, self._compute_type = device, compute_type
+            self.model, self.model_name = model, model_name
+            self.model_state = "loaded"
+            if not reuse:
+                # Running sessions keep submitting to the same scheduler
+                self.num_workers = config["whisper"].get("num_workers", 1)
+                self.decode_pool.set_workers(self.num_workers)
+            self.model_error = None
+            self.model_ready.set()
+            if config["debug"]["print_status"]:
+                print(f"Switched to model {model_name} on {device} ({compute_type})")
+
+        self._swap_thread = threading.Thread(target=load, daemon=True)
+        self._swap_thread.start()
+        return self._swap_thread
+
+    def _models_in_use(self):
+        """The default model and those running sessions decode with, which eviction must keep"""
+        return [self.model] + [model for recorder in list(self.recorders)
+                               for model in (recorder.active_model, recorder._rtf_model)]
+
+    def _create_model(self, name, compute_type):
+        return self._new_model(self.config, self._device, name, compute_type)
+
+    @staticmethod
+    def _new_model(config, device, name, compute_type):
+        """A Whisper model, in a worker process when whisper.process_worker is enabled"""
+        options = {"device": device, "compute_type": compute_type,
+                   "cpu_threads": config["whisper"].get("cpu_threads", 0),
+                   "num_workers": config["whisper"].get("num_workers", 1)}
+        process_worker = config["whisper"].get("process_worker", {})
+        if process_worker.get("enabled", False):
+            return WorkerModel(name, decode_timeout=process_worker.get("decode_timeout", 120), **options)
+        return _whisper_model_class()(name, **options)
+
+    @staticmethod
+    def _create_decode_pool(config):
+        """Threads calling transcribe() concurrently, one per model worker"""
+        return InferenceScheduler(config["whisper"].get("num_workers", 1))
+
     def _initialize_whisper(self, device, compute_type):
         """Initialize Whisper model"""
         try:
-            self.model = WhisperModel(
-                self.config["whisper"]["model"],
-                device=device,
-                compute_type=compute_type
-            )
+            self.model = self.registry.get(self.model_name)
             if self.config["debug"]["print_status"]:
                 print(f"Using device: {device} with compute type: {compute_type}")
         except Exception as e:
             raise RuntimeError(f"Failed to load Whisper model: {e}")
 
-    def _check_clipboard(self):
+    def _warm_up(self):
+        """Run a throwaway decode so the first real one skips lazy setup"""
+        warmup = self.config["whisper"].get("warmup", {})
+        if not warmup.get("enabled", False):
+            return
+        samples = int(warmup.get("duration", 1.0) * 16000)
+        audio = (np.random.default_rng(0).standard_normal(samples) * 0.01).astype(np.float32)
         try:
-            original_content = pyperclip.paste()
-            pyperclip.copy("test")
-            pyperclip.copy(original_content)  # Restore original content
-            return True
+            segments, info = self.model.transcribe(
+                audio,
+                language=self.config["whisper"]["language"],
+                task=self.config["whisper"]["task"],
+                beam_size=self.config["whisper"].get("beam_size", 5)
+            )
+            for segment in segments:
+                pass
         except Exception as e:
-            print("Clipboard functionality not available.")
-            print("On Linux, install one of these packages:")
-            print("  sudo apt-get install xclip")
-            print("  sudo apt-get install xsel")
+            print(f"Warning: Model warm-up failed: {e}")
+
+    def load_model(self):
+        """Load and warm up the Whisper model, setting model_ready either way"""
+        try:
+            load_start = time.perf_counter()
+            self._initialize_whisper(self._device, self._compute_type)
+            self.model_load_time = time.perf_counter() - load_start
+
+            warmup_start = time.perf_counter()
+            self._warm_up()
+            self.warmup_time = time.perf_counter() - warmup_start
+
+            if self.draft_model:
+                try:
+                    self.get_model(self.draft_model)
+                except Exception as e:
+                    print(f"Warning: Could not load draft model {self.draft_model}: {e}")
+        except Exception as e:
+            self.model_error = e
+            raise
+        finally:
+            self.model_ready.set()
+
+    def load_model_async(self, on_ready=None):
+        """Load the model on a background thread"""
+        def load():
+            try:
+                self.load_model()
+            except Exception as e:
+                print(f"Error: {e}")
+                return
+            if on_ready:
+                on_ready()
+
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
+        return thread
+
+    def _idle_busy(self):
+        """True while anything in this process may still use the default model"""
+        return (self.capture_active.is_set() or not getattr(self, "_processing_complete", True)
+                or any(thread is not None and thread.is_alive()
+                       for thread in (self._refine_thread, self._swap_thread)))
+
+    def offload_if_idle(self):
+        """Free the default model's memory once it has not been used for
+        whisper.models.idle.timeout seconds; returns True if it did.
+
+        With action "unload" the model is dropped. With "quantize" it is
+        replaced by the same model in idle.compute_type, which keeps serving
+        until restore_model() loads the original again. The caller makes
+        sure no file job is running.
+        """
+        idle = self.config["whisper"].get("models", {}).get("idle", {})
+        timeout = idle.get("timeout", 0)
+        if (not timeout or self.model_state != "loaded" or not self.model_ready.is_set() or self.model_error
+                or time.perf_counter() - self.last_used < timeout or self._idle_busy()):
             return False
 
+        if idle.get("action", "unload") == "quantize":
+            compute_type = idle.get("compute_type", "int8")
+            if self.registry.resolve(self.model_name, compute_type) == self.registry.resolve(self.model_name):
+                return False
+            last_used = self.last_used
+            self.model_state = "quantizing"
+            self._idle_compute_type = compute_type
+
+            def quantize():
+                try:
+                    variant = self.registry.get(self.model_name, compute_type)
+                except Exception as e:
+                    print(f"Warning: Could not load the idle variant of {self.model_name}: {e}")
+                    self.model_state = "loaded"
+                    return
+                if self.last_used != last_used:
+                    # A recording started meanwhile and uses the full model
+                    self.registry.discard(self.model_name, compute_type)
+                    self.model_state = "loaded"
+                    return
+                self.registry.discard(self.model_name)
+                self.model = variant
+                self.active_model = self._rtf_model = None
+                self.model_state = "quantized"
+                if self.config["debug"]["print_status"]:
+                    print(f"Idle: switched to {self.model_name} ({compute_type})")
+
+            self._swap_thread = threading.Thread(target=quantize, daemon=True)
+            self._swap_thread.start()
+        else:
+            self.model_ready.clear()
+            self.model = self.active_model = self._rtf_model = None
+            self.registry.clear()
+            self.model_state = "offloaded"
+            if self.config["debug"]["print_status"]:
+                print(f"Idle: unloaded {self.model_name}")
+        self.metrics.count("model_offloads_total")
+        return True
+
+    def restore_model(self):
+        """Load the default model again after an idle offload. Returns the
+        loading thread, or None if the model is loaded; recording can start
+        right away and audio is buffered until an unloaded model is back."""
+        self.last_used = time.perf_counter()
+        state = self.model_state
+        if state not in ("offloaded", "quantized"):
+            return None
+        self.model_state = "loading"
+        if state == "offloaded":
+            # A failed earlier attempt is retried; recordings wait for this one
+            self.model_error = None
+            self.model_ready.clear()
+
+        def load():
+            if state == "offloaded":
+                try:
+                    self.load_model()
+                except Exception as e:
+                    print(f"Error: {e}")
+                    # The next start tries again
+                    self.model_state = "offloaded"
+                    return
+                self.model_state = "loaded"
+                return
+            try:
+                model = self.registry.get(self.model_name)
+            except Exception as e:
+                # The quantized variant keeps serving
+                print(f"Error: Could not reload {self.model_name}: {e}")
+                self.model_state = "quantized"
+                return
+            self.model = model
+            self.registry.discard(self.model_name, self._idle_compute_type)
+            self.model_state = "loaded"
+
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
+        return thread
+
+    def memory_usage(self):
+        """Resident size of the process and the loaded models, in MB"""
+        rss = resident_memory_bytes()
+        return {
+            "model_state": self.model_state,
+            "idle_seconds": round(time.perf_counter() - self.last_used, 1),
+            "rss_mb": round(rss / (1024 * 1024)) if rss is not None else None,
+            "models_mb": round(self.registry.resident_bytes() / (1024 * 1024)),
+            "models": self.registry.loaded()
+        }
+
+    def get_model(self, name=None):
+        """A loaded model by name or alias; the configured one by default"""
+        return self.registry.get(name or self.model_name)
+
+    def _drain_until(self, event, backlog):
+        """Copy queued audio out of the ring until event is set"""
+        event_wait_timeout = self.config["processing"]["event_wait_timeout"]
+        while not event.wait(timeout=event_wait_timeout):
+            while True:
+                try:
+                    chunk = self.audio_queue.get_nowait()
+                except queue.Empty:
+                    break
+                backlog.append(np.array(chunk))
+                self.audio_buffer.release(len(chunk))
+
+    def _load_session_model(self, backlog):
+        """Load the model requested for this session while capture goes on"""
+        name = self.session_model
+        result = {}
+        loaded = threading.Event()
+
+        def load():
+            try:
+                result["model"] = self.get_model(name)
+            except Exception as e:
+                result["error"] = e
+            finally:
+                loaded.set()
+
+        threading.Thread(target=load, daemon=True).start()
+        self._drain_until(loaded, backlog)
+        if "error" in result:
+            print(f"Error: Could not load model {name}, using {self.model_name}: {result['error']}")
+            self._emit("error", message=f"Could not load model {name}: {result['error']}")
+            return self.model
+        return result["model"]
+
+    def _wait_for_model(self):
+        """Wait for the model while copying queued audio out of the ring so
+        capture can continue; returns the copied chunks in order"""
+        backlog = deque()
+        self._drain_until(self.model_ready, backlog)
+        self.active_model = self.model
+        if self.session_model and not self.model_error:
+            self.active_model = self._load_session_model(backlog)
+        if self.active_model is not self._rtf_model:
+            self.rtf_estimate = None
+            self._rtf_model = self.active_model
+        return backlog
+
+    def _capture_pending(self):
+        return self.recording.is_set() or self.capture_active.is_set() or not self.audio_queue.empty()
+
+    def _next_chunk(self, backlog):
+        """Next chunk to decode and whether it still holds ring space"""
+        if backlog:
+            return backlog.popleft(), False
+        chunk = self.audio_queue.get(timeout=self.config["processing"]["event_wait_timeout"])
+        self.metrics.observe("audio_queue_depth", self.audio_queue.qsize())
+        return chunk, True
+
+    def _next_chunks(self, backlog):
+        """Up to batch_size chunks that are ready, waiting at most batch_wait for more"""
+        chunks = [self._next_chunk(backlog)]
+        limit = self.batch_size
+        if self.overloaded and self.overload_policy in ("merge", "drop"):
+            # Everything that is ready, to decode at once or to choose from
+            limit = None
+        deadline = time.perf_counter() + self.batch_wait
+        while limit is None or len(chunks) < limit:
+            if backlog:
+                chunks.append((backlog.popleft(), False))
+                continue
+            timeout = deadline - time.perf_counter()
+            try:
+                if timeout > 0:
+                    chunks.append((self.audio_queue.get(timeout=timeout), True))
+                else:
+                    chunks.append((self.audio_queue.get_nowait(), True))
+            except queue.Empty:
+                break
+        if self.overloaded and self.overload_policy == "drop":
+            chunks = self._drop_oldest(chunks)
+        return chunks
+
+    def _drop_oldest(self, chunks):
+        """Skip the oldest chunks until the rest can be decoded within latency_target"""
+        keep = int(self.latency_target / self.rtf_estimate * self.sample_rate)
+        remaining = sum(len(chunk) for chunk, _ in chunks)
+        dropped = 0
+        while len(chunks) > 1 and remaining > keep:
+            chunk, from_ring = chunks.pop(0)
+            remaining -= len(chunk)
+            dropped += len(chunk)
+            if from_ring:
+                self.audio_buffer.release(len(chunk))
+        if dropped:
+            self.metrics.count("chunks_dropped_total")
+            self.metrics.count("dropped_audio_seconds_total", dropped / self.sample_rate)
+            self._emit("error", message=f"Skipped {dropped / self.sample_rate:.1f}s of audio to keep up")
+        return chunks
+
+    def _adapt(self, backlog):
+        """Resize chunks and update the overload state from the real-time factor"""
+        if not self.adaptive or not self.rtf_estimate:
+            return
+        # Audio captured but not decoded yet, in the ring or copied out of it
+        pending = self.audio_buffer.capacity - self.audio_buffer.free + sum(len(chunk) for chunk in backlog)
+        was_overloaded = self.overloaded
+        self.overloaded = pending / self.sample_rate * self.rtf_estimate > self.latency_target
+        if self.overloaded and not was_overloaded:
+            self.metrics.count("overload_total")
+            if self.config["debug"]["print_status"]:
+                print(f"Decoding falls behind (RTF {self.rtf_estimate:.2f}), applying {self.overload_policy} policy")
+
+        # The last chunk is only decoded after stopping, so it must fit the target
+        chunk_size = int(self.latency_target / self.rtf_estimate * self.sample_rate)
+        max_chunk_size = int(self.chunk_duration * self.sample_rate)
+        self.chunk_size = min(max_chunk_size, max(self.min_adaptive_chunk, chunk_size))
+        if not self.streaming:
+            self.handoff_size = self.chunk_size
+
+    def _decode_options(self, speeches):
+        """transcribe() options for the next decode; runs on the processing thread"""
+        options = {
+            "language": self.config["whisper"]["language"],
+            "task": self.config["whisper"]["task"],
+            "beam_size": self.config["whisper"].get("beam_size", 5)
+        }
+        self.metrics.observe("decode_batch_size", len(speeches))
+        if self.overloaded and self.overload_policy == "downgrade":
+            # Greedy decoding is several times faster than beam search
+            options["beam_size"] = 1
+            self.metrics.count("beam_downgrades_total")
+        return options
+
+    def _transcribe_speech(self, speeches, options):
+        """Texts of each speech array; several arrays are decoded in one batch"""
+        if self.overloaded and self.overload_policy == "merge" and len(speeches) > 1:
+            # One decode for everything that is ready, committed as one piece
+            segments, info = self.active_model.transcribe(np.concatenate(speeches), **options)
+            return [[segment.text for segment in segments]]
+        if can_batch(speeches):
+            return [[text for _, _, text in segments]
+                    for segments in transcribe_batched(self.active_model, speeches, options, self.batch_size)]
+        results = []
+        for speech in speeches:
+            # transcribe() extracts features up front; segments decode lazily
+            segments, info = self.active_model.transcribe(speech, **options)
+            results.append(segment.text for segment in segments)
+        return results
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _emit(self, event, **data):
+        data["event"] = event
+        for listener in list(self.listeners):
+            try:
+                listener(data)
+            except Exception as e:
+                if self.config["debug"]["print_status"]:
+                    print(f"Event listener failed: {e}")
+
+    def stop_recording(self):
+        """End the current recording, remembering when it was stopped"""
+        if self.recording.is_set():
+            self.recording_stopped_at = time.perf_counter()
+        self.recording.clear()
+
+    def _check_clipboard(self):
+        # Only reads the clipboard, so the user's contents survive startup
+        if clipboard_available():
+            return True
+        print("Clipboard functionality not available.")
+        print("On Linux, install one of these packages:")
+        print("  sudo apt-get install xclip")
+        print("  sudo apt-get install xsel")
+        return False
+
+    def _record_capture_latency(self, frames, preroll_samples=0):
+        """Time from the start request to the first captured sample"""
+        first_sample_at = time.perf_counter() - (frames + preroll_samples) / self.sample_rate
+        self.capture_latency = first_sample_at - self._capture_requested_at
+        self._capture_requested_at = None
+        if self.config["debug"]["print_status"]:
+            print(f"Capture latency: {self.capture_latency * 1000:.0f} ms "
+                  f"({preroll_samples * 1000 / self.sample_rate:.0f} ms pre-roll)")
+
+    def _flush_capture(self):
+        """Queue audio that never filled a chunk once capture has ended"""
+        if self.audio_buffer:
+            self.audio_queue.put(self.audio_buffer.read())
+        self.capture_active.clear()
+
+    def _warm_callback(self, indata, frames, time, status):
+        """Input callback of the always-open stream"""
+        capturing = self.capturing.is_set()
+        if self._warm_captured and not capturing:
+            # Capture has ended, not just yet to begin. Flush from the
+            # callback thread so the ring keeps a single writer
+            self._warm_captured = False
+            self._flush_capture()
+
+        if capturing:
+            self._warm_captured = True
+            if self.preroll:
+                preroll_samples = len(self.preroll)
+                self.audio_buffer.write(self.preroll.read())
+                self.preroll.clear()
+                if self._capture_requested_at is not None:
+                    self._record_capture_latency(frames, preroll_samples)
+            self.audio_callback(indata, frames, time, status)
+            return
+
+        audio_data = indata.mean(axis=1) if indata.ndim > 1 else indata
+        excess = len(audio_data) - self.preroll.free
+        if excess > 0:
+            self.preroll.discard(excess)
+        self.preroll.write(audio_data[-self.preroll.capacity:])
+
+    def open_warm_stream(self):
+        """Keep the input stream open between recordings"""
+        if self._warm_stream is not None:
+            return
+        self._warm_stream = open_source(self.config, self._warm_callback, self.sample_rate)
+        self._warm_stream.start()
+
+    def close_warm_stream(self):
+        if self._warm_stream is None:
+            return
+        self._warm_stream.stop()
+        self._warm_stream.close()
+        self._warm_stream = None
+
     def audio_callback(self, indata, frames, time, status):
-        if status and self.config["debug"]["print_status"]:
-            print(f"Status: {status}")
+        callback_start = perf_counter()
+        if status:
+            self.metrics.count("callback_status_total")
+            if getattr(status, "input_overflow", False):
+                self.metrics.count("callback_input_overflow_total")
+            if self.config["debug"]["print_status"]:
+                print(f"Status: {status}")
 
-        audio_data = np.mean(indata, axis=1) if indata.ndim > 1 else indata.copy()
-        self.audio_buffer.extend(audio_data)
+        if self._capture_requested_at is not None:
+            self._record_capture_latency(frames)
 
-        buffer_size = len(self.audio_buffer)
-        chunk_size = int(self.chunk_duration * self.sample_rate)
+        audio_data = indata.mean(axis=1) if indata.ndim > 1 else indata
+        self.audio_buffer.write(audio_data)
+        silent = self._check_silence(audio_data)
+        pending = len(self.audio_buffer)
+        # Adaptive mode resizes chunks from the processing thread
+        handoff_size = self.handoff_size
 
-        if buffer_size >= chunk_size:
-            chunk = list(self.audio_buffer)[:chunk_size]
-            self.audio_queue.put(np.array(chunk))
-            for _ in range(chunk_size):
-                self.audio_buffer.popleft()
+        # Chunks are views into the ring; process_audio releases them when done
+        if silent:
+            if pending:
+                self.audio_queue.put(self.audio_buffer.read())
+            self.stop_recording()
+        elif pending >= handoff_size:
+            if self.streaming:
+                self.audio_queue.put(self.audio_buffer.read(handoff_size))
+            else:
+                # Cut at the quietest frame of the last quarter rather than mid-word
+                search = handoff_size // 4
+                tail = self.audio_buffer.peek(handoff_size)[-search:]
+                self.audio_queue.put(self.audio_buffer.read(handoff_size - search + self.vad.quietest_point(tail)))
+        elif (not self.streaming and pending >= self.min_chunk_size
+              and self.silence_counter >= self.vad.min_silence):
+            # Speaker paused; no need to wait for a full chunk
+            self.audio_queue.put(self.audio_buffer.read())
 
-        if self._check_silence(audio_data):
-            if self.audio_buffer:
-                self.audio_queue.put(np.array(list(self.audio_buffer)))
-                self.audio_buffer.clear()
-            self.recording.clear()
+        self.metrics.observe("callback_seconds", perf_counter() - callback_start)
 
     def _check_silence(self, audio_data):
-        """Check for silence in audio data"""
-        if np.abs(audio_data).mean() < self.silence_threshold:
-            self.silence_counter += len(audio_data) / self.sample_rate
-            return self.silence_counter >= self.silence_duration
-        else:
+        """Track trailing silence; True once it lasts silence_duration"""
+        if self.vad.update(audio_data):
             self.silence_counter = 0
             return False
+        self.silence_counter += len(audio_data) / self.sample_rate
+        return self.silence_counter >= self.silence_duration
 
-    def _simulate_paste(self):
-        """Simulate paste command based on platform"""
-        print("\nDebug auto-paste:")
-        print(f"Can auto-paste: {self.can_autopaste}")
-        print(f"Auto-paste enabled in config: {self.config['processing'].get('auto_paste', True)}")
+    def _output_transcription(self, complete_text, speech_detected, refining=False):
+        """Print the final transcription and hand it to the output sinks"""
+        stopped_at = self.recording_stopped_at
+        self._emit("final", text=complete_text, refining=refining, timing={
+            "capture_latency": self.capture_latency,
+            "decode_time": self._decode_time,
+            "stop_to_final": time.perf_counter() - stopped_at if stopped_at else None
+        })
 
-        if not self.can_autopaste:
-            print("Auto-paste disabled - paste tool not available")
-            return
-
-        try:
-            print("Attempting to simulate Ctrl+V...")
-            # Try ydotool first
-            if shutil.which('ydotool'):
-                result = subprocess.run(['ydotool', 'key', '29:1', '47:1', '47:0', '29:0'],
-                             check=True,
-                             stdout=subprocess.DEVNULL,
-                             stderr=subprocess.PIPE,
-                             text=True)
-            # Try wtype as fallback
-            elif shutil.which('wtype'):
-                result = subprocess.run(['wtype', '-M', 'ctrl', '-P', 'v', '-m', 'ctrl'],
-                             check=True,
-                             stdout=subprocess.DEVNULL,
-                             stderr=subprocess.PIPE,
-                             text=True)
+        print("\nTranscription:")
+        if complete_text:
+            print(complete_text)
+            self.output.final(complete_text, refining)
+        elif self.config["debug"]["print_status"]:
+            if not speech_detected:
+                print("<No speech detected>")
             else:
-                # Fallback to xdotool for X11
-                result = subprocess.run(['xdotool', 'key', 'ctrl+v'],
-                             check=True,
-                             stdout=subprocess.DEVNULL,
-                             stderr=subprocess.PIPE,
-                             text=True)
-            print("Auto-paste command completed successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"Warning: Failed to auto-paste. Error: {e.stderr}")
-            if self.config["debug"]["print_status"]:
-                print("Warning: Failed to auto-paste")
+                print("Speech detected but transcription failed")
+
+    def _should_refine(self, draft):
+        return bool(self.draft_model and draft and self.active_model is not self.model)
+
+    def _finish_session(self, text, speech_detected, session_audio):
+        """Output the session's text and start refining it if it is a draft"""
+        refining = self._should_refine(text)
+        self._output_transcription(text, speech_detected, refining=refining)
+        if refining:
+            audio = np.concatenate(session_audio)
+            self._refine_thread = threading.Thread(target=self._refine,
+                                                   args=(audio, text, self.recording_stopped_at),
+                                                   daemon=True)
+            self._refine_thread.start()
+
+    def _refine(self, audio, draft, stopped_at):
+        """Re-transcribe a session with the default model and replace the draft.
+
+        The audio is decoded in pieces of up to 30 s, cut at pauses like
+        file jobs, so live chunks never wait for more than one piece.
+        """
+        def decode(piece):
+            segments, info = self.model.transcribe(
+                piece,
+                language=self.config["whisper"]["language"],
+                task=self.config["whisper"]["task"],
+                beam_size=self.config["whisper"].get("beam_size", 5)
+            )
+            return " ".join(segment.text.strip() for segment in segments if segment.text.strip())
+
+        max_length = int(min(self.config["audio"]["chunk_duration"], 30) * WHISPER_SAMPLE_RATE)
+        pieces = plan_pieces([(0, len(audio))], self.decode_vad.scores(audio), self.decode_vad.frame_size,
+                             max_length)
+        with self._refine_lock:
+            refine_start = time.perf_counter()
+            # Live recordings go first; the draft is already out
+            futures = [self.decode_pool.submit(decode, audio[start:end], priority=BATCH, session=self.session_id)
+                       for start, end in pieces]
+            try:
+                text = " ".join(part for part in (future.result() for future in futures) if part)
+            except Exception as e:
+                for future in futures:
+                    future.cancel()
+                print(f"Error: Refinement failed: {e}")
+                self.output.refined(draft, draft)
+                self._emit("refined", text=draft, draft=draft, error=str(e))
+                return
+            refine_time = time.perf_counter() - refine_start
+            self.metrics.observe("refine_seconds", refine_time)
+            text = text or draft
+            self.output.refined(text, draft)
+
+            if self.config["debug"]["print_transcriptions"]:
+                print("\nRefined transcription:")
+                print(text)
+            self._emit("refined", text=text, draft=draft, timing={
+                "refine_time": refine_time,
+                "stop_to_refined": time.perf_counter() - stopped_at if stopped_at else None
+            })
 
     def process_audio(self):
+        if self.streaming:
+            return self._process_audio_streaming()
+
         full_transcription = []
+        session_audio = []
         seen_transcriptions = set()
         self._processing_complete = False
-        speech_detected = False  # Add flag to track if any speech was processed
+        self._decode_time = 0.0
+        # With several model workers decodes overlap; pending holds them, oldest first
+        concurrent = self.num_workers > 1
+        pending = deque()
 
         try:
-            while self.recording.is_set() or not self.audio_queue.empty():
+            backlog = self._wait_for_model()
+            if self.model_error:
+                print(f"Error: Cannot transcribe, model failed to load: {self.model_error}")
+                return
+
+            while backlog or self._capture_pending():
                 try:
-                    audio_chunk = self.audio_queue.get(timeout=self.config["processing"]["event_wait_timeout"])
-
-                    if np.max(np.abs(audio_chunk)) < self.silence_threshold:
-                        continue
-
-                    segments, info = self.model.transcribe(
-                        audio_chunk,
-                        language=self.config["whisper"]["language"],
-                        task=self.config["whisper"]["task"],
-                        beam_size=self.config["whisper"].get("beam_size", 5)
-                    )
-
-                    chunk_text = []
-                    for segment in segments:
-                        if segment.text.strip():
-                            chunk_text.append(segment.text.strip())
-                            speech_detected = True  # Set flag when speech is found
-
-                    if chunk_text:
-                        combined_text = " ".join(chunk_text)
-                        if combined_text not in seen_transcriptions:
-                            seen_transcriptions.add(combined_text)
-                            full_transcription.append(combined_text)
-
-                    # Only copy to clipboard, don't paste yet
-                    if self.clipboard_available and full_transcription:
-                        try:
-                            complete_text = " ".join(full_transcription)
-                            pyperclip.copy(complete_text)
-                        except Exception as e:
-                            if self.config["debug"]["print_status"]:
-                                print(f"Clipboard operation failed: {e}")
+                    if self._collect_decoded(pending, full_transcription, seen_transcriptions):
+                        self._adapt(backlog)
+                        self._copy_progress(full_transcription)
+
+                    chunks = self._next_chunks(backlog)
+                    speeches = []
+
+                    try:
+                        for chunk, from_ring in chunks:
+                            audio_chunk = self._to_model_rate(chunk)
+                            # Only speech goes to the model
+                            speech = self.decode_vad.extract_speech(audio_chunk)
+                            if speech is None:
+                                self.metrics.count("chunks_skipped_silent_total")
+                                continue
+                            if self.draft_model or concurrent or (from_ring and len(chunks) > 1):
+                                # speech may be a view into the ring
+                                speech = np.array(speech)
+                            if self.draft_model:
+                                session_audio.append(speech)
+                            speeches.append(speech)
+                        if not speeches:
+                            continue
+
+                        decode = self.decode_pool.submit(self._decode_speech, speeches, self._decode_options(speeches),
+                                                         priority=INTERACTIVE, session=self.session_id)
+                        if concurrent:
+                            pending.append(decode)
+                        else:
+                            # One decode at a time; the chunks' ring slots are
+                            # reused once it returns
+                            results, duration, samples = decode.result()
+                    finally:
+                        for chunk, from_ring in chunks:
+                            if from_ring:
+                                self.audio_buffer.release(len(chunk))
+
+                    if not concurrent:
+                        self._commit_results(results, full_transcription, seen_transcriptions)
+                        self._record_decode(duration, samples)
+                        self._adapt(backlog)
+                        self._copy_progress(full_transcription)
 
                 except queue.Empty:
                     continue
@@ -205,57 +957,256 @@ class AudioTranscriber:
                         print(f"Error processing audio: {e}")
                     continue
 
-            # Final output
-            print("\nTranscription:")
-            if full_transcription:
-                complete_text = " ".join(full_transcription)
-                print(complete_text)
+            if self._collect_decoded(pending, full_transcription, seen_transcriptions, wait=True):
+                self._copy_progress(full_transcription)
+            # Every chunk with speech commits text, so there was speech if anything was committed
+            self._finish_session(" ".join(full_transcription), bool(full_transcription), session_audio)
 
-                if self.clipboard_available:
-                    try:
-                        pyperclip.copy(complete_text)
-                        if self.config["processing"].get("auto_paste", True):
-                            self._simulate_paste()
-                    except Exception as e:
-                        if self.config["debug"]["print_status"]:
-                            print(f"Final clipboard operation failed: {e}")
-            elif self.config["debug"]["print_status"]:
-                if not speech_detected:
-                    print("<No speech detected>")
-                else:
-                    print("Speech detected but transcription failed")
+        finally:
+            self._processing_complete = True
+
+    def _decode_speech(self, speeches, options):
+        """Decode on a scheduler thread; texts are collected there so decodes run in parallel.
+        Returns the texts and the decode time, which the processing thread records"""
+        decode_start = time.perf_counter()
+        results = [list(texts) for texts in self._transcribe_speech(speeches, options)]
+        return results, time.perf_counter() - decode_start, sum(len(speech) for speech in speeches)
+
+    def _collect_decoded(self, pending, full_transcription, seen_transcriptions, wait=False):
+        """Commit finished pool decodes in recording order; returns how many were committed.
+
+        A decode that finishes early waits for the ones before it. With wait,
+        or once more decodes are queued than the pool runs at a time, the
+        oldest one is waited for.
+        """
+        committed = 0
+        while pending and (wait or pending[0].done() or len(pending) > self.num_workers):
+            try:
+                results, duration, samples = pending.popleft().result()
+            except Exception as e:
+                if self.config["debug"]["print_status"]:
+                    print(f"Error processing audio: {e}")
+                continue
+            self._commit_results(results, full_transcription, seen_transcriptions)
+            self._record_decode(duration, samples)
+            committed += 1
+        return committed
+
+    def _commit_results(self, results, full_transcription, seen_transcriptions):
+        """Emit the texts of consecutive chunks and add new ones to the transcription"""
+        for texts in results:
+            chunk_text = []
+            for text in texts:
+                if text.strip():
+                    chunk_text.append(text.strip())
+                    self._emit("partial", text=" ".join(chunk_text))
+
+            if chunk_text:
+                combined_text = " ".join(chunk_text)
+                if combined_text not in seen_transcriptions:
+                    seen_transcriptions.add(combined_text)
+                    full_transcription.append(combined_text)
+                    self._emit("committed", text=combined_text,
+                               full_text=" ".join(full_transcription))
+
+    def _copy_progress(self, full_transcription):
+        # Sinks see the text so far; only the final text is pasted
+        if full_transcription:
+            self.output.progress(" ".join(full_transcription))
+
+    def _to_model_rate(self, chunk):
+        """Chunk resampled to 16 kHz; chunks of a session form one signal"""
+        if self.resampler is None:
+            return chunk
+        return self.resampler.process(chunk)
+
+    def _record_decode(self, duration, samples):
+        self._decode_time += duration
+        rtf = duration * WHISPER_SAMPLE_RATE / samples
+        self.rtf_estimate = rtf if self.rtf_estimate is None else 0.7 * self.rtf_estimate + 0.3 * rtf
+        self.metrics.observe("transcribe_seconds", duration)
+        self.metrics.observe("transcribe_rtf", rtf)
+        self.metrics.count("transcribed_audio_seconds_total", samples / WHISPER_SAMPLE_RATE)
+
+    def _decode_window(self, window, window_start, hypothesis):
+        """Transcribe the uncommitted window and feed its words to the hypothesis"""
+        words = []
+        if len(window) and self.decode_vad.has_speech(window):
+            prompt = hypothesis.prompt() or None
+
+            def decode():
+                decode_start = time.perf_counter()
+                segments, info = self.active_model.transcribe(
+                    window,
+                    language=self.config["whisper"]["language"],
+                    task=self.config["whisper"]["task"],
+                    beam_size=self.config["whisper"].get("beam_size", 5),
+                    word_timestamps=True,
+                    initial_prompt=prompt
+                )
+                # Segments decode lazily, so they are read on the scheduler thread
+                return [word for segment in segments for word in segment.words or []], \
+                    time.perf_counter() - decode_start
+
+            decoded, duration = self.decode_pool.submit(decode, priority=INTERACTIVE,
+                                                        session=self.session_id).result()
+            for word in decoded:
+                if word.word.strip():
+                    words.append((window_start + word.start,
+                                  window_start + word.end,
+                                  word.word.strip()))
+            self._record_decode(duration, len(window))
+        elif len(window):
+            self.metrics.count("chunks_skipped_silent_total")
+        hypothesis.insert(words)
+        return words
+
+    def _process_audio_streaming(self):
+        """Re-decode a sliding window every step, committing words once
+        consecutive passes agree and dropping committed audio from the window"""
+        hypothesis = HypothesisBuffer()
+        session_audio = []
+        window = np.zeros(0, dtype=np.float32)
+        window_start = 0.0
+        pending = 0
+        committed_count = 0
+        speech_detected = False
+        self._processing_complete = False
+        self._decode_time = 0.0
+
+        try:
+            backlog = self._wait_for_model()
+            if self.model_error:
+                print(f"Error: Cannot transcribe, model failed to load: {self.model_error}")
+                return
+
+            while backlog or self._capture_pending():
+                try:
+                    block, from_ring = self._next_chunk(backlog)
+                except queue.Empty:
+                    continue
+
+                resampled = self._to_model_rate(block)
+                if self.draft_model:
+                    session_audio.append(np.array(resampled))
+                window = np.concatenate((window, resampled))
+                if from_ring:
+                    self.audio_buffer.release(len(block))
+                pending += len(resampled)
+                if pending < self.window_step:
+                    continue
+                pending = 0
+
+                try:
+                    if self._decode_window(window, window_start, hypothesis):
+                        speech_detected = True
+                except Exception as e:
+                    if self.config["debug"]["print_status"]:
+                        print(f"Error processing audio: {e}")
+                    continue
+
+                agreed = hypothesis.flush()
+                if len(window) > self.max_window_size:
+                    agreed += hypothesis.commit_pending()
+                if agreed:
+                    self._emit("committed", text=" ".join(w[2] for w in agreed),
+                               full_text=hypothesis.text())
+                self._emit("partial", text=" ".join(w[2] for w in hypothesis.previous))
+
+                # Only the uncommitted tail is decoded again
+                trim_to = hypothesis.last_committed_end
+                if trim_to > window_start:
+                    cut = min(int((trim_to - window_start) * WHISPER_SAMPLE_RATE), len(window))
+                    window = window[cut:]
+                    window_start += cut / WHISPER_SAMPLE_RATE
+                if len(window) > self.max_window_size:
+                    # Nothing recognisable in the window; keep only the newest step
+                    cut = len(window) - self.window_step
+                    window = window[cut:]
+                    window_start += cut / WHISPER_SAMPLE_RATE
+
+                if len(hypothesis.committed) > committed_count:
+                    committed_count = len(hypothesis.committed)
+                    self.output.progress(hypothesis.text())
+
+            # Whatever is left is at most one window long
+            try:
+                if self._decode_window(window, window_start, hypothesis):
+                    speech_detected = True
+            except Exception as e:
+                if self.config["debug"]["print_status"]:
+                    print(f"Error processing audio: {e}")
+            remaining = hypothesis.commit_pending()
+            if remaining:
+                self._emit("committed", text=" ".join(w[2] for w in remaining),
+                           full_text=hypothesis.text())
+
+            self._finish_session(hypothesis.text(), speech_detected, session_audio)
 
         finally:
             self._processing_complete = True
 
-    def start_recording(self):
-        """Start recording and processing audio"""
+    def _wait_for_stop(self, start_time):
         max_duration = self.config["audio"]["max_duration"]
-        shutdown_timeout = self.config["processing"]["shutdown_timeout"]
         event_wait_timeout = self.config["processing"]["event_wait_timeout"]
+        print("Recording...")
+        while self.recording.is_set() and (time.time() - start_time) < max_duration:
+            time.sleep(event_wait_timeout)
+
+    def start_recording(self, requested_at=None, model=None, stream=None):
+        """Start recording and processing audio, optionally with another model.
+
+        stream replaces the microphone with another source of audio_callback
+        blocks, such as a utils.capture.PushStream fed by a remote client.
+        """
+        shutdown_timeout = self.config["processing"]["shutdown_timeout"]
         start_time = time.time()
         processing_thread = None
+        self._capture_requested_at = requested_at if requested_at is not None else time.perf_counter()
+        self.session_model = model if model is not None else self.draft_model
+        # An offloaded model loads while capture starts
+        self.restore_model()
+        self.capture_active.set()
+        self.metrics.count("sessions_total")
 
         try:
-            AudioManager.play_start_tone(self.config)
+            if stream is None and self.uses_portaudio:
+                # The tone is precomputed and must not delay opening the stream
+                AudioManager.play_start_tone(self.config, blocking=False)
             processing_thread = threading.Thread(target=self.process_audio)
             processing_thread.start()
+            self._emit("started")
 
-            with sd.InputStream(callback=self.audio_callback,
-                              channels=self.config["audio"]["channels"],
-                              samplerate=self.sample_rate):
-                print("Recording...")
-                while self.recording.is_set() and (time.time() - start_time) < max_duration:
-                    self.recording.wait(timeout=event_wait_timeout)
+            if stream is not None:
+                with stream:
+                    self._wait_for_stop(start_time)
+            elif self._warm_stream is not None:
+                self.capturing.set()
+                try:
+                    self._wait_for_stop(start_time)
+                finally:
+                    self.capturing.clear()
+                    # The next warm callback flushes; don't hang if the stream died
+                    for _ in range(20):
+                        if not self.capture_active.is_set():
+                            break
+                        time.sleep(self.config["processing"]["event_wait_timeout"] / 10)
+            else:
+                with open_source(self.config, self.audio_callback, self.sample_rate):
+                    self._wait_for_stop(start_time)
+            # Also reached at max_duration, where the recording is still set
+            self.stop_recording()
 
         except KeyboardInterrupt:
-            self.recording.clear()
-            if self.audio_buffer:
-                self.audio_queue.put(np.array(list(self.audio_buffer)))
+            self.stop_recording()
+            self.capturing.clear()
 
         finally:
+            if self.capture_active.is_set():
+                self._flush_capture()
             if processing_thread and processing_thread.is_alive():
                 processing_thread.join(timeout=shutdown_timeout)
+            self.last_used = time.perf_counter()
             self.cleanup()
 
     def cleanup(self):
@@ -269,18 +1220,35 @@ class AudioTranscriber:
                 except queue.Empty:
                     break
 
+    @property
+    def uses_portaudio(self):
+        """True when audio comes from a PortAudio input device rather than a file or generator"""
+        return self.config["audio"].get("source", {}).get("type", "portaudio") == "portaudio"
+
     def get_device(self):
-        if torch.cuda.is_available():
-            return "cuda"
-        elif torch.backends.mps.is_available():  # For Apple M1/M2
-            return "mps"
-        return "cpu"
+        return DeviceManager.get_device(self.config)
+
+    def _apply_pending_config(self):
+        """Rebuild capture state for settings changed since the last recording"""
+        self.close_warm_stream()
+        self._configure_capture()
+        self._config_pending = False
+        if self.warm_stream_enabled:
+            self.open_warm_stream()
 
     def reset_state(self):
         """Reset transcriber state for new recording without reinitializing model"""
+        if self._config_pending:
+            self._apply_pending_config()
         self.recording = threading.Event()
         self.recording.set()
         self.silence_counter = 0
         self.audio_queue = queue.Queue()
         self.audio_buffer.clear()
+        self.vad.reset()
+        if self.resampler is not None:
+            self.resampler.reset()
+        self.recording_stopped_at = None
+        self.overloaded = False
+        self.capture_active.clear()
         self._processing_complete = False
\ No newline at end of file
@@ -0,0 +1,187 @@
+import os
+import re
+import json
+import copy
+import time
+import hashlib
+import platform
+
+from utils.audio_file import AudioFile
+from utils.device_manager import DeviceManager, DEFAULT_COMPUTE_TYPES
+
+# Compute types tried per device, most precise first
+COMPUTE_CANDIDATES = {
+    "cuda": ["float16", "int8_float16", "int8"],
+    "cpu": ["float32", "int8_float32", "int8"]
+}
+DEFAULT_BEAM_SIZES = [5, 1]
+DEFAULT_TARGET_RTF = 0.3
+
+def cache_path():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "skald", "autotune.json")
+
+def host_key(device):
+    """Identifies the machine a result was measured on"""
+    return f"{platform.node()}/{platform.machine()}/{os.cpu_count()}cpu/{device}" \
+           f"/{DeviceManager.cuda_device_count() if device == 'cuda' else 0}gpu"
+
+def _basis(config):
+    """Hash of the settings a tuning run depends on; results go stale when they change"""
+    basis = {"autotune": config.get("autotune", {}), "model": config["whisper"]["model"],
+             "device": config["whisper"].get("device", "auto")}
+    return hashlib.sha1(json.dumps(basis, sort_keys=True).encode()).hexdigest()[:12]
+
+def _words(text):
+    return re.findall(r"[\w']+", text.lower())
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance divided by the reference length"""
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+def candidates(config, device):
+    """Settings to measure, most accurate first by expectation"""
+    autotune = config.get("autotune", {})
+    models = autotune.get("models") or [config["whisper"]["model"]]
+    compute_types = autotune.get("compute_types") or COMPUTE_CANDIDATES.get(device, ["default"])
+    beam_sizes = autotune.get("beam_sizes") or DEFAULT_BEAM_SIZES
+    return [{"model": model, "compute_type": compute_type, "beam_size": beam_size}
+            for model in models for compute_type in compute_types for beam_size in beam_sizes]
+
+def thread_candidates():
+    cpus = os.cpu_count() or 1
+    return sorted({cpus, max(1, cpus // 2), min(cpus, 4)}, reverse=True)
+
+class Autotuner:
+    """Measures candidate settings on a speech sample and picks the best one.
+
+    Accuracy is the word error rate against the sample's transcript, read
+    from a .txt file next to it, or else against the output of the first
+    (most accurate) candidate. The chosen settings are the most accurate
+    ones whose real-time factor meets target_rtf; CPU thread counts are
+    then tuned for them.
+    """
+
+    def __init__(self, config, sample, load_model=None, log=print):
+        self.config = config
+        self.device = DeviceManager.get_device(config)
+        self.target_rtf = config.get("autotune", {}).get("target_rtf", DEFAULT_TARGET_RTF)
+        self.audio = AudioFile(sample).read()
+        self.duration = len(self.audio) / 16000
+        reference = os.path.splitext(sample)[0] + ".txt"
+        self.reference = open(reference).read() if os.path.exists(reference) else None
+        self.load_model = load_model or self._load_model
+        self.log = log
+        self._models = {}
+
+    def _load_model(self, name, compute_type, cpu_threads):
+        from faster_whisper import WhisperModel
+        return WhisperModel(name, device=self.device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+    def _model(self, name, compute_type, cpu_threads):
+        key = (name, compute_type, cpu_threads)
+        if key not in self._models:
+            # Only one model is kept so large candidates don't pile up
+            self._models.clear()
+            self._models[key] = self.load_model(name, compute_type, cpu_threads)
+        return self._models[key]
+
+    def measure(self, candidate, cpu_threads=0):
+        """Real-time factor and transcript of one candidate"""
+        model = self._model(candidate["model"], candidate["compute_type"], cpu_threads)
+        options = {"language": self.config["whisper"]["language"],
+                   "task": self.config["whisper"]["task"],
+                   "beam_size": candidate["beam_size"]}
+        # The first decode pays for lazy initialization
+        segments, info = model.transcribe(self.audio[:16000], **options)
+        for segment in segments:
+            pass
+        start = time.perf_counter()
+        segments, info = model.transcribe(self.audio, **options)
+        text = " ".join(segment.text.strip() for segment in segments)
+        return (time.perf_counter() - start) / self.duration, text
+
+    def run(self):
+        results = []
+        reference = self.reference
+        for candidate in candidates(self.config, self.device):
+            try:
+                rtf, text = self.measure(candidate)
+            except Exception as e:
+                self.log(f"  {candidate['model']} {candidate['compute_type']} beam {candidate['beam_size']}: "
+                         f"failed ({e})")
+                continue
+            if reference is None:
+                reference = text
+            result = dict(candidate, rtf=round(rtf, 3), wer=round(word_error_rate(reference, text), 3))
+            self.log(f"  {result['model']} {result['compute_type']} beam {result['beam_size']}: "
+                     f"RTF {result['rtf']:.2f}, WER {result['wer']:.1%}")
+            results.append(result)
+        if not results:
+            raise RuntimeError("No candidate could be measured")
+
+        fast_enough = [result for result in results if result["rtf"] <= self.target_rtf]
+        if fast_enough:
+            best = min(fast_enough, key=lambda result: (result["wer"], result["rtf"]))
+        else:
+            self.log(f"No candidate reaches RTF {self.target_rtf}; using the fastest")
+            best = min(results, key=lambda result: result["rtf"])
+
+        best["cpu_threads"] = 0
+        if self.device == "cpu":
+            timings = {}
+            for threads in thread_candidates():
+                timings[threads], _ = self.measure(best, cpu_threads=threads)
+                self.log(f"  {threads} threads: RTF {timings[threads]:.2f}")
+            best["cpu_threads"] = min(timings, key=timings.get)
+            best["rtf"] = round(timings[best["cpu_threads"]], 3)
+        return best
+
+def load_tuned(config):
+    """Cached tuning result for this host and config, or None"""
+    try:
+        with open(cache_path()) as f:
+            entry = json.load(f).get(host_key(DeviceManager.get_device(config)))
+    except (OSError, ValueError):
+        return None
+    if not entry or entry.get("basis") != _basis(config):
+        return None
+    return entry["settings"]
+
+def save_tuned(config, settings):
+    path = cache_path()
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache[host_key(DeviceManager.get_device(config))] = {
+        "basis": _basis(config), "settings": settings, "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(temporary, path)
+
+def apply_tuned(config, settings):
+    """Copy of config running the tuned model, compute type, beam size and threads"""
+    tuned = copy.deepcopy(config)
+    device = DeviceManager.get_device(config)
+    tuned["whisper"]["model"] = settings["model"]
+    tuned["whisper"]["beam_size"] = settings["beam_size"]
+    if settings.get("cpu_threads"):
+        tuned["whisper"]["cpu_threads"] = settings["cpu_threads"]
+    tuned["compute"] = dict(tuned.get("compute", DEFAULT_COMPUTE_TYPES))
+    tuned["compute"][device] = settings["compute_type"]
+    return tuned
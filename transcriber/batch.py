@@ -0,0 +1,225 @@
+import os
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from utils.audio_file import AudioFile, WHISPER_SAMPLE_RATE
+from utils.vad import create_vad
+from transcriber.inference_worker import WorkerModel
+from transcriber.scheduler import BATCH
+
+# Frame scores are computed this many samples at a time
+VAD_BLOCK_SIZE = 10 * 60 * WHISPER_SAMPLE_RATE
+# The batched pipeline decodes every clip as a single 30 s window
+MAX_BATCHED_LENGTH = 30 * WHISPER_SAMPLE_RATE
+
+_worker_model = None
+
+# Imported on first use, like WhisperModel in audio_transcriber
+BatchedInferencePipeline = None
+
+def _pipeline_class():
+    global BatchedInferencePipeline
+    if BatchedInferencePipeline is None:
+        from faster_whisper import BatchedInferencePipeline
+    return BatchedInferencePipeline
+
+def can_batch(pieces):
+    return len(pieces) > 1 and all(len(piece) <= MAX_BATCHED_LENGTH for piece in pieces)
+
+def transcribe_batched(model, pieces, options, batch_size):
+    """Transcribe audio pieces of at most 30 s in one batched call.
+
+    The pieces are decoded as clips of one concatenated signal, so that
+    faster-whisper's BatchedInferencePipeline runs up to batch_size of them
+    through the encoder and decoder together. Returns one list of
+    (start, end, text) per piece, in piece order, with times relative to
+    the piece.
+    """
+    if isinstance(model, WorkerModel):
+        # The pipeline runs next to the model, in the worker process
+        return model.transcribe_batched(pieces, options, batch_size)
+    bounds = np.cumsum([0] + [len(piece) for piece in pieces])
+    # The pipeline takes clip bounds in seconds and slices at int(seconds * 16000);
+    # half a sample over each bound makes that land on it exactly
+    seconds = (bounds + 0.5) / WHISPER_SAMPLE_RATE
+    clips = [{"start": float(start), "end": float(end)} for start, end in zip(seconds[:-1], seconds[1:])]
+    pipeline = _pipeline_class()(model=model)
+    segments, info = pipeline.transcribe(np.concatenate(pieces), batch_size=batch_size,
+                                         clip_timestamps=clips, **options)
+
+    starts = bounds[:-1] / WHISPER_SAMPLE_RATE
+    results = [[] for _ in pieces]
+    for segment in segments:
+        text = segment.text.strip()
+        if not text:
+            continue
+        # Timestamps are rounded; a segment belongs to the clip it starts in
+        index = max(0, int(np.searchsorted(starts, segment.start + 0.01, side="right")) - 1)
+        offset = starts[index]
+        results[index].append((segment.start - offset, segment.end - offset, text))
+    return results
+
+def _init_worker(model_name, device, compute_type):
+    global _worker_model
+    from faster_whisper import WhisperModel
+    _worker_model = WhisperModel(model_name, device=device, compute_type=compute_type)
+
+def _decode_piece(model, source, start, end, options):
+    """Transcribe samples [start, end) of a file path or array"""
+    if isinstance(source, str):
+        audio = AudioFile(source).read(start, end)
+    else:
+        audio = source
+    offset = start / WHISPER_SAMPLE_RATE
+    segments, info = model.transcribe(audio, **options)
+    return [(offset + segment.start, offset + segment.end, segment.text.strip())
+            for segment in segments if segment.text.strip()]
+
+def _decode_piece_in_worker(source, start, end, options):
+    return _decode_piece(_worker_model, source, start, end, options)
+
+def plan_pieces(segments, scores, frame_size, max_length):
+    """Pack speech segments into pieces of at most max_length samples.
+
+    Neighbouring segments share a piece while they fit, since Whisper pads
+    every input to 30 seconds anyway. Longer segments are cut at the
+    quietest frame in the last quarter of each piece.
+    """
+    pieces = []
+    for start, end in segments:
+        while end - start > max_length:
+            search_start = start + max_length - max_length // 4
+            first = search_start // frame_size
+            last = (start + max_length) // frame_size
+            cut = start + max_length
+            if last > first and len(scores[first:last]):
+                cut = (first + int(np.argmin(scores[first:last]))) * frame_size
+            pieces.append((start, cut))
+            start = cut
+        if pieces and end - pieces[-1][0] <= max_length:
+            pieces[-1] = (pieces[-1][0], end)
+        else:
+            pieces.append((start, end))
+    return pieces
+
+class BatchTranscriber:
+    """Transcribes audio files with the server's model or a process pool.
+
+    With batch.workers set to 0 the already loaded model is used. Otherwise
+    each worker process loads its own model replica once and keeps it for
+    later jobs.
+    """
+
+    def __init__(self, transcriber):
+        self.transcriber = transcriber
+        self.config = transcriber.config
+        self.vad = create_vad(self.config, sample_rate=WHISPER_SAMPLE_RATE)
+        batch = self.config.get("batch", {})
+        self.workers = batch.get("workers", 0)
+        self.output_format = batch.get("format", "jsonl")
+        self.max_piece_length = int(min(self.config["audio"]["chunk_duration"], 30) * WHISPER_SAMPLE_RATE)
+        batch_decode = self.config["processing"].get("batch_decode", {})
+        self.batch_size = batch_decode.get("batch_size", 8) if batch_decode.get("enabled", False) else 1
+        self._pool = None
+
+    def _options(self):
+        return {
+            "language": self.config["whisper"]["language"],
+            "task": self.config["whisper"]["task"],
+            "beam_size": self.config["whisper"].get("beam_size", 5)
+        }
+
+    def _get_pool(self):
+        if self._pool is None:
+            model_name, compute_type = self.transcriber.registry.resolve(self.transcriber.model_name)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, self.transcriber._device, compute_type)
+            )
+        return self._pool
+
+    def plan(self, audio_file):
+        """Speech pieces of a file, found without loading it all at once"""
+        frame_size = self.vad.frame_size
+        block = VAD_BLOCK_SIZE - VAD_BLOCK_SIZE % frame_size
+        scores = np.concatenate([self.vad.scores(audio_file.read(start, start + block))
+                                 for start in range(0, len(audio_file), block)] or [np.zeros(0)])
+        segments = self.vad.segments_from_scores(scores, len(audio_file))
+        return plan_pieces(segments, scores, frame_size, self.max_piece_length)
+
+    def transcribe_file(self, path):
+        """List of (start, end, text) segments for one file"""
+        audio_file = AudioFile(path)
+        pieces = self.plan(audio_file)
+        options = self._options()
+
+        if self.workers == 0:
+            self.transcriber.model_ready.wait()
+            if self.transcriber.model_error:
+                raise RuntimeError(f"Model failed to load: {self.transcriber.model_error}")
+            model = self.transcriber.get_model()
+            groups = [pieces[first:first + self.batch_size] for first in range(0, len(pieces), self.batch_size)]
+            # With whisper.num_workers above 1 the model decodes several groups at once.
+            # Live recordings go first and files take turns, a group at a time
+            pool = self.transcriber.decode_pool
+            if pool is not None:
+                futures = [pool.submit(self._decode_group, model, audio_file, group, options,
+                                       priority=BATCH, session=path) for group in groups]
+                results = [piece for future in futures for piece in future.result()]
+            else:
+                results = [piece for group in groups
+                           for piece in self._decode_group(model, audio_file, group, options)]
+        else:
+            pool = self._get_pool()
+            # Workers map WAV files themselves; decoded audio has to be sent over
+            futures = [pool.submit(_decode_piece_in_worker,
+                                   path if audio_file.memory_mapped else audio_file.read(start, end),
+                                   start, end, options)
+                       for start, end in pieces]
+            results = [future.result() for future in futures]
+
+        return [segment for piece in results for segment in piece]
+
+    def _decode_group(self, model, audio_file, group, options):
+        """Segments of each piece in group, decoded in one batch where possible"""
+        audio = [audio_file.read(start, end) for start, end in group]
+        if not can_batch(audio):
+            return [_decode_piece(model, piece, start, end, options) for piece, (start, end) in zip(audio, group)]
+        decoded = transcribe_batched(model, audio, options, self.batch_size)
+        return [[(start / WHISPER_SAMPLE_RATE + segment_start, start / WHISPER_SAMPLE_RATE + segment_end, text)
+                 for segment_start, segment_end, text in segments]
+                for (start, _), segments in zip(group, decoded)]
+
+    def write_output(self, path, segments, output_format, output_dir=None):
+        base = os.path.splitext(os.path.basename(path))[0]
+        directory = output_dir or os.path.dirname(path)
+        output_path = os.path.join(directory, f"{base}.{'jsonl' if output_format == 'jsonl' else 'txt'}")
+        with open(output_path, "w") as f:
+            if output_format == "jsonl":
+                for start, end, text in segments:
+                    f.write(json.dumps({"start": round(start, 3), "end": round(end, 3), "text": text}) + "\n")
+            else:
+                f.write(" ".join(text for _, _, text in segments) + "\n")
+        return output_path
+
+    def transcribe_files(self, paths, output_format=None, output_dir=None):
+        """Transcribe each file and write its output; one result dict per file"""
+        output_format = output_format or self.output_format
+        results = []
+        for path in paths:
+            try:
+                segments = self.transcribe_file(path)
+                output = self.write_output(path, segments, output_format, output_dir)
+                results.append({"file": path, "output": output, "segments": len(segments)})
+            except Exception as e:
+                results.append({"file": path, "error": str(e)})
+        return results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
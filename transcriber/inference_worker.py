@@ -0,0 +1,184 @@
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+import numpy as np
+
+from utils.ring_buffer import RingBuffer, shared_array
+
+# Spawned rather than forked: the server process runs PortAudio and asyncio threads
+_context = multiprocessing.get_context("spawn")
+
+# Shared blocks a worker keeps mapped; the capture ring and a staging block are in use at a time
+MAX_ATTACHED_BLOCKS = 4
+
+class WorkerError(RuntimeError):
+    """The worker process died or did not answer in time and was restarted"""
+
+def _load_whisper(name, **options):
+    from faster_whisper import WhisperModel
+    return WhisperModel(name, **options)
+
+def _segment_dict(segment):
+    words = getattr(segment, "words", None)
+    return {
+        "start": segment.start, "end": segment.end, "text": segment.text,
+        "words": [{"start": word.start, "end": word.end, "word": word.word,
+                   "probability": getattr(word, "probability", None)} for word in words]
+                 if words is not None else None
+    }
+
+def _segment(data):
+    words = data.pop("words")
+    return SimpleNamespace(words=[SimpleNamespace(**word) for word in words] if words is not None else None,
+                           **data)
+
+def _decode(model, kind, audio, options):
+    if kind == "batched":
+        from transcriber.batch import transcribe_batched
+        return transcribe_batched(model, audio, options["options"], options["batch_size"])
+    segments, info = model.transcribe(audio[0], **options)
+    return ([_segment_dict(segment) for segment in segments],
+            {"duration": getattr(info, "duration", None), "language": getattr(info, "language", None)})
+
+def _serve(connection, factory, name, options):
+    """Worker process: load the model, then answer decode requests until the pipe closes"""
+    try:
+        model = factory(name, **options)
+    except Exception as e:
+        connection.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    connection.send(("ready", None))
+
+    blocks = {}
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        kind, pieces, options = request
+        try:
+            audio = []
+            for block_name, offset, length in pieces:
+                if block_name not in blocks:
+                    if len(blocks) >= MAX_ATTACHED_BLOCKS:
+                        # Blocks the server has replaced
+                        try:
+                            blocks.pop(next(iter(blocks))).close()
+                        except BufferError:
+                            pass
+                    blocks[block_name] = shared_memory.SharedMemory(name=block_name)
+                audio.append(np.ndarray(length, dtype=np.float32, buffer=blocks[block_name].buf,
+                                        offset=offset * 4))
+            result = _decode(model, kind, audio, options)
+            audio = None
+            connection.send(("ok", result))
+        except Exception as e:
+            connection.send(("error", f"{type(e).__name__}: {e}"))
+
+class WorkerModel:
+    """A Whisper model running in a worker process.
+
+    transcribe() takes the arguments of WhisperModel.transcribe and returns
+    the decoded segments. Audio is not sent over the pipe: samples that lie
+    in a shared RingBuffer, such as the capture ring, are passed by offset,
+    and other audio is copied into a shared staging block. If the worker
+    dies or a decode takes longer than decode_timeout seconds, the worker is
+    killed and started again; that call raises WorkerError and later calls
+    go to the new worker once it has loaded the model. The server process
+    and its capture keep running throughout.
+    """
+
+    def __init__(self, name, decode_timeout=120, factory=_load_whisper, **options):
+        self.name = name
+        self.decode_timeout = decode_timeout
+        self.factory = factory
+        self.options = options
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._staging = None
+        self._start()
+        self._wait_ready()
+
+    def _start(self):
+        self._connection, child = _context.Pipe()
+        self._process = _context.Process(target=_serve, args=(child, self.factory, self.name, self.options),
+                                         name=f"skald-worker-{self.name}", daemon=True)
+        self._process.start()
+        child.close()
+        self._ready = False
+
+    def _wait_ready(self):
+        if self._ready:
+            return
+        try:
+            status, message = self._connection.recv()
+        except EOFError:
+            status, message = "error", "worker exited while loading the model"
+        if status != "ready":
+            self.close()
+            raise RuntimeError(f"Could not load {self.name} in the worker: {message}")
+        self._ready = True
+
+    def restart(self, reason):
+        """Replace the worker process; the new one loads the model in the background"""
+        self.restarts += 1
+        print(f"Warning: Restarting inference worker for {self.name}: {reason}")
+        self._process.kill()
+        self._process.join()
+        self._connection.close()
+        self._start()
+
+    def _stage(self, pieces):
+        """(block, offset, length) of each piece, copying those outside shared rings"""
+        located = [RingBuffer.locate(piece) for piece in pieces]
+        needed = sum(len(piece) for piece, location in zip(pieces, located) if location is None)
+        if needed and (self._staging is None or len(self._staging) < needed):
+            self._staging, self._staging_name = shared_array(max(needed, 30 * 16000))
+        blocks, offset = [], 0
+        for piece, location in zip(pieces, located):
+            if location is None:
+                self._staging[offset:offset + len(piece)] = piece
+                location = (self._staging_name, offset)
+                offset += len(piece)
+            blocks.append((*location, len(piece)))
+        return blocks
+
+    def _request(self, kind, pieces, options):
+        pieces = [np.ascontiguousarray(piece, dtype=np.float32) for piece in pieces]
+        with self._lock:
+            if not self._process.is_alive():
+                self.restart(f"exited with code {self._process.exitcode}")
+            self._wait_ready()
+            try:
+                self._connection.send((kind, self._stage(pieces), options))
+                if not self._connection.poll(self.decode_timeout):
+                    raise TimeoutError(f"no result after {self.decode_timeout}s")
+                status, result = self._connection.recv()
+            except (TimeoutError, EOFError, OSError) as e:
+                reason = str(e) or "the worker exited"
+                self.restart(reason)
+                raise WorkerError(f"Decode failed, inference worker restarted: {reason}")
+        if status != "ok":
+            raise RuntimeError(result)
+        return result
+
+    def transcribe(self, audio, **options):
+        segments, info = self._request("transcribe", [audio], options)
+        return [_segment(segment) for segment in segments], SimpleNamespace(**info)
+
+    def transcribe_batched(self, pieces, options, batch_size):
+        """transcriber.batch.transcribe_batched, run in the worker"""
+        return self._request("batched", pieces, {"options": options, "batch_size": batch_size})
+
+    def close(self):
+        self._process.kill()
+        self._process.join()
+        self._connection.close()
+
+    def __del__(self):
+        # Models dropped from the registry take their worker with them
+        if getattr(self, "_process", None) is not None:
+            self.close()
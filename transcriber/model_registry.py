@@ -0,0 +1,115 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Bytes per weight relative to the float16 weights CTranslate2 models ship with
+_QUANTIZATION_FACTORS = {
+    "int8": 0.5,
+    "int8_float16": 0.5,
+    "int8_float32": 0.5,
+    "int8_bfloat16": 0.5,
+    "int16": 1.0,
+    "float16": 1.0,
+    "bfloat16": 1.0,
+    "float32": 2.0
+}
+
+def _model_dir(name):
+    """Local directory of a model path or an already downloaded hub model"""
+    if os.path.isdir(name):
+        return name
+    try:
+        from faster_whisper.utils import download_model
+        return download_model(name, local_files_only=True)
+    except Exception:
+        return None
+
+def estimate_model_size(name, compute_type):
+    """Approximate resident bytes of a loaded model; 0 if unknown"""
+    directory = _model_dir(name)
+    if directory is None:
+        return 0
+    weights = os.path.join(directory, "model.bin")
+    if not os.path.exists(weights):
+        return 0
+    return int(os.path.getsize(weights) * _QUANTIZATION_FACTORS.get(compute_type, 1.0))
+
+class ModelRegistry:
+    """Loaded Whisper models, least recently used first.
+
+    Models are keyed by name (any faster-whisper size, Hugging Face
+    CTranslate2 repository or local directory) and compute type. Names
+    may be aliases from whisper.models.aliases. When memory_budget_mb is
+    set, the least recently used models are dropped before loading one
+    that would not fit; the model being loaded is always kept, and so are
+    the models pinned() returns, since dropping a model still in use
+    frees nothing and would only load it a second time.
+    """
+
+    def __init__(self, config, loader, compute_type, pinned=lambda: ()):
+        self.loader = loader
+        self.compute_type = compute_type
+        self.pinned = pinned
+        self._models = OrderedDict()  # (name, compute_type) -> (model, size)
+        self._lock = threading.Lock()
+        self.update(config)
+
+    def update(self, config):
+        """Take aliases and the memory budget from a new config, keeping loaded models"""
+        models = config["whisper"].get("models", {})
+        with self._lock:
+            self.aliases = models.get("aliases", {})
+            self.memory_budget = int(models.get("memory_budget_mb", 0) * 1024 * 1024)
+            if self.memory_budget:
+                self._evict(self.memory_budget, keep=1)
+
+    def resolve(self, name, compute_type=None):
+        """(model name or path, compute type) for a name or alias; compute_type overrides the configured one"""
+        alias = self.aliases.get(name, name)
+        if isinstance(alias, dict):
+            return alias["model"], compute_type or alias.get("compute_type", self.compute_type)
+        return alias, compute_type or self.compute_type
+
+    def get(self, name, compute_type=None):
+        """The loaded model for name, loading it if needed"""
+        key = self.resolve(name, compute_type)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+
+            size = estimate_model_size(*key)
+            if self.memory_budget:
+                self._evict(self.memory_budget - size, keep=0)
+            model = self.loader(*key)
+            # Hub models can only be sized once they are downloaded
+            size = size or estimate_model_size(*key)
+            self._models[key] = (model, size)
+            if self.memory_budget:
+                self._evict(self.memory_budget, keep=1)
+            return model
+
+    def discard(self, name, compute_type=None):
+        """Drop a loaded model; it is freed once nothing else uses it"""
+        with self._lock:
+            self._models.pop(self.resolve(name, compute_type), None)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def _evict(self, budget, keep):
+        pinned = {id(model) for model in self.pinned() if model is not None}
+        for key in list(self._models)[:max(0, len(self._models) - keep)]:
+            if self.resident_bytes() <= budget:
+                break
+            if id(self._models[key][0]) not in pinned:
+                del self._models[key]
+
+    def resident_bytes(self):
+        return sum(size for _, size in self._models.values())
+
+    def loaded(self):
+        """Loaded models, most recently used last"""
+        return [{"model": name, "compute_type": compute_type, "size_mb": round(size / (1024 * 1024))}
+                for (name, compute_type), (_, size) in self._models.items()]
@@ -0,0 +1,215 @@
+import time
+import queue
+import socket
+import shutil
+import platform
+import threading
+import subprocess
+import pyperclip
+
+from utils.protocol import encode_message
+
+# Ctrl+V for Wayland (ydotool, wtype) and X11 (xdotool), in order of preference
+PASTE_COMMANDS = [
+    ("ydotool", ["ydotool", "key", "29:1", "47:1", "47:0", "29:0"]),
+    ("wtype", ["wtype", "-M", "ctrl", "-P", "v", "-m", "ctrl"]),
+    ("xdotool", ["xdotool", "key", "ctrl+v"])
+]
+DEFAULT_SINKS = ["clipboard", "paste"]
+DEFAULT_DEBOUNCE_MS = 250
+PASTE_TIMEOUT = 5.0
+
+def find_paste_command():
+    """Command that pastes into the focused window, or None"""
+    if platform.system() != 'Linux':
+        return None
+    for tool, command in PASTE_COMMANDS:
+        if shutil.which(tool):
+            return command
+    return None
+
+def clipboard_available():
+    """True if the clipboard can be read; its contents are left alone"""
+    try:
+        pyperclip.paste()
+        return True
+    except Exception:
+        return False
+
+class Sink:
+    """Receives transcripts on the output thread, where it may block"""
+
+    name = "sink"
+
+    def progress(self, text):
+        """Text so far of a recording in progress"""
+
+    def final(self, text, refining):
+        """Text of a finished recording; with refining, a refined text follows"""
+
+    def refined(self, text, draft):
+        """Refined text replacing the draft of the last recording"""
+
+class ClipboardSink(Sink):
+    name = "clipboard"
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def _copy(self, text):
+        copy_start = time.perf_counter()
+        pyperclip.copy(text)
+        self.metrics.observe("clipboard_seconds", time.perf_counter() - copy_start)
+
+    def progress(self, text):
+        self._copy(text)
+
+    def final(self, text, refining):
+        self._copy(text)
+
+    def refined(self, text, draft):
+        # Leave the clipboard alone if something else was copied since
+        if text != draft and pyperclip.paste() == draft:
+            self._copy(text)
+
+class PasteSink(Sink):
+    """Pastes final texts; follows the clipboard sink, which copies them first"""
+
+    name = "paste"
+
+    def __init__(self, command, metrics):
+        self.command = command
+        self.metrics = metrics
+
+    def final(self, text, refining):
+        paste_start = time.perf_counter()
+        try:
+            subprocess.run(self.command, check=True, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.PIPE, text=True, timeout=PASTE_TIMEOUT)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"{self.command[0]} failed: {e.stderr.strip()}")
+        finally:
+            self.metrics.observe("paste_seconds", time.perf_counter() - paste_start)
+
+class FileSink(Sink):
+    """Appends one line per recording; drafts are replaced by their refined text"""
+
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+
+    def _append(self, text):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    def final(self, text, refining):
+        if not refining:
+            self._append(text)
+
+    def refined(self, text, draft):
+        self._append(text)
+
+class SocketSink(Sink):
+    """Pushes transcripts as protocol messages to a listening Unix socket"""
+
+    name = "socket"
+
+    def __init__(self, path, timeout=1.0):
+        self.path = path
+        self.timeout = timeout
+
+    def _send(self, message):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            sock.sendall(encode_message(message))
+
+    def progress(self, text):
+        self._send({"event": "progress", "text": text})
+
+    def final(self, text, refining):
+        self._send({"event": "final", "text": text, "refining": refining})
+
+    def refined(self, text, draft):
+        self._send({"event": "refined", "text": text, "draft": draft})
+
+class OutputPipeline:
+    """Delivers transcripts to sinks on a thread of its own.
+
+    Decoding only queues transcripts, so slow clipboard and paste tools
+    never hold it up. Progress updates are debounced: the first one is
+    delivered at once and later ones at most every debounce seconds, each
+    replacing the one still waiting. A final text drops waiting progress.
+    Sinks run in order, so the clipboard is set before a paste.
+    """
+
+    def __init__(self, sinks, debounce=DEFAULT_DEBOUNCE_MS / 1000, on_error=None):
+        self.sinks = sinks
+        self.debounce = debounce
+        self.on_error = on_error
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def progress(self, text):
+        self._queue.put(("progress", (text,)))
+
+    def final(self, text, refining=False):
+        self._queue.put(("final", (text, refining)))
+
+    def refined(self, text, draft):
+        self._queue.put(("refined", (text, draft)))
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is delivered; True if it was"""
+        done = threading.Event()
+        self._queue.put(("flush", (done,)))
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        """Deliver what is queued and stop the output thread"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _deliver(self, kind, args):
+        for sink in list(self.sinks):
+            try:
+                getattr(sink, kind)(*args)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(sink, e)
+
+    def _run(self):
+        waiting = None
+        last_progress = float("-inf")
+        while True:
+            timeout = None
+            if waiting is not None:
+                timeout = max(0.0, last_progress + self.debounce - time.perf_counter())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._deliver("progress", (waiting,))
+                waiting, last_progress = None, time.perf_counter()
+                continue
+
+            if item is None:
+                return
+            kind, args = item
+            if kind == "progress":
+                if waiting is None and time.perf_counter() - last_progress >= self.debounce:
+                    self._deliver("progress", args)
+                    last_progress = time.perf_counter()
+                else:
+                    waiting = args[0]
+            elif kind == "flush":
+                if waiting is not None:
+                    self._deliver("progress", (waiting,))
+                    waiting = None
+                args[0].set()
+            else:
+                if kind == "final":
+                    # Superseded by the final text
+                    waiting = None
+                self._deliver(kind, args)
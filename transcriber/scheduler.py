@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+# Decode priorities, most urgent first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITIES = (INTERACTIVE, BATCH)
+
+class InferenceScheduler:
+    """Runs model calls on a fixed number of threads, most urgent first.
+
+    Live decodes of recordings are INTERACTIVE and always start before
+    BATCH work such as file jobs and refinement. Within a priority every
+    session has a queue of its own and sessions take turns, so one long
+    stream or file cannot starve the others. Running calls are never
+    interrupted; batch work is submitted in pieces, so an interactive
+    decode waits for at most one piece per worker.
+
+    submit() returns a concurrent.futures.Future like an executor does.
+    """
+
+    def __init__(self, workers=1):
+        self._condition = threading.Condition()
+        # priority -> session -> deque of (future, fn, args)
+        self._queues = {priority: OrderedDict() for priority in PRIORITIES}
+        self._threads = []
+        self._workers = 0
+        self._running = 0
+        self._shutdown = False
+        self.set_workers(workers)
+
+    def set_workers(self, workers):
+        """Change how many calls run at a time; surplus threads finish their call first"""
+        with self._condition:
+            self._workers = max(1, workers)
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while self._running < self._workers:
+                thread = threading.Thread(target=self._run, name="decode", daemon=True)
+                self._threads.append(thread)
+                self._running += 1
+                thread.start()
+            self._condition.notify_all()
+
+    @property
+    def workers(self):
+        return self._workers
+
+    def submit(self, fn, *args, priority=INTERACTIVE, session=None):
+        future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new calls after shutdown")
+            self._queues[priority].setdefault(session, deque()).append((future, fn, args))
+            self._condition.notify()
+        return future
+
+    def queued(self, priority=None):
+        """Calls waiting to start, at one priority or all"""
+        with self._condition:
+            priorities = PRIORITIES if priority is None else (priority,)
+            return sum(len(jobs) for p in priorities for jobs in self._queues[p].values())
+
+    def _next(self):
+        """The next call to run; called with the condition held"""
+        for priority in PRIORITIES:
+            sessions = self._queues[priority]
+            if sessions:
+                session, jobs = next(iter(sessions.items()))
+                job = jobs.popleft()
+                # The session goes to the back of the line, or out of it when it has nothing left
+                del sessions[session]
+                if jobs:
+                    sessions[session] = jobs
+                return job
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._running > self._workers:
+                        self._running -= 1
+                        return
+                    job = self._next()
+                    if job is not None:
+                        break
+                    if self._shutdown:
+                        self._running -= 1
+                        return
+                    self._condition.wait()
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self, wait=True):
+        """Run what is queued, then stop the threads"""
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                if thread is not threading.current_thread():
+                    thread.join()
@@ -0,0 +1,101 @@
+import copy
+
+from validators.config_validator import ConfigValidator
+from utils.config_loader import ConfigLoader
+from transcriber.audio_transcriber import AudioTranscriber
+from transcriber.output import OutputPipeline, ClipboardSink, PasteSink, DEFAULT_DEBOUNCE_MS
+
+# Settings a session may set for itself; everything else comes from the server's config
+SESSION_SETTINGS = ("audio.device", "audio.source", "audio.sample_rate", "audio.channels",
+                    "audio.silence_threshold", "audio.silence_duration", "audio.max_duration", "audio.vad",
+                    "audio.start_tone", "whisper.language", "whisper.task", "whisper.beam_size",
+                    "processing.streaming", "processing.output", "processing.auto_paste")
+# State of the transcriber a session reads and updates rather than keeping its own
+SHARED_ATTRIBUTES = frozenset([
+    "model", "model_name", "model_state", "model_ready", "model_error", "model_load_time", "warmup_time",
+    "registry", "decode_pool", "num_workers", "metrics", "listeners", "last_used", "clipboard_available",
+    "paste_command", "_device", "_compute_type", "_idle_compute_type", "_swap_thread"
+])
+
+def _merge(config, overrides):
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            _merge(config[key], value)
+        else:
+            config[key] = value
+
+def session_config(config, overrides=None):
+    """Copy of config with a session's overrides applied; ValueError if they are not allowed"""
+    if not overrides:
+        return config
+    if not isinstance(overrides, dict):
+        raise ValueError("config overrides must be an object")
+    merged = copy.deepcopy(config)
+    _merge(merged, overrides)
+    for name in ConfigLoader.changed_settings(config, merged):
+        if not any(name == setting or name.startswith(setting + ".") for setting in SESSION_SETTINGS):
+            raise ValueError(f"{name} cannot be set per session")
+    ConfigValidator.validate_config(merged)
+    return merged
+
+class Session(AudioTranscriber):
+    """A recording next to others on the same server.
+
+    A session has its own capture ring, queue, VAD and config overrides,
+    and uses the transcriber's loaded models, scheduler, metrics and
+    listeners; a model swap or offload applies to every session alike.
+    Its events carry its id, and its decodes take turns with those of
+    other sessions in the scheduler. Transcripts go to the transcriber's
+    output unless the overrides change processing.output or auto_paste.
+    Without desktop they never reach this machine's clipboard or focused
+    window; audio sent by a client comes back to it as events instead.
+    """
+
+    def __init__(self, transcriber, session_id, overrides=None, client=None, desktop=True):
+        object.__setattr__(self, "parent", transcriber)
+        self.config = session_config(transcriber.config, overrides)
+        self.session_id = session_id
+        self.client = client
+        self._configure_capture()
+        self._init_recording_state()
+        self._processing_complete = True
+
+        changed = ConfigLoader.changed_settings(transcriber.config, self.config)
+        self._own_output = not desktop or any(name.startswith(("processing.output", "processing.auto_paste"))
+                                              for name in changed)
+        if self._own_output:
+            if desktop:
+                self._check_autopaste()
+            sinks = self._create_sinks()
+            if not desktop:
+                sinks = [sink for sink in sinks if not isinstance(sink, (ClipboardSink, PasteSink))]
+            output = self.config["processing"].get("output", {})
+            self.output = OutputPipeline(sinks,
+                                         output.get("debounce_ms", DEFAULT_DEBOUNCE_MS) / 1000,
+                                         on_error=self._output_failed)
+        self.recorders.append(self)
+
+    def __getattr__(self, name):
+        # Only reached for attributes the session does not have itself
+        if name == "parent":
+            raise AttributeError(name)
+        return getattr(self.parent, name)
+
+    def __setattr__(self, name, value):
+        if name in SHARED_ATTRIBUTES:
+            setattr(self.parent, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def _emit(self, event, **data):
+        super()._emit(event, session=self.session_id, **data)
+
+    def busy(self):
+        """True while the session may still decode or deliver text"""
+        return self._idle_busy()
+
+    def close(self):
+        if self in self.recorders:
+            self.recorders.remove(self)
+        if self._own_output:
+            self.output.close()
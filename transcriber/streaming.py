@@ -0,0 +1,70 @@
+import re
+
+def _normalize(text):
+    return re.sub(r"[^\w']", "", text.lower())
+
+class HypothesisBuffer:
+    """Commits words once two consecutive decoding passes agree on them.
+
+    Words are (start, end, text) tuples with times in seconds from the start
+    of the recording. Each pass over the uncommitted window is insert()ed,
+    then flush() commits the longest prefix shared with the previous pass.
+    """
+
+    def __init__(self, max_overlap_words=5):
+        self.max_overlap_words = max_overlap_words
+        self.committed = []
+        self.previous = []
+        self.current = []
+
+    @property
+    def last_committed_end(self):
+        return self.committed[-1][1] if self.committed else 0.0
+
+    def insert(self, words):
+        """Record a new hypothesis, dropping words already committed"""
+        last_end = self.last_committed_end
+        words = [w for w in words if w[0] > last_end - 0.1]
+
+        # The decoder often repeats the last committed words at the window edge
+        if words and self.committed and abs(words[0][0] - last_end) < 1:
+            for n in range(min(len(self.committed), len(words), self.max_overlap_words), 0, -1):
+                tail = [_normalize(w[2]) for w in self.committed[-n:]]
+                head = [_normalize(w[2]) for w in words[:n]]
+                if tail == head:
+                    words = words[n:]
+                    break
+
+        self.current = words
+
+    def flush(self):
+        """Commit and return the words both latest passes agree on"""
+        agreed = []
+        for prev, new in zip(self.previous, self.current):
+            if _normalize(prev[2]) != _normalize(new[2]):
+                break
+            agreed.append(new)
+
+        self.committed.extend(agreed)
+        self.previous = self.current[len(agreed):]
+        self.current = []
+        return agreed
+
+    def commit_pending(self):
+        """Commit the latest hypothesis without waiting for agreement"""
+        pending = self.current or self.previous
+        self.committed.extend(pending)
+        self.previous = []
+        self.current = []
+        return pending
+
+    def text(self):
+        return " ".join(w[2] for w in self.committed)
+
+    def prompt(self, max_chars=200):
+        return self.text()[-max_chars:]
+
+    def reset(self):
+        self.committed = []
+        self.previous = []
+        self.current = []
@@ -1,9 +1,23 @@
-from .config_loader import ConfigLoader
-from .device_manager import DeviceManager
-from .audio_manager import AudioManager
+import importlib
 
-__all__ = [
-    'ConfigLoader',
-    'DeviceManager',
-    'AudioManager'
-]
+# Exports are imported on first use, so light entry points such as the
+# client don't pay for numpy and PortAudio when importing one submodule
+_EXPORTS = {
+    'ConfigLoader': '.config_loader',
+    'DeviceManager': '.device_manager',
+    'AudioManager': '.audio_manager',
+    'RingBuffer': '.ring_buffer',
+    'VoiceActivityDetector': '.vad',
+    'EnergyVAD': '.vad',
+    'create_vad': '.vad',
+    'AudioFile': '.audio_file',
+    'Metrics': '.metrics',
+    'Histogram': '.metrics'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,102 @@
+import struct
+import numpy as np
+from .resampler import Resampler
+
+WHISPER_SAMPLE_RATE = 16000
+
+# (format tag, bits per sample) -> (dtype, scale to [-1, 1])
+_PCM_TYPES = {
+    (1, 16): ("<i2", 1 / 32768),
+    (1, 32): ("<i4", 1 / 2147483648),
+    (3, 32): ("<f4", 1.0)
+}
+
+def _open_wav(path):
+    """Memory-map the data chunk of a PCM or float WAV file, or None if unsupported"""
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = struct.unpack("<4sI", chunk)
+            if chunk_id == b"fmt ":
+                fmt = f.read(size)
+                if size & 1:
+                    f.seek(1, 1)
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), 1)
+
+    if fmt is None or len(fmt) < 16:
+        return None
+    format_tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == 0xFFFE and len(fmt) >= 26:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+    if (format_tag, bits) not in _PCM_TYPES:
+        return None
+
+    dtype, scale = _PCM_TYPES[(format_tag, bits)]
+    file_size = _file_size(path)
+    # Streaming writers leave the data size unset
+    size = min(size, file_size - offset)
+    frames = size // block_align
+    if frames == 0:
+        return np.zeros((0, channels), dtype=dtype), sample_rate, scale
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+    return data, sample_rate, scale
+
+def _file_size(path):
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        return f.tell()
+
+class AudioFile:
+    """An audio file read as 16 kHz mono float32 slices.
+
+    PCM/float WAV files are memory-mapped, so only the slices that are read
+    are ever loaded; other sample rates are resampled slice by slice.
+    Anything else is decoded up front with faster-whisper's decoder.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._resampler = None
+        wav = _open_wav(path)
+        if wav is not None:
+            self._data, sample_rate, self._scale = wav
+            if sample_rate != WHISPER_SAMPLE_RATE:
+                self._resampler = Resampler(sample_rate, WHISPER_SAMPLE_RATE)
+            self.memory_mapped = True
+        else:
+            from faster_whisper import decode_audio
+            self._data = decode_audio(path, sampling_rate=WHISPER_SAMPLE_RATE)[:, None]
+            self._scale = 1.0
+            self.memory_mapped = False
+
+    def __len__(self):
+        if self._resampler is not None:
+            return self._resampler.output_length(len(self._data))
+        return len(self._data)
+
+    @property
+    def duration(self):
+        return len(self) / WHISPER_SAMPLE_RATE
+
+    def _read_native(self, start, end):
+        block = self._data[start:end]
+        audio = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+        if self._scale != 1.0 or audio.dtype != np.float32:
+            audio = audio.astype(np.float32) * np.float32(self._scale)
+        return audio
+
+    def read(self, start=0, end=None):
+        if self._resampler is None:
+            return self._read_native(start, end)
+        end = len(self) if end is None else min(end, len(self))
+        return self._resampler.resample_range(self._read_native, len(self._data), start, end)
@@ -1,16 +1,18 @@
-import sounddevice as sd
 import numpy as np
 import time
 
 class AudioManager:
     _initialized = False
     _default_input = None
+    _tone_cache = {}
     
     @classmethod
     def initialize_audio(cls):
         if cls._initialized:
             return cls._default_input
             
+        # Imported here so file and synthetic capture sources run without PortAudio
+        import sounddevice as sd
         try:
             devices = sd.query_devices()
             cls._default_input = sd.query_devices(kind='input')
@@ -21,25 +23,34 @@ class AudioManager:
         except sd.PortAudioError as e:
             raise RuntimeError(f"Audio device initialization failed: {e}")
 
-    @staticmethod
-    def play_start_tone(config):
+    @classmethod
+    def get_start_tone(cls, config):
+        """Build the start tone once per tone configuration"""
+        tone_config = config["audio"]["start_tone"]
+        sample_rate = config["audio"]["sample_rate"]
+        key = (sample_rate, tone_config["frequency"], tone_config["duration"],
+               tone_config.get("fade_ms", 5))
+        if key not in cls._tone_cache:
+            t = np.linspace(0, tone_config["duration"]/1000,
+                          int(sample_rate * tone_config["duration"]/1000))
+            tone = np.sin(2 * np.pi * tone_config["frequency"] * t).astype(np.float32)
+
+            fade_len = int(key[3] * sample_rate / 1000)
+            if fade_len:
+                tone[:fade_len] *= np.linspace(0, 1, fade_len)
+                tone[-fade_len:] *= np.linspace(1, 0, fade_len)
+            cls._tone_cache[key] = tone
+        return cls._tone_cache[key]
+
+    @classmethod
+    def play_start_tone(cls, config, blocking=True):
         tone_config = config["audio"]["start_tone"]
         if not tone_config.get("enabled", False):
             return
 
         try:
-            sample_rate = config["audio"]["sample_rate"]
-            t = np.linspace(0, tone_config["duration"]/1000, 
-                          int(sample_rate * tone_config["duration"]/1000))
-            tone = np.sin(2 * np.pi * tone_config["frequency"] * t)
-            
-            fade_ms = tone_config.get("fade_ms", 5)
-            fade_len = int(fade_ms * sample_rate / 1000)
-            fade_in = np.linspace(0, 1, fade_len)
-            fade_out = np.linspace(1, 0, fade_len)
-            tone[:fade_len] *= fade_in
-            tone[-fade_len:] *= fade_out
-
-            sd.play(tone, sample_rate, blocking=True)
+            import sounddevice as sd
+            tone = cls.get_start_tone(config)
+            sd.play(tone, config["audio"]["sample_rate"], blocking=blocking)
         except Exception as e:
-            print(f"Warning: Could not play start tone: {e}") 
\ No newline at end of file
+            print(f"Warning: Could not play start tone: {e}")
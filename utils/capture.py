@@ -0,0 +1,214 @@
+import time
+import threading
+import numpy as np
+
+from utils.audio_file import AudioFile, WHISPER_SAMPLE_RATE
+from utils.resampler import Resampler
+
+# Audio per callback of the file and synthetic sources
+DEFAULT_BLOCK_MS = 20
+
+def pcm_to_float(pcm, channels=1):
+    """Little-endian int16 PCM as float32 frames in [-1, 1), one column per channel"""
+    samples = np.frombuffer(pcm, dtype="<i2")
+    if len(samples) % channels:
+        raise ValueError("PCM does not hold whole frames")
+    return (samples.astype(np.float32) / 32768.0).reshape(-1, channels)
+
+def open_source(config, callback, samplerate):
+    """Input stream for audio.source that calls callback like sd.InputStream does"""
+    source = config["audio"].get("source", {})
+    kind = source.get("type", "portaudio")
+    channels = config["audio"]["channels"]
+    if kind == "portaudio":
+        # Not imported for other sources, so they run where PortAudio is missing
+        import sounddevice as sd
+        return sd.InputStream(callback=callback, channels=channels, samplerate=samplerate,
+                              device=config["audio"].get("device"))
+    options = {"speed": source.get("speed", 1.0), "block_ms": source.get("block_ms", DEFAULT_BLOCK_MS)}
+    if kind == "file":
+        return FileSource(callback, channels, samplerate, source["path"], loop=source.get("loop", False),
+                          **options)
+    if kind == "synthetic":
+        return SyntheticSource(callback, channels, samplerate, signal=source.get("signal", "tone"),
+                               frequency=source.get("frequency", 440), amplitude=source.get("amplitude", 0.1),
+                               duration=source.get("duration", 0), **options)
+    raise ValueError(f"Unknown audio source: {kind}")
+
+class CaptureSource:
+    """The part of sd.InputStream the transcriber uses.
+
+    Sources are context managers that call callback(indata, frames, time,
+    status) with float32 blocks between start() and stop(), so
+    start_recording and audio_callback work the same on all of them.
+    """
+
+    def __init__(self, callback, channels, samplerate):
+        self.callback = callback
+        self.channels = channels
+        self.samplerate = samplerate
+        self.started = threading.Event()
+        self.stopped = threading.Event()
+
+    def start(self):
+        self.stopped.clear()
+        self.started.set()
+
+    def stop(self):
+        self.stopped.set()
+
+    def close(self):
+        self.stop()
+
+    @property
+    def active(self):
+        return self.started.is_set() and not self.stopped.is_set()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class PushStream(CaptureSource):
+    """Stands in for sd.InputStream when audio arrives from elsewhere.
+
+    Whoever receives the audio calls push() with float32 frames; while the
+    stream is started they reach the callback just as PortAudio blocks do,
+    mixed down to mono and resampled to samplerate if source_rate differs.
+    started is set once the consumer has entered the stream.
+    """
+
+    def __init__(self, callback, channels, samplerate, source_rate=None):
+        super().__init__(callback, channels, samplerate)
+        self.source_rate = source_rate or samplerate
+        self.resampler = Resampler(self.source_rate, samplerate) if self.source_rate != samplerate else None
+
+    def start(self):
+        # A push stream is not restarted once stopped
+        self.started.set()
+
+    def push(self, frames):
+        """Feed frames to the callback; False once the stream has stopped"""
+        if not self.active:
+            return False
+        audio = frames.mean(axis=1) if frames.ndim > 1 else frames
+        if self.resampler is not None:
+            audio = self.resampler.process(audio)
+        if len(audio):
+            self.callback(audio.astype(np.float32, copy=False), len(audio), None, None)
+        return True
+
+class GeneratedSource(CaptureSource):
+    """Delivers blocks from a thread of its own, like PortAudio's callback thread.
+
+    A block is delivered once it would have been captured at speed times
+    real time; speed 0 delivers them as fast as the callback takes them.
+    Subclasses produce the audio in read().
+    """
+
+    def __init__(self, callback, channels, samplerate, speed=1.0, block_ms=DEFAULT_BLOCK_MS):
+        super().__init__(callback, channels, samplerate)
+        self.speed = speed
+        self.blocksize = max(1, int(samplerate * block_ms / 1000))
+        self._thread = None
+
+    def read(self, frames):
+        """The next frames mono samples"""
+        raise NotImplementedError
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        super().start()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        super().stop()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        start = time.perf_counter()
+        delivered = 0
+        while not self.stopped.is_set():
+            block = self.read(self.blocksize).astype(np.float32, copy=False)
+            delivered += len(block)
+            if self.speed:
+                delay = start + delivered / self.samplerate / self.speed - time.perf_counter()
+                if delay > 0 and self.stopped.wait(delay):
+                    return
+            indata = np.repeat(block[:, None], self.channels, axis=1)
+            self.callback(indata, len(indata), None, None)
+
+class FileSource(GeneratedSource):
+    """Replays a WAV, FLAC or other audio file.
+
+    After the end of the file the source goes quiet, as a microphone in a
+    silent room would, so recordings end on silence_duration; with loop it
+    starts over instead.
+    """
+
+    def __init__(self, callback, channels, samplerate, path, loop=False, **options):
+        super().__init__(callback, channels, samplerate, **options)
+        self.audio_file = AudioFile(path)
+        self.loop = loop
+        self.position = 0
+        self.resampler = (Resampler(WHISPER_SAMPLE_RATE, samplerate) if samplerate != WHISPER_SAMPLE_RATE
+                          else None)
+
+    def _read_file(self, frames):
+        """Up to frames samples of the file at 16 kHz, padded with silence past its end"""
+        pieces, needed = [], frames
+        while needed:
+            if self.position >= len(self.audio_file):
+                if not self.loop or not len(self.audio_file):
+                    pieces.append(np.zeros(needed, dtype=np.float32))
+                    break
+                self.position = 0
+            piece = self.audio_file.read(self.position, min(self.position + needed, len(self.audio_file)))
+            self.position += len(piece)
+            needed -= len(piece)
+            pieces.append(piece)
+        return np.concatenate(pieces)
+
+    def read(self, frames):
+        if self.resampler is None:
+            return self._read_file(frames)
+        # Blocks come out a few samples longer or shorter, as PortAudio's may
+        return self.resampler.process(self._read_file(int(np.ceil(frames * WHISPER_SAMPLE_RATE
+                                                                  / self.samplerate))))
+
+class SyntheticSource(GeneratedSource):
+    """A tone, white noise or silence for duration seconds (0: without end), then silence.
+
+    Noise comes from a fixed seed, so every run gets the same samples.
+    """
+
+    def __init__(self, callback, channels, samplerate, signal="tone", frequency=440, amplitude=0.1,
+                 duration=0, **options):
+        super().__init__(callback, channels, samplerate, **options)
+        if signal not in ("tone", "noise", "silence"):
+            raise ValueError(f"Unknown synthetic signal: {signal}")
+        self.signal = signal
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.remaining = int(duration * samplerate) if duration else None
+        self.position = 0
+        self._random = np.random.default_rng(0)
+
+    def read(self, frames):
+        index = self.position + np.arange(frames)
+        self.position += frames
+        if self.signal == "tone":
+            audio = self.amplitude * np.sin(2 * np.pi * self.frequency * index / self.samplerate)
+        elif self.signal == "noise":
+            audio = np.clip(self._random.normal(0, self.amplitude, frames), -1, 1)
+        else:
+            audio = np.zeros(frames)
+        if self.remaining is not None:
+            audio[max(0, self.remaining):] = 0
+            self.remaining -= frames
+        return audio.astype(np.float32)
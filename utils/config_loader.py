@@ -3,19 +3,73 @@ from pathlib import Path
 import os
 
 class ConfigLoader:
+    """Loads config files relative to SKALD_ROOT.
+
+    Parsed configs are cached per path together with the file's mtime and
+    size, so repeated loads in one process read the file only once and a
+    changed file is picked up on the next load. The returned dict is shared
+    between callers and must be treated as read-only.
+    """
+
+    # path -> ((mtime_ns, size), config)
+    _cache = {}
+    # path -> (mtime_ns, size) of the last version read, even if it was invalid
+    _seen = {}
+
     @staticmethod
-    def load_config(config_filename="config.json"):
+    def config_path(config_filename="config.json"):
         project_root = os.environ.get('SKALD_ROOT')
         if not project_root:
             raise RuntimeError("SKALD_ROOT environment variable not set")
-            
-        config_path = Path(project_root) / config_filename
-        
+        return Path(project_root) / config_filename
+
+    @staticmethod
+    def _stamp(config_path):
+        stat = config_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def load_config(cls, config_filename="config.json", reload=False):
+        """The parsed config, re-read only if the file changed or reload is set"""
+        config_path = cls.config_path(config_filename)
+
         if not config_path.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
-            
+
+        stamp = cls._stamp(config_path)
+        cached = cls._cache.get(str(config_path))
+        if cached is not None and cached[0] == stamp and not reload:
+            return cached[1]
+
+        cls._seen[str(config_path)] = stamp
         try:
             with open(config_path, 'r') as f:
-                return json.load(f)
+                config = json.load(f)
         except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in config file: {e}") 
\ No newline at end of file
+            raise ValueError(f"Invalid JSON in config file: {e}")
+        cls._cache[str(config_path)] = (stamp, config)
+        return config
+
+    @classmethod
+    def has_changed(cls, config_filename="config.json"):
+        """True if the file differs from the version last read"""
+        config_path = cls.config_path(config_filename)
+        seen = cls._seen.get(str(config_path))
+        try:
+            return seen is None or seen != cls._stamp(config_path)
+        except OSError:
+            # Editors may replace the file non-atomically; try again later
+            return False
+
+    @staticmethod
+    def changed_settings(old, new, prefix=""):
+        """Dotted names of the settings that differ between two configs"""
+        changed = []
+        for key in sorted(set(old) | set(new), key=str):
+            name = f"{prefix}{key}"
+            old_value, new_value = old.get(key), new.get(key)
+            if isinstance(old_value, dict) and isinstance(new_value, dict):
+                changed.extend(ConfigLoader.changed_settings(old_value, new_value, f"{name}."))
+            elif old_value != new_value:
+                changed.append(name)
+        return changed
@@ -1,22 +1,35 @@
-import torch
 from utils.config_loader import ConfigLoader
 
+DEFAULT_COMPUTE_TYPES = {
+    "cuda": "float16",
+    "mps": "float32",
+    "cpu": "int8"
+}
+
 class DeviceManager:
     @staticmethod
-    def get_device_and_compute_type():
-        config = ConfigLoader.load_config()
-        default_compute_types = {
-            "cuda": "float16",
-            "mps": "float32",
-            "cpu": "int8"
-        }
-        compute_types = config.get("compute", default_compute_types)
-        
+    def cuda_device_count():
+        """CUDA devices CTranslate2 can use; asks ctranslate2 rather than torch"""
         try:
-            if torch.cuda.is_available():
-                return "cuda", compute_types["cuda"]
-            elif torch.backends.mps.is_available():
-                return "mps", compute_types["mps"]
-            return "cpu", compute_types["cpu"]
-        except ImportError:
-            return "cpu", compute_types["cpu"]
\ No newline at end of file
+            import ctranslate2
+            return ctranslate2.get_cuda_device_count()
+        except Exception:
+            return 0
+
+    @staticmethod
+    def get_device(config=None):
+        if config is None:
+            config = ConfigLoader.load_config()
+        device = config.get("whisper", {}).get("device", "auto")
+        if device != "auto":
+            return device
+        # CTranslate2 has no Metal backend, so Apple Silicon runs on the CPU
+        return "cuda" if DeviceManager.cuda_device_count() > 0 else "cpu"
+
+    @staticmethod
+    def get_device_and_compute_type(config=None):
+        if config is None:
+            config = ConfigLoader.load_config()
+        compute_types = config.get("compute", DEFAULT_COMPUTE_TYPES)
+        device = DeviceManager.get_device(config)
+        return device, compute_types.get(device, DEFAULT_COMPUTE_TYPES.get(device, "default"))
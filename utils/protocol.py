@@ -0,0 +1,110 @@
+import json
+import struct
+import zlib
+
+# Messages are JSON objects terminated by a newline
+MAX_MESSAGE_SIZE = 1024 * 1024
+# After an ingest command the client sends binary frames: a 4-byte big-endian
+# payload length, then little-endian int16 PCM, compressed if it asked for it.
+# An empty frame ends the stream.
+FRAME_HEADER = struct.Struct(">I")
+COMPRESSIONS = ["none", "zlib"]
+
+def encode_message(message):
+    return json.dumps(message).encode() + b"\n"
+
+def encode_frame(pcm, compression="none"):
+    if compression == "zlib" and pcm:
+        # Level 1: most of the gain on PCM at a fraction of the CPU time
+        pcm = zlib.compress(pcm, 1)
+    return FRAME_HEADER.pack(len(pcm)) + pcm
+
+def decode_frame(payload, compression="none"):
+    """PCM bytes of a frame's payload"""
+    if compression == "zlib":
+        decompressor = zlib.decompressobj()
+        try:
+            pcm = decompressor.decompress(payload, MAX_MESSAGE_SIZE)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt frame: {e}")
+        if decompressor.unconsumed_tail:
+            raise ValueError("Frame too large")
+        return pcm
+    return payload
+
+class SocketReader:
+    """Reads successive messages from a blocking socket"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = b""
+
+    def read(self):
+        """Next message, or None once the server has closed the connection"""
+        while b"\n" not in self.buffer:
+            data = self.sock.recv(4096)
+            if not data:
+                if not self.buffer.strip():
+                    return None
+                message, self.buffer = self.buffer, b""
+                return json.loads(message.decode())
+            self.buffer += data
+            if len(self.buffer) > MAX_MESSAGE_SIZE:
+                raise ValueError("Message too large")
+        line, _, self.buffer = self.buffer.partition(b"\n")
+        return json.loads(line.decode())
+
+class MessageReader:
+    """Reads messages from an asyncio stream.
+
+    Clients that predate framing send a single JSON object without a
+    trailing newline and wait for the reply, so a buffered object that
+    already parses is returned without waiting for the newline.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.buffer = b""
+
+    async def read(self):
+        """Next message, or None once the client has disconnected"""
+        while True:
+            line, newline, rest = self.buffer.partition(b"\n")
+            if newline:
+                self.buffer = rest
+                if line.strip():
+                    return json.loads(line.decode())
+                continue
+
+            if self.buffer.strip():
+                try:
+                    message = json.loads(self.buffer.decode())
+                except ValueError:
+                    pass
+                else:
+                    self.buffer = b""
+                    return message
+
+            data = await self.reader.read(65536)
+            if not data:
+                return None
+            self.buffer += data
+            if len(self.buffer) > MAX_MESSAGE_SIZE:
+                raise ValueError("Message too large")
+
+    async def read_frame(self):
+        """Payload of the next binary frame; b"" at the end of the stream, None on disconnect"""
+        size = None
+        while True:
+            if size is None and len(self.buffer) >= FRAME_HEADER.size:
+                (size,) = FRAME_HEADER.unpack_from(self.buffer)
+                if size > MAX_MESSAGE_SIZE:
+                    raise ValueError("Frame too large")
+            if size is not None and len(self.buffer) >= FRAME_HEADER.size + size:
+                payload = self.buffer[FRAME_HEADER.size:FRAME_HEADER.size + size]
+                self.buffer = self.buffer[FRAME_HEADER.size + size:]
+                return payload
+            data = await self.reader.read(65536)
+            if not data:
+                return None
+            self.buffer += data
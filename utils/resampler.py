@@ -0,0 +1,94 @@
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Outputs computed per vectorized step; bounds the gathered window matrix
+_OUTPUT_BLOCK = 4096
+
+class Resampler:
+    """Polyphase FIR resampler by the rational factor output_rate / input_rate.
+
+    The lowpass prototype is a Kaiser-windowed sinc split into one short
+    filter per phase, so each output sample costs one dot product over the
+    input samples it depends on. process() is stateful and treats successive
+    blocks as one continuous signal; resample_range() computes any output
+    range of a complete signal, e.g. a memory-mapped file.
+    """
+
+    def __init__(self, input_rate, output_rate, zero_crossings=16, beta=8.0, rolloff=0.9):
+        divisor = math.gcd(int(input_rate), int(output_rate))
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+
+        # Cut off below the lower of the two Nyquist rates, at the upsampled rate
+        factor = max(self.up, self.down)
+        cutoff = rolloff * 0.5 / factor
+        self.taps = math.ceil(2 * zero_crossings * factor / self.up)
+        length = self.taps * self.up
+        t = np.arange(length) - (length - 1) / 2
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(length, beta)
+        prototype *= self.up / prototype.sum()
+        # Linear phase: every output lags its input by half the filter
+        self.delay = (length - 1) / 2 / (input_rate * self.up)
+
+        # phases[p] weighs the window x[i - taps + 1 .. i] for output phase p
+        self.phases = prototype.reshape(self.taps, self.up).T[:, ::-1].astype(np.float32)
+        self.reset()
+
+    def reset(self):
+        """Start a new signal"""
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._consumed = 0
+        self._produced = 0
+
+    def output_length(self, input_length):
+        """Number of outputs that depend only on the first input_length inputs"""
+        if input_length <= 0:
+            return 0
+        return (input_length * self.up - 1) // self.down + 1
+
+    def _apply(self, ext, first, start, stop):
+        """Outputs [start, stop) from ext, whose first sample has input index first"""
+        out = np.empty(max(0, stop - start), dtype=np.float32)
+        windows = sliding_window_view(ext, self.taps)
+        for block_start in range(start, stop, _OUTPUT_BLOCK):
+            n = np.arange(block_start, min(block_start + _OUTPUT_BLOCK, stop), dtype=np.int64)
+            position = n * self.down
+            rows = position // self.up - first - (self.taps - 1)
+            out[block_start - start:block_start - start + len(n)] = np.einsum(
+                "nk,nk->n", windows[rows], self.phases[position % self.up])
+        return out
+
+    def process(self, block):
+        """Resample the next block of a continuous signal"""
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        if not len(block):
+            return block
+        ext = np.concatenate((self._history, block))
+        first = self._consumed - (self.taps - 1)
+        self._consumed += len(block)
+        stop = self.output_length(self._consumed)
+        out = self._apply(ext, first, self._produced, stop)
+        self._produced = stop
+        self._history = ext[len(ext) - (self.taps - 1):]
+        return out
+
+    def input_range(self, start, stop):
+        """Input samples [first, last) needed for outputs [start, stop)"""
+        first = start * self.down // self.up - (self.taps - 1)
+        last = (stop - 1) * self.down // self.up + 1
+        return first, last
+
+    def resample_range(self, read, length, start, stop):
+        """Outputs [start, stop) of a signal of length inputs, fetched with read(first, last)"""
+        stop = min(stop, self.output_length(length))
+        if stop <= start:
+            return np.zeros(0, dtype=np.float32)
+        first, last = self.input_range(start, stop)
+        ext = read(max(first, 0), min(last, length))
+        # Samples before the start of the signal count as silence, like in process()
+        ext = np.concatenate((np.zeros(max(0, -first), dtype=np.float32),
+                              np.asarray(ext, dtype=np.float32)))
+        return self._apply(ext, first, start, stop)
@@ -0,0 +1,126 @@
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+
+def _release_block(block):
+    try:
+        block.close()
+    except BufferError:
+        pass
+    try:
+        block.unlink()
+    except FileNotFoundError:
+        pass
+
+def shared_array(count, dtype=np.float32):
+    """(array, block name) of a zeroed array in a new shared memory block.
+    The block is unlinked once the array and all views of it are gone."""
+    block = shared_memory.SharedMemory(create=True, size=max(1, count * np.dtype(dtype).itemsize))
+    array = np.ndarray(count, dtype=dtype, buffer=block.buf)
+    weakref.finalize(array, _release_block, block)
+    return array, block.name
+
+class RingBuffer:
+    """Preallocated single-producer/single-consumer sample ring.
+
+    The producer (the audio callback) writes blocks and hands out chunks with
+    read(). Chunks are views into the ring whenever they don't wrap, so the
+    consumer must call release() once it no longer needs a chunk's samples;
+    until then the writer will not overwrite them.
+
+    With shared, the samples live in shared memory, so another process can
+    read a chunk given the name and offset from locate().
+    """
+
+    # Block name -> ring, for rings in shared memory
+    _shared = weakref.WeakValueDictionary()
+
+    def __init__(self, capacity, dtype=np.float32, shared=False):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.shared_name = None
+        if shared:
+            self._data, self.shared_name = shared_array(self.capacity, dtype)
+            RingBuffer._shared[self.shared_name] = self
+        else:
+            self._data = np.zeros(self.capacity, dtype=dtype)
+        self._head = 0   # total samples written
+        self._read = 0   # total samples handed out by read()
+        self._tail = 0   # total samples released by the consumer
+        self.overflows = 0
+
+    def __len__(self):
+        """Number of samples written but not yet read"""
+        return self._head - self._read
+
+    def __bool__(self):
+        return self._head != self._read
+
+    @property
+    def free(self):
+        return self.capacity - (self._head - self._tail)
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    @classmethod
+    def locate(cls, array):
+        """(block name, offset) of an array that is a view into a shared ring, else None"""
+        if not isinstance(array, np.ndarray) or not array.flags.c_contiguous:
+            return None
+        address = array.__array_interface__["data"][0]
+        for name, ring in list(cls._shared.items()):
+            data = ring._data
+            start = data.__array_interface__["data"][0]
+            if array.dtype == data.dtype and start <= address and address + array.nbytes <= start + data.nbytes:
+                return name, (address - start) // data.itemsize
+        return None
+
+    def write(self, samples):
+        """Copy samples into the ring, dropping whatever doesn't fit"""
+        samples = np.asarray(samples).reshape(-1)
+        count = len(samples)
+        free = self.free
+        if count > free:
+            self.overflows += 1
+            samples = samples[:free]
+            count = free
+        if count == 0:
+            return 0
+
+        start = self._head % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        if first < count:
+            self._data[:count - first] = samples[first:]
+        self._head += count
+        return count
+
+    def peek(self, count=None):
+        """The next count unread samples without handing them out"""
+        available = len(self)
+        count = available if count is None else min(count, available)
+        start = self._read % self.capacity
+        end = start + count
+        if end <= self.capacity:
+            return self._data[start:end]
+        return np.concatenate((self._data[start:], self._data[:end - self.capacity]))
+
+    def read(self, count=None):
+        """Hand out the next count unread samples (all of them by default)"""
+        chunk = self.peek(count)
+        self._read += len(chunk)
+        return chunk
+
+    def release(self, count):
+        """Mark count handed-out samples as consumed so they can be reused"""
+        self._tail = min(self._tail + count, self._read)
+
+    def discard(self, count):
+        """Drop the oldest count unread samples"""
+        self.release(len(self.read(count)))
+
+    def clear(self):
+        self._head = self._read = self._tail = 0
@@ -0,0 +1,158 @@
+import numpy as np
+
+def _runs(mask):
+    """Start and end indices of each run of True values in a boolean array"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+class VoiceActivityDetector:
+    """Frame-based VAD with hysteresis and minimum speech/silence durations.
+
+    Subclasses only provide frame_scores(); a frame enters speech when its
+    score reaches threshold and stays in speech until the score falls below
+    threshold * hysteresis.
+    """
+
+    def __init__(self, sample_rate, threshold, frame_ms=20, hysteresis=0.5,
+                 min_speech_ms=100, min_silence_ms=500, speech_pad_ms=200):
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.frame_size = max(1, int(sample_rate * frame_ms / 1000))
+        self.min_speech_frames = max(1, round(min_speech_ms / frame_ms))
+        self.min_silence_frames = max(1, round(min_silence_ms / frame_ms))
+        self.speech_pad = int(sample_rate * speech_pad_ms / 1000)
+        self.min_silence = min_silence_ms / 1000
+        self.reset()
+
+    def reset(self):
+        """Forget streaming state between recordings"""
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._in_speech = False
+        self._speech_run = 0
+
+    def frame_scores(self, frames):
+        """Score a (n_frames, frame_size) array; higher means more speech-like"""
+        raise NotImplementedError
+
+    def scores(self, audio):
+        """Score every whole frame of audio"""
+        count = len(audio) // self.frame_size
+        frames = audio[:count * self.frame_size].reshape(count, self.frame_size)
+        return self.frame_scores(frames)
+
+    def _hysteresis(self, scores, in_speech=False):
+        # +1 where a frame starts speech, -1 where it ends it, 0 keeps the state
+        events = np.where(scores >= self.threshold, 1,
+                          np.where(scores < self.threshold * self.hysteresis, -1, 0))
+        last_event = np.maximum.accumulate(np.where(events != 0, np.arange(len(events)), -1))
+        return np.where(last_event >= 0, events[np.maximum(last_event, 0)] == 1, in_speech)
+
+    def speech_mask(self, audio):
+        """Per-frame speech decision over a whole buffer"""
+        return self.mask_from_scores(self.scores(audio))
+
+    def mask_from_scores(self, scores):
+        """Per-frame speech decision from precomputed frame scores"""
+        mask = self._hysteresis(scores)
+
+        starts, ends = _runs(mask)
+        for gap_start, gap_end in zip(ends[:-1], starts[1:]):
+            if gap_end - gap_start < self.min_silence_frames:
+                mask[gap_start:gap_end] = True
+
+        starts, ends = _runs(mask)
+        for start, end in zip(starts, ends):
+            if end - start < self.min_speech_frames:
+                mask[start:end] = False
+        return mask
+
+    def speech_segments(self, audio):
+        """(start, end) sample ranges of speech, padded on both sides"""
+        return self.segments_from_scores(self.scores(audio), len(audio))
+
+    def segments_from_scores(self, scores, length):
+        """Speech segments of a length-sample buffer from its frame scores"""
+        starts, ends = _runs(self.mask_from_scores(scores))
+        segments = []
+        for start, end in zip(starts * self.frame_size, ends * self.frame_size):
+            start = max(0, start - self.speech_pad)
+            end = min(length, end + self.speech_pad)
+            if segments and start <= segments[-1][1]:
+                segments[-1] = (segments[-1][0], end)
+            else:
+                segments.append((start, end))
+        return segments
+
+    def has_speech(self, audio):
+        return bool(self.speech_mask(audio).any())
+
+    def extract_speech(self, audio):
+        """Audio with leading, trailing and long internal silences removed, or None"""
+        segments = self.speech_segments(audio)
+        if not segments:
+            return None
+        if len(segments) == 1:
+            start, end = segments[0]
+            return audio[start:end]
+        return np.concatenate([audio[start:end] for start, end in segments])
+
+    def quietest_point(self, audio):
+        """Sample offset of the start of the least speech-like frame"""
+        scores = self.scores(audio)
+        if not len(scores):
+            return len(audio)
+        return int(np.argmin(scores)) * self.frame_size
+
+    def update(self, block):
+        """Feed one capture block; True if it contains sustained speech"""
+        if len(self._remainder):
+            block = np.concatenate((self._remainder, block))
+        count = len(block) // self.frame_size
+        self._remainder = block[count * self.frame_size:].astype(np.float32)
+        if count == 0:
+            return False
+
+        speech = self._hysteresis(self.scores(block[:count * self.frame_size]), self._in_speech)
+        self._in_speech = bool(speech[-1])
+
+        sustained = False
+        starts, ends = _runs(speech)
+        for start, end in zip(starts, ends):
+            run = end - start
+            if start == 0:
+                run += self._speech_run
+            if run >= self.min_speech_frames:
+                sustained = True
+        if self._in_speech:
+            self._speech_run = (ends[-1] - starts[-1]) + (self._speech_run if starts[-1] == 0 else 0)
+        else:
+            self._speech_run = 0
+        return sustained
+
+class EnergyVAD(VoiceActivityDetector):
+    """Scores frames by mean absolute amplitude"""
+
+    def frame_scores(self, frames):
+        return np.abs(frames).mean(axis=1)
+
+VAD_ENGINES = {
+    "energy": EnergyVAD
+}
+
+def create_vad(config, sample_rate=None):
+    """Build the VAD described by config["audio"]["vad"]"""
+    audio_config = config["audio"]
+    vad_config = audio_config.get("vad", {})
+    engine = vad_config.get("engine", "energy")
+    if engine not in VAD_ENGINES:
+        raise ValueError(f"Unknown VAD engine: {engine}")
+    return VAD_ENGINES[engine](
+        sample_rate or audio_config["sample_rate"],
+        audio_config["silence_threshold"],
+        frame_ms=vad_config.get("frame_ms", 20),
+        hysteresis=vad_config.get("hysteresis", 0.5),
+        min_speech_ms=vad_config.get("min_speech_ms", 100),
+        min_silence_ms=vad_config.get("min_silence_ms", 500),
+        speech_pad_ms=vad_config.get("speech_pad_ms", 200)
+    )
@@ -1,3 +1,12 @@
+# CTranslate2 compute types a model alias may ask for
+COMPUTE_TYPES = ["auto", "default", "int8", "int8_float16", "int8_float32", "int8_bfloat16",
+                 "int16", "float16", "bfloat16", "float32"]
+# Destinations for transcripts, see transcriber/output.py
+SINK_NAMES = ["clipboard", "paste", "file", "socket"]
+# Where recordings get their audio, see utils/capture.py
+SOURCE_TYPES = ["portaudio", "file", "synthetic"]
+SYNTHETIC_SIGNALS = ["tone", "noise", "silence"]
+
 class ConfigValidator:
     @staticmethod
     def validate_config(config):
@@ -41,9 +50,9 @@ class ConfigValidator:
         if config["audio"]["channels"] not in [1, 2]:
             raise ValueError("Channels must be 1 or 2")
         
-        valid_models = ["tiny", "base", "small", "medium", "large"]
-        if config["whisper"]["model"] not in valid_models:
-            raise ValueError(f"Model must be one of: {', '.join(valid_models)}")
+        # Any faster-whisper size, CTranslate2 repository or local model directory
+        if not isinstance(config["whisper"]["model"], str) or not config["whisper"]["model"].strip():
+            raise ValueError("Model must be a model name or path")
         
         if config["audio"]["max_duration"] <= 0:
             raise ValueError("max_duration must be positive")
@@ -71,6 +80,58 @@ class ConfigValidator:
                 if not 0 <= tone_config["fade_ms"] <= 100:
                     raise ValueError("fade_ms must be between 0 and 100 ms")
         
+        if "vad" in config["audio"]:
+            vad_config = config["audio"]["vad"]
+            if not isinstance(vad_config, dict):
+                raise ValueError("vad must be an object")
+            if vad_config.get("engine", "energy") not in ["energy"]:
+                raise ValueError("vad.engine must be one of: energy")
+            if not 10 <= vad_config.get("frame_ms", 20) <= 100:
+                raise ValueError("vad.frame_ms must be between 10 and 100 ms")
+            if not 0 < vad_config.get("hysteresis", 0.5) <= 1:
+                raise ValueError("vad.hysteresis must be between 0 and 1")
+            for field in ["min_speech_ms", "min_silence_ms", "speech_pad_ms"]:
+                if vad_config.get(field, 0) < 0:
+                    raise ValueError(f"vad.{field} must not be negative")
+            if not 0 < vad_config.get("min_chunk_duration", 5) <= config["audio"]["chunk_duration"]:
+                raise ValueError("vad.min_chunk_duration must be positive and at most chunk_duration")
+
+        if "warm_stream" in config["audio"]:
+            warm_stream = config["audio"]["warm_stream"]
+            if not isinstance(warm_stream, dict):
+                raise ValueError("warm_stream must be an object")
+            if not isinstance(warm_stream.get("enabled", False), bool):
+                raise ValueError("warm_stream.enabled must be a boolean")
+            if not 0 < warm_stream.get("preroll_ms", 300) <= 2000:
+                raise ValueError("warm_stream.preroll_ms must be between 0 and 2000 ms")
+
+        device = config["audio"].get("device")
+        if device is not None and (isinstance(device, bool) or not isinstance(device, (str, int))):
+            raise ValueError("audio.device must be a device name or index")
+
+        if "source" in config["audio"]:
+            source = config["audio"]["source"]
+            if not isinstance(source, dict):
+                raise ValueError("audio.source must be an object")
+            if source.get("type", "portaudio") not in SOURCE_TYPES:
+                raise ValueError(f"audio.source.type must be one of: {', '.join(SOURCE_TYPES)}")
+            if source.get("type") == "file" and (not isinstance(source.get("path"), str) or not source["path"]):
+                raise ValueError("audio.source.path must be set for the file source")
+            if not isinstance(source.get("speed", 1.0), (int, float)) or source.get("speed", 1.0) < 0:
+                raise ValueError("audio.source.speed must be a non-negative number")
+            if not 0 < source.get("block_ms", 20) <= 1000:
+                raise ValueError("audio.source.block_ms must be between 0 and 1000 ms")
+            if not isinstance(source.get("loop", False), bool):
+                raise ValueError("audio.source.loop must be a boolean")
+            if source.get("signal", "tone") not in SYNTHETIC_SIGNALS:
+                raise ValueError(f"audio.source.signal must be one of: {', '.join(SYNTHETIC_SIGNALS)}")
+            if source.get("frequency", 440) <= 0:
+                raise ValueError("audio.source.frequency must be positive")
+            if not 0 <= source.get("amplitude", 0.1) <= 1:
+                raise ValueError("audio.source.amplitude must be between 0 and 1")
+            if source.get("duration", 0) < 0:
+                raise ValueError("audio.source.duration must be non-negative")
+
         if config["processing"]["shutdown_timeout"] <= 0:
             raise ValueError("shutdown_timeout must be positive")
         
@@ -81,6 +142,61 @@ class ConfigValidator:
             if not isinstance(config["processing"]["auto_paste"], bool):
                 raise ValueError("processing.auto_paste must be a boolean")
         
+        if "streaming" in config["processing"]:
+            streaming = config["processing"]["streaming"]
+            if not isinstance(streaming, dict):
+                raise ValueError("processing.streaming must be an object")
+            if not isinstance(streaming.get("enabled", False), bool):
+                raise ValueError("processing.streaming.enabled must be a boolean")
+            if not 100 <= streaming.get("step_ms", 500) <= 5000:
+                raise ValueError("processing.streaming.step_ms must be between 100 and 5000 ms")
+            if not 0 < streaming.get("max_window_duration", 15) <= 30:
+                raise ValueError("processing.streaming.max_window_duration must be between 0 and 30 seconds")
+            if streaming.get("max_window_duration", 15) * 1000 <= streaming.get("step_ms", 500):
+                raise ValueError("processing.streaming.max_window_duration must be longer than step_ms")
+
+        if "warmup" in config["whisper"]:
+            warmup = config["whisper"]["warmup"]
+            if not isinstance(warmup, dict):
+                raise ValueError("whisper.warmup must be an object")
+            if not isinstance(warmup.get("enabled", False), bool):
+                raise ValueError("whisper.warmup.enabled must be a boolean")
+            if not 0 < warmup.get("duration", 1.0) <= 30:
+                raise ValueError("whisper.warmup.duration must be between 0 and 30 seconds")
+
+        if config["whisper"].get("device", "auto") not in ["auto", "cpu", "cuda"]:
+            raise ValueError("whisper.device must be one of: auto, cpu, cuda")
+
+        if "models" in config["whisper"]:
+            models = config["whisper"]["models"]
+            if not isinstance(models, dict):
+                raise ValueError("whisper.models must be an object")
+            budget = models.get("memory_budget_mb", 0)
+            if not isinstance(budget, (int, float)) or budget < 0:
+                raise ValueError("whisper.models.memory_budget_mb must be non-negative")
+            aliases = models.get("aliases", {})
+            if not isinstance(aliases, dict):
+                raise ValueError("whisper.models.aliases must be an object")
+            for alias, target in aliases.items():
+                if isinstance(target, dict):
+                    if not isinstance(target.get("model"), str) or not target["model"]:
+                        raise ValueError(f"whisper.models.aliases.{alias}.model must be a model name or path")
+                    if target.get("compute_type", "default") not in COMPUTE_TYPES:
+                        raise ValueError(f"whisper.models.aliases.{alias}.compute_type must be one of: "
+                                         f"{', '.join(COMPUTE_TYPES)}")
+                elif not isinstance(target, str) or not target:
+                    raise ValueError(f"whisper.models.aliases.{alias} must be a model name, path or object")
+            idle = models.get("idle", {})
+            if not isinstance(idle, dict):
+                raise ValueError("whisper.models.idle must be an object")
+            timeout = idle.get("timeout", 0)
+            if not isinstance(timeout, (int, float)) or timeout < 0:
+                raise ValueError("whisper.models.idle.timeout must be non-negative")
+            if idle.get("action", "unload") not in ["unload", "quantize"]:
+                raise ValueError("whisper.models.idle.action must be one of: unload, quantize")
+            if idle.get("compute_type", "int8") not in COMPUTE_TYPES:
+                raise ValueError(f"whisper.models.idle.compute_type must be one of: {', '.join(COMPUTE_TYPES)}")
+
         if "beam_size" in config["whisper"]:
             beam_size = config["whisper"]["beam_size"]
             if not isinstance(beam_size, int) or beam_size < 1:
@@ -94,9 +210,131 @@ class ConfigValidator:
             raise ValueError("Missing field 'socket_timeout' in section 'server'")
         if not isinstance(config["server"]["socket_timeout"], (int, float)) or config["server"]["socket_timeout"] <= 0:
             raise ValueError("server.socket_timeout must be a positive number")
+        if "cpu_threads" in config["whisper"]:
+            cpu_threads = config["whisper"]["cpu_threads"]
+            if not isinstance(cpu_threads, int) or cpu_threads < 0:
+                raise ValueError("whisper.cpu_threads must be a non-negative integer")
+        if "num_workers" in config["whisper"]:
+            num_workers = config["whisper"]["num_workers"]
+            if not isinstance(num_workers, int) or num_workers < 1:
+                raise ValueError("whisper.num_workers must be a positive integer")
+
+        if "process_worker" in config["whisper"]:
+            process_worker = config["whisper"]["process_worker"]
+            if not isinstance(process_worker, dict):
+                raise ValueError("whisper.process_worker must be an object")
+            if not isinstance(process_worker.get("enabled", False), bool):
+                raise ValueError("whisper.process_worker.enabled must be a boolean")
+            timeout = process_worker.get("decode_timeout", 120)
+            if not isinstance(timeout, (int, float)) or timeout <= 0:
+                raise ValueError("whisper.process_worker.decode_timeout must be positive")
+
+        if "autotune" in config:
+            autotune = config["autotune"]
+            if not isinstance(autotune, dict):
+                raise ValueError("autotune must be an object")
+            target_rtf = autotune.get("target_rtf", 0.3)
+            if not isinstance(target_rtf, (int, float)) or target_rtf <= 0:
+                raise ValueError("autotune.target_rtf must be a positive number")
+            for field in ["models", "compute_types", "beam_sizes"]:
+                if not isinstance(autotune.get(field, []), list):
+                    raise ValueError(f"autotune.{field} must be a list")
+            for compute_type in autotune.get("compute_types", []):
+                if compute_type not in COMPUTE_TYPES:
+                    raise ValueError(f"autotune.compute_types must only hold: {', '.join(COMPUTE_TYPES)}")
+            for beam_size in autotune.get("beam_sizes", []):
+                if not isinstance(beam_size, int) or beam_size < 1:
+                    raise ValueError("autotune.beam_sizes must hold positive integers")
+            if not isinstance(autotune.get("sample", ""), str):
+                raise ValueError("autotune.sample must be a path")
+
+        if "config_watch_interval" in config["server"]:
+            interval = config["server"]["config_watch_interval"]
+            if not isinstance(interval, (int, float)) or interval < 0:
+                raise ValueError("server.config_watch_interval must be a non-negative number")
+        tcp_port = config["server"].get("tcp_port", 0)
+        if not isinstance(tcp_port, int) or not 0 <= tcp_port <= 65535:
+            raise ValueError("server.tcp_port must be a port number, or 0 to disable TCP")
+        if not isinstance(config["server"].get("tcp_host", ""), str):
+            raise ValueError("server.tcp_host must be a host name or address")
+        max_sessions = config["server"].get("max_sessions", 4)
+        if isinstance(max_sessions, bool) or not isinstance(max_sessions, int) or max_sessions < 1:
+            raise ValueError("server.max_sessions must be a positive integer")
         
+        if "refine" in config["processing"]:
+            refine = config["processing"]["refine"]
+            if not isinstance(refine, dict):
+                raise ValueError("processing.refine must be an object")
+            if not isinstance(refine.get("enabled", False), bool):
+                raise ValueError("processing.refine.enabled must be a boolean")
+            draft_model = refine.get("draft_model", "base")
+            if not isinstance(draft_model, str) or not draft_model.strip():
+                raise ValueError("processing.refine.draft_model must be a model name or path")
+
+        if "batch_decode" in config["processing"]:
+            batch_decode = config["processing"]["batch_decode"]
+            if not isinstance(batch_decode, dict):
+                raise ValueError("processing.batch_decode must be an object")
+            if not isinstance(batch_decode.get("enabled", False), bool):
+                raise ValueError("processing.batch_decode.enabled must be a boolean")
+            batch_size = batch_decode.get("batch_size", 8)
+            if not isinstance(batch_size, int) or batch_size < 1:
+                raise ValueError("processing.batch_decode.batch_size must be a positive integer")
+            max_wait = batch_decode.get("max_wait_ms", 0)
+            if not isinstance(max_wait, (int, float)) or max_wait < 0:
+                raise ValueError("processing.batch_decode.max_wait_ms must be a non-negative number")
+
+        if "adaptive" in config["processing"]:
+            adaptive = config["processing"]["adaptive"]
+            if not isinstance(adaptive, dict):
+                raise ValueError("processing.adaptive must be an object")
+            if not isinstance(adaptive.get("enabled", False), bool):
+                raise ValueError("processing.adaptive.enabled must be a boolean")
+            for field, default in [("latency_target", 5.0), ("min_chunk_duration", 5)]:
+                value = adaptive.get(field, default)
+                if not isinstance(value, (int, float)) or value <= 0:
+                    raise ValueError(f"processing.adaptive.{field} must be a positive number")
+            if adaptive.get("overload_policy", "downgrade") not in ["downgrade", "merge", "drop"]:
+                raise ValueError("processing.adaptive.overload_policy must be one of: downgrade, merge, drop")
+
+        if "output" in config["processing"]:
+            output = config["processing"]["output"]
+            if not isinstance(output, dict):
+                raise ValueError("processing.output must be an object")
+            sinks = output.get("sinks", [])
+            if not isinstance(sinks, list) or any(sink not in SINK_NAMES for sink in sinks):
+                raise ValueError(f"processing.output.sinks must be a list of: {', '.join(SINK_NAMES)}")
+            debounce = output.get("debounce_ms", 250)
+            if not isinstance(debounce, (int, float)) or debounce < 0:
+                raise ValueError("processing.output.debounce_ms must be a non-negative number")
+            for sink, field in [("file", "file"), ("socket", "socket_path")]:
+                if not isinstance(output.get(field, ""), str):
+                    raise ValueError(f"processing.output.{field} must be a path")
+                if sink in sinks and not output.get(field):
+                    raise ValueError(f"processing.output.{field} must be set to use the {sink} sink")
+
+        if "batch" in config:
+            batch = config["batch"]
+            if not isinstance(batch, dict):
+                raise ValueError("batch must be an object")
+            workers = batch.get("workers", 0)
+            if not isinstance(workers, int) or workers < 0:
+                raise ValueError("batch.workers must be a non-negative integer")
+            if batch.get("format", "jsonl") not in ["jsonl", "text"]:
+                raise ValueError("batch.format must be one of: jsonl, text")
+
+        if "metrics" in config:
+            metrics = config["metrics"]
+            if not isinstance(metrics, dict):
+                raise ValueError("metrics must be an object")
+            if not isinstance(metrics.get("prometheus_file", ""), str):
+                raise ValueError("metrics.prometheus_file must be a path")
+            interval = metrics.get("write_interval", 15)
+            if not isinstance(interval, (int, float)) or interval <= 0:
+                raise ValueError("metrics.write_interval must be positive")
+
         if "compute" in config:
-            valid_types = ["float16", "float32", "int8"]
+            valid_types = COMPUTE_TYPES
             for device in ["cuda", "mps", "cpu"]:
                 if device not in config["compute"]:
                     raise ValueError(f"compute.{device} must be specified")